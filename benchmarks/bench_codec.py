@@ -0,0 +1,207 @@
+"""
+SECS-II 코덱(파서/빌더/JSON 변환) 마이크로 벤치마크.
+
+실제 라이브러리 메시지(generated_assets)와 합성 코퍼스(깊은 리스트, 넓은 리스트, 큰 숫자 배열)에
+대해 parse_body, build_secs_body, SecsItem -> JSON 변환(dict 변환, dumps_body)의 처리량을 측정합니다.
+결과는 ops/sec, 아이템당 ns, 1회 실행당 할당량(피크 바이트, 남은 블록 수)으로 보고하며,
+JSON 기준선으로 저장해 두고 이후 실행과 비교할 수 있습니다.
+
+    python -m benchmarks.bench_codec                       # 결과 출력
+    python -m benchmarks.bench_codec --save                # 기준선 갱신
+    python -m benchmarks.bench_codec --compare             # 기준선 대비 변화율 출력
+    python -m benchmarks.bench_codec --only parse --corpus library
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.core.secs_json import body_to_dicts, dumps_body, item_to_dict
+from secs_simulator.core.secs_parser import parse_body
+
+ROOT = Path(__file__).resolve().parents[1]
+LIBRARY_PATH = ROOT / 'generated_assets' / 'Generated_J1FCNV12305_Library_final.json'
+BASELINE_PATH = Path(__file__).resolve().parent / 'baselines' / 'bench_codec.json'
+
+# 기준선 대비 ops/sec이 이 비율 이상 떨어지면 회귀로 표시합니다.
+# 공유/가상 머신에서는 실행마다 20~30% 정도 흔들리므로, 기준선은 같은 머신에서 만든 것과 비교합니다.
+DEFAULT_REGRESSION_THRESHOLD = 0.30
+
+def _deep_body(depth: int) -> list:
+    node = {"type": "U4", "value": [depth]}
+    for level in range(depth):
+        node = {"type": "L", "value": [{"type": "U2", "value": [level]}, node]}
+    return [node]
+
+def _wide_body(width: int) -> list:
+    return [{"type": "L", "value": [
+        {"type": "L", "value": [{"type": "U4", "value": [i]}, {"type": "A", "value": f"VID{i:05d}"}]}
+        for i in range(width)
+    ]}]
+
+def _numeric_body(count: int) -> list:
+    return [{"type": "L", "value": [
+        {"type": "U4", "value": list(range(count))},
+        {"type": "F8", "value": [i * 0.5 for i in range(count // 4)]},
+        {"type": "B", "value": [i & 0xFF for i in range(count // 4)]},
+    ]}]
+
+def load_corpora() -> Dict[str, List[list]]:
+    """코퍼스 이름 -> dict 형식 Body 리스트."""
+    library = json.loads(LIBRARY_PATH.read_text(encoding='utf-8'))
+    return {
+        'library': [message['body'] for message in library.values()],
+        'deep': [_deep_body(200)],
+        'wide': [_wide_body(2000)],
+        'numeric': [_numeric_body(50_000)],
+    }
+
+def _count_items(items: list) -> int:
+    total = 0
+    for item in items:
+        total += 1
+        if item.type == 'L':
+            total += _count_items(item.value)
+        elif not isinstance(item.value, str):
+            # 숫자 배열은 요소 하나를 아이템 하나로 셉니다 (ns/item이 배열 크기에 비례하도록).
+            total += max(len(item.value) - 1, 0)
+    return total
+
+def _make_cases(bodies: List[list]) -> Dict[str, Tuple[Callable[[], object], int]]:
+    """케이스 이름 -> (한 번 실행할 함수, 1회 실행당 처리 아이템 수)."""
+    encoded = [build_secs_body(body) for body in bodies]
+    parsed = [parse_body(data) for data in encoded]
+    items = sum(_count_items(tree) for tree in parsed)
+
+    def run_all(function, inputs):
+        return lambda: [function(value) for value in inputs]
+
+    return {
+        'parse': (run_all(parse_body, encoded), items),
+        'parse_legacy': (run_all(lambda data: parse_body(data, legacy=True), encoded), items),
+        'parse_as_array': (run_all(lambda data: parse_body(data, as_array=True), encoded), items),
+        'parse_lazy': (run_all(lambda data: parse_body(data, lazy=True), encoded), items),
+        'build_dict': (run_all(build_secs_body, bodies), items),
+        'build_items': (run_all(build_secs_body, parsed), items),
+        'json_item_to_dict': (run_all(lambda tree: [item_to_dict(i) for i in tree], parsed), items),
+        'json_body_to_dicts': (run_all(body_to_dicts, bodies), items),
+        'json_dumps_items': (run_all(dumps_body, parsed), items),
+        'json_dumps_raw': (run_all(dumps_body, encoded), items),
+    }
+
+def _time_case(function: Callable[[], object], min_time: float, repeat: int = 5) -> Tuple[int, float]:
+    """
+    한 묶음이 min_time / repeat 이상 걸리도록 반복 횟수를 정한 뒤, repeat 묶음 중 가장 빠른
+    묶음으로 (반복 횟수, 1회당 초)를 계산합니다. 최솟값을 쓰므로 다른 프로세스의 간섭에 덜 민감합니다.
+    """
+    function()  # warm-up
+    batch_time = min_time / repeat
+    loops = 1
+    while True:
+        elapsed = _time_batch(function, loops)
+        if elapsed >= batch_time:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(batch_time / elapsed) + 1))
+    best = min([elapsed] + [_time_batch(function, loops) for _ in range(repeat - 1)])
+    return loops, best / loops
+
+def _time_batch(function: Callable[[], object], loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        function()
+    return time.perf_counter() - start
+
+def _measure_allocations(function: Callable[[], object]) -> Tuple[int, int]:
+    """1회 실행의 (피크 할당 바이트, 결과가 붙잡고 있는 메모리 블록 수)를 반환합니다."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    result = function()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    del result
+    return peak, blocks
+
+def run(min_time: float, only: str = '', corpus: str = '') -> dict:
+    results = {}
+    for corpus_name, bodies in load_corpora().items():
+        if corpus and corpus != corpus_name:
+            continue
+        for case_name, (function, items) in _make_cases(bodies).items():
+            if only and only not in case_name:
+                continue
+            loops, seconds = _time_case(function, min_time)
+            peak, blocks = _measure_allocations(function)
+            results[f"{corpus_name}/{case_name}"] = {
+                'ops_per_sec': 1.0 / seconds,
+                'ns_per_item': seconds * 1e9 / items,
+                'items': items,
+                'loops': loops,
+                'peak_alloc_bytes': peak,
+                'retained_blocks': blocks,
+            }
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+def _print_results(report: dict, baseline: dict = None, threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> int:
+    """결과 표를 출력하고, 기준선이 주어지면 회귀 건수를 반환합니다."""
+    base_results = (baseline or {}).get('results', {})
+    regressions = 0
+    print(f"{'case':<40} {'ops/sec':>12} {'ns/item':>10} {'peak KiB':>10} {'blocks':>8}  vs baseline")
+    for name, result in report['results'].items():
+        line = (f"{name:<40} {result['ops_per_sec']:>12.1f} {result['ns_per_item']:>10.1f} "
+                f"{result['peak_alloc_bytes'] / 1024:>10.1f} {result['retained_blocks']:>8}")
+        base = base_results.get(name)
+        if base:
+            change = result['ops_per_sec'] / base['ops_per_sec'] - 1.0
+            flag = ''
+            if change <= -threshold:
+                flag = '  ⚠️ REGRESSION'
+                regressions += 1
+            line += f"  {change:+.1%}{flag}"
+        print(line)
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the SECS-II parser, builder and JSON helpers.")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Approximate seconds to time each case.")
+    parser.add_argument("--only", default='', help="Run only cases whose name contains this text.")
+    parser.add_argument("--corpus", default='', help="Run only this corpus (library, deep, wide, numeric).")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON file.")
+    parser.add_argument("--save", action="store_true", help="Save the results as the new baseline.")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline; exit 1 on regressions.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Relative ops/sec drop that counts as a regression.")
+    args = parser.parse_args()
+
+    report = run(args.min_time, args.only, args.corpus)
+    baseline = None
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"Baseline '{args.baseline}' not found. Run with --save first.")
+            sys.exit(2)
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+
+    regressions = _print_results(report, baseline, args.threshold)
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"✅ Baseline saved to '{args.baseline}'")
+    if regressions:
+        print(f"{regressions} case(s) regressed more than {args.threshold:.0%}.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+SecsItem / SecsMessage 메모리 사용량 벤치마크.
+
+기존 표현(__dict__를 가진 dataclass, dict 메시지)과 현재 표현(__slots__ dataclass,
+SecsMessage 레코드)으로 같은 수신 트래픽을 보관할 때 노드/메시지당 바이트 수를 비교합니다.
+
+    python -m benchmarks.bench_memory [--messages 2000]
+"""
+import argparse
+import json
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, List
+
+from secs_simulator.core.models import SecsItem, SecsMessage
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.core.secs_parser import parse_body
+
+LIBRARY_PATH = Path(__file__).resolve().parents[1] / 'generated_assets' / 'Generated_J1FCNV12305_Library_final.json'
+
+@dataclass
+class DictSecsItem:
+    """비교 기준: __slots__ 적용 전의 SecsItem과 동일한 정의."""
+    type: str
+    value: Any
+
+def _convert_tree(items: List[SecsItem], item_class) -> list:
+    converted = []
+    for item in items:
+        value = _convert_tree(item.value, item_class) if item.type == 'L' else item.value
+        converted.append(item_class(item.type, value))
+    return converted
+
+def _count_nodes(items: list) -> int:
+    return sum(1 + (_count_nodes(item.value) if item.type == 'L' else 0) for item in items)
+
+def _measure(build: Callable[[], list]) -> int:
+    """build()가 만든 객체들이 살아 있는 동안 점유하는 메모리(바이트)를 측정합니다."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    retained = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del retained
+    return after - before
+
+def run(message_count: int) -> dict:
+    library = json.loads(LIBRARY_PATH.read_text(encoding='utf-8'))
+    bodies = [build_secs_body(message['body']) for message in library.values()]
+    headers = [(message['s'], message['f'], message.get('w_bit', False)) for message in library.values()]
+    picks = [i % len(bodies) for i in range(message_count)]
+    parsed = [parse_body(body) for body in bodies]
+    node_count = sum(_count_nodes(parsed[i]) for i in picks)
+
+    def build_dict_messages():
+        return [{
+            's': headers[i][0], 'f': headers[i][1], 'w_bit': headers[i][2],
+            'system_bytes': n, 'body': _convert_tree(parsed[i], DictSecsItem),
+        } for n, i in enumerate(picks)]
+
+    def build_slotted_messages():
+        return [SecsMessage(s=headers[i][0], f=headers[i][1], w_bit=headers[i][2],
+                            system_bytes=n, body=_convert_tree(parsed[i], SecsItem))
+                for n, i in enumerate(picks)]
+
+    before = _measure(build_dict_messages)
+    after = _measure(build_slotted_messages)
+    return {
+        'messages': message_count,
+        'nodes': node_count,
+        'before_bytes_per_node': before / node_count,
+        'after_bytes_per_node': after / node_count,
+        'before_bytes_per_message': before / message_count,
+        'after_bytes_per_message': after / message_count,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare memory footprint of SecsItem/SecsMessage representations.")
+    parser.add_argument("--messages", type=int, default=2000, help="Number of received messages to retain.")
+    args = parser.parse_args()
+
+    result = run(args.messages)
+    print(f"{result['messages']} messages, {result['nodes']} SecsItem nodes")
+    print(f"  before (dict dataclass + dict message): {result['before_bytes_per_node']:.1f} B/node, "
+          f"{result['before_bytes_per_message']:.0f} B/message")
+    print(f"  after  (slotted SecsItem + SecsMessage): {result['after_bytes_per_node']:.1f} B/node, "
+          f"{result['after_bytes_per_message']:.0f} B/message")
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ import json
 import argparse
 import re # 👈 정규표현식 모듈 임포트
 from log_importer import get_messages_from_log
+from secs_simulator.core.models import SecsMessage
+from secs_simulator.core.secs_path import compile_path
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -14,37 +16,19 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-def get_value_from_path(data: list, path: list):
-    """SECS-II 메시지 Body에서 경로에 해당하는 값을 추출합니다."""
-    current_level = data
-    try:
-        for key in path:
-            if isinstance(current_level, list) and isinstance(key, int):
-                current_level = current_level[key]
-            elif isinstance(current_level, dict) and isinstance(key, str):
-                current_level = current_level[key]
-            else:
-                return None
-        
-        if isinstance(current_level, list):
-            return current_level[0] if current_level else None
-        return current_level
-    except (IndexError, TypeError, KeyError):
-        return None
-
-def generate_message_key_suffix(msg: dict, rules: list) -> str:
+def generate_message_key_suffix(msg: SecsMessage, rules: list) -> str:
     """
     [핵심 수정] 메시지와 규칙을 기반으로, 값과 설명을 조합하여
     'S1F4_MDLN_CV01'과 같은 최종 메시지 이름을 생성합니다.
     """
-    msg_s, msg_f = msg['s'], msg['f']
-    body = msg.get('message', {}).get('body', [])
-    ascii_data = msg.get('ascii_data', '')
+    msg_s, msg_f = msg.s, msg.f
+    body = msg.body
+    ascii_data = msg.ascii_data
     
     for rule in rules:
         if rule['s'] == msg_s and rule['f'] == msg_f:
             # 1. Body에서 값(ID) 추출
-            value = get_value_from_path(body, rule.get('value_path', []))
+            value = compile_path(rule.get('value_path', []))(body)
             value_str = str(value) if value is not None else ""
 
             # 2. AsciiData에서 설명 추출
@@ -97,32 +81,46 @@ def generate_assets(log_file: str, profile_file: str, rules_file: str, output_di
 
     scenario_steps = []
     message_library = {}
+    # (S, F, W-bit, Body 지문) -> 라이브러리 메시지. 같은 메시지는 하나의 dict를 공유합니다.
+    messages_by_fingerprint = {}
+    # 메시지 키별로 관측된 서로 다른 Body 지문 (같은 키에 다른 Body가 섞였는지 확인용)
+    fingerprints_by_key = {}
     last_timestamp = None
 
     for msg in messages:
-        current_timestamp = msg.get("timestamp", 0)
+        current_timestamp = msg.timestamp
         delay = 0.0
         if last_timestamp is not None and current_timestamp > last_timestamp:
             delay = round((current_timestamp - last_timestamp) / 1000.0, 3)
         last_timestamp = current_timestamp
 
-        msg_key_base = f"S{msg['s']}F{msg['f']}"
+        msg_key_base = f"S{msg.s}F{msg.f}"
         suffix_from_rule = generate_message_key_suffix(msg, key_rules)
         msg_key_base += suffix_from_rule
 
-        w_bit_suffix = "_Request" if msg["w_bit"] else "_Reply"
+        w_bit_suffix = "_Request" if msg.w_bit else "_Reply"
         msg_key = msg_key_base + w_bit_suffix
 
+        identity = (msg.s, msg.f, msg.w_bit, msg.fingerprint())
+        library_message = messages_by_fingerprint.get(identity)
+        if library_message is None:
+            library_message = messages_by_fingerprint[identity] = msg.to_dict()
+        fingerprints_by_key.setdefault(msg_key, set()).add(identity)
+
         step = {
             "device_id": device_id,
             "delay": delay,
             "message_id": msg_key,
-            "message": msg["message"]
+            "message": library_message
         }
         scenario_steps.append(step)
         
         if msg_key not in message_library:
-            message_library[msg_key] = msg["message"]
+            message_library[msg_key] = library_message
+
+    for msg_key, identities in fingerprints_by_key.items():
+        if len(identities) > 1:
+            print(f"⚠️ '{msg_key}' has {len(identities)} different bodies; the library keeps the first one.")
 
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
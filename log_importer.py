@@ -1,28 +1,19 @@
 # log_importer.py
 import json
 import struct
-from typing import List, Dict, Any
+from typing import List
 
 from secs_simulator.core.secs_parser import parse_body
-from secs_simulator.core.models import SecsItem
+from secs_simulator.core.models import SecsMessage
+from secs_simulator.core.secs_json import body_to_dicts
 from secs_simulator.parsers.universal_parser import parse_log_with_profile
 
-def convert_secs_item_to_dict(item: SecsItem) -> Dict[str, Any]:
-    """SecsItem 객체를 JSON으로 직렬화 가능한 딕셔너리로 변환합니다."""
-    if item.type == 'L':
-        return {
-            "type": "L",
-            "value": [convert_secs_item_to_dict(sub_item) for sub_item in item.value]
-        }
-    if item.type == 'B' and isinstance(item.value, bytes):
-         return {"type": "B", "value": item.value.hex().upper()}
-    return {"type": item.type, "value": item.value}
 
-
-def get_messages_from_log(log_filepath: str, profile_path: str) -> List[Dict[str, Any]]:
+def get_messages_from_log(log_filepath: str, profile_path: str) -> List[SecsMessage]:
     """
     로그 파일을 읽고, 신뢰성 높은 내부 파서를 사용하여 시뮬레이터가 사용할 수 있는
-    표준 dict 리스트 형식으로 변환합니다.
+    SecsMessage 리스트로 변환합니다. body는 JSON 직렬화 가능한 dict 리스트이며,
+    라이브러리 형식은 ``msg.to_dict()``로 얻습니다.
     """
     try:
         with open(profile_path, 'r', encoding='utf-8') as f:
@@ -57,7 +48,7 @@ def get_messages_from_log(log_filepath: str, profile_path: str) -> List[Dict[str
         body_bytes = full_binary[10:]
         
         parsed_body_items = parse_body(body_bytes)
-        body_for_json = [convert_secs_item_to_dict(item) for item in parsed_body_items]
+        body_for_json = body_to_dicts(parsed_body_items)
 
         timestamp_str = entry.get('NumericalTimeStamp', '0')
         try:
@@ -65,20 +56,15 @@ def get_messages_from_log(log_filepath: str, profile_path: str) -> List[Dict[str
         except (ValueError, TypeError):
             timestamp = 0
 
-        processed_messages.append({
-            "s": s,
-            "f": f,
-            "w_bit": w_bit,
-            "system_bytes": system_bytes,
-            "timestamp": timestamp,
+        processed_messages.append(SecsMessage(
+            s=s,
+            f=f,
+            w_bit=w_bit,
+            system_bytes=system_bytes,
+            body=body_for_json,
+            timestamp=timestamp,
             # ✅ [추가] AsciiData를 함께 전달합니다.
-            "ascii_data": entry.get('AsciiData', ''),
-            "message": {
-                "s": s,
-                "f": f,
-                "w_bit": w_bit,
-                "body": body_for_json
-            }
-        })
+            ascii_data=entry.get('AsciiData', '')
+        ))
         
     return processed_messages
\ No newline at end of file
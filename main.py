@@ -33,9 +33,10 @@ async def main_async(app: QApplication):
     shutdown_future = asyncio.Future()
     window = None 
 
+    # 송수신 상태는 에이전트에서 모아 주기적으로 알리므로, 업데이트마다 태스크를 만들지 않고 바로 emit합니다.
     async def callback_wrapper(dev_id, msg, color):
         if window:
-            asyncio.create_task(status_update_callback(window, dev_id, msg, color))
+            await status_update_callback(window, dev_id, msg, color)
 
     # 1. Orchestrator 인스턴스 생성
     orchestrator = Orchestrator(status_callback=callback_wrapper)
@@ -5,9 +5,25 @@ from enum import IntEnum
 
 import time # time 모듈 임포트
 from typing import Optional, Callable, Awaitable
-import json # JSON 모듈 임포트
-from .secs_parser import parse_body, SecsItem # SecsItem 임포트
-from .secs_builder import build_secs_body
+from .models import SecsMessage
+from .secs_parser import (parse_body, SecsItem, SecsDecodeError, SecsStreamParser,  # SecsItem 임포트
+                          DEFAULT_MAX_DEPTH, DEFAULT_MAX_ITEMS)
+from .secs_builder import encode_secs_body
+from .secs_json import dumps_body
+from .parse_cache import ParseCache
+from .outbound_queue import OutboundQueue, DEFAULT_HIGH_WATER, DEFAULT_LOW_WATER
+from .transactions import Transaction, TransactionTable, DEFAULT_T3, DEFAULT_MAX_OUTSTANDING
+from .decode_pool import DecodePool, DEFAULT_OFFLOAD_THRESHOLD
+
+# HSMS 프레임 앞부분: 길이(4바이트) + 헤더(10바이트)
+FRAME_PREFIX_SIZE = 14
+_FRAME_PREFIX = struct.Struct('>IHBBHI')
+_HEADER = struct.Struct('>HBBHI')
+
+# 이 크기 이상의 데이터 메시지 Body는 수신하면서 바로 디코딩합니다 (None이면 사용 안 함).
+DEFAULT_STREAM_DECODE_THRESHOLD = 1024 * 1024
+# 스트리밍 디코딩 시 한 번에 읽는 최대 청크 크기
+STREAM_CHUNK_SIZE = 64 * 1024
 
 class HsmsMessageType(IntEnum):
     """SEMI E37 HSMS Message Types."""
@@ -21,53 +37,27 @@ class HsmsMessageType(IntEnum):
     REJECT_REQ = 7
     SEPARATE_REQ = 9
 
-    # --- 로깅을 위한 헬퍼 함수 ---
-def _convert_secs_item_to_dict(item: SecsItem) -> dict:
-    """SecsItem 객체를 JSON 직렬화 가능한 딕셔너리로 안전하게 변환합니다."""
-    value = item.value
-    if isinstance(value, list) and all(isinstance(i, SecsItem) for i in value):
-        value = [_convert_secs_item_to_dict(sub_item) for sub_item in value]
-    # ✅ [핵심 수정] bytes 타입이면 hex 문자열로 변환합니다.
-    elif isinstance(value, bytes):
-        value = value.hex().upper()
-    
-    return {"type": item.type, "value": value}
-
-def _preprocess_body_for_json(body: list) -> list:
-    """전송 전 메시지(dict 리스트) 내부의 bytes를 hex 문자열로 재귀적으로 변환합니다."""
-    if not isinstance(body, list):
-        return body
-
-    new_body = []
-    for item in body:
-        if not isinstance(item, dict):
-            new_body.append(item)
-            continue
-
-        new_item = item.copy()
-        value = new_item.get('value')
-
-        if isinstance(value, bytes):
-            new_item['value'] = value.hex().upper()
-        elif isinstance(value, list) and new_item.get('type') == 'L':
-            new_item['value'] = _preprocess_body_for_json(value)
-        
-        new_body.append(new_item)
-    return new_body
-
-# --- SecsItem을 JSON으로 변환하기 위한 헬퍼 함수 ---
-def secs_item_to_dict(item: SecsItem) -> dict:
-    """SecsItem 객체를 JSON 직렬화 가능한 딕셔너리로 변환합니다."""
-    if isinstance(item.value, list) and all(isinstance(i, SecsItem) for i in item.value):
-        return {"type": item.type, "value": [secs_item_to_dict(sub_item) for sub_item in item.value]}
-    return {"type": item.type, "value": item.value}
 
 class HsmsConnection:
     """개선된 HSMS 연결 관리 클래스"""
 
     def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, 
-                 message_callback: Callable[[dict], Awaitable],
-                 state_change_callback: Optional[Callable[[str], Awaitable]] = None):
+                 message_callback: Callable[[SecsMessage], Awaitable],
+                 state_change_callback: Optional[Callable[[str], Awaitable]] = None,
+                 lazy_decode: bool = False,
+                 stream_decode_threshold: Optional[int] = DEFAULT_STREAM_DECODE_THRESHOLD,
+                 max_decode_depth: Optional[int] = DEFAULT_MAX_DEPTH,
+                 max_decode_items: Optional[int] = DEFAULT_MAX_ITEMS,
+                 parse_cache_size: int = 0,
+                 send_high_water: int = DEFAULT_HIGH_WATER,
+                 send_low_water: int = DEFAULT_LOW_WATER,
+                 t3: Optional[float] = DEFAULT_T3,
+                 max_outstanding_transactions: int = DEFAULT_MAX_OUTSTANDING,
+                 send_s9f9_on_t3: bool = False,
+                 timer_wheel=None, t8: Optional[float] = None,
+                 session_filter: Optional[Callable[[int], bool]] = None,
+                 decode_pool: Optional[DecodePool] = None,
+                 offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD):
         self.reader = reader
         self.writer = writer
         self.peername = writer.get_extra_info('peername')
@@ -76,7 +66,35 @@ class HsmsConnection:
         self._message_callback = message_callback
         self._state_change_callback = state_change_callback
         self._disconnect_event = asyncio.Event()
-        self._send_lock = asyncio.Lock()  # 동시 전송 방지
+        # 송신 프레임은 큐에 모았다가 루프 반복마다 한 번에 내보냅니다 (호출 순서 = 전송 순서).
+        self.outbound = OutboundQueue(writer, high_water=send_high_water, low_water=send_low_water)
+        # W-bit 요청(System Bytes) -> Reply 매칭 테이블. T3 안에 Reply가 없으면 실패 처리합니다.
+        self.transactions = TransactionTable(t3, max_outstanding_transactions, on_timeout=self._on_t3_timeout)
+        # True이면 T3 만료 시 S9F9 (Transaction Timer Timeout)를 상대에게 보냅니다.
+        self.send_s9f9_on_t3 = send_s9f9_on_t3
+        # Linktest.req 등 제어 요청의 System Bytes -> 응답 Future
+        self._control_replies: dict[int, asyncio.Future] = {}
+        # T8 (Network Intercharacter Timeout): 프레임의 나머지 바이트가 T8 안에 오지 않으면 연결을 끊습니다.
+        # timer_wheel은 schedule(delay, callback, *args)/rearm(timer, delay)을 제공하는 공유 타이머 (None이면 T8 사용 안 함).
+        self.timer_wheel = timer_wheel
+        self.t8 = t8
+        self._t8_timer = None
+        # 데이터 메시지의 Session ID를 받아들일지 판단하는 함수 (None이면 모두 수용).
+        # False를 반환한 Session으로 온 메시지는 S9F1 (Unrecognized Device ID)로 거부합니다.
+        self.session_filter = session_filter
+        # True이면 수신 Body의 'L' 아이템을 실제로 접근할 때까지 디코딩하지 않습니다.
+        self.lazy_decode = lazy_decode
+        # 이 크기 이상의 데이터 메시지 Body는 전체를 버퍼링하지 않고 청크 단위로 디코딩합니다.
+        self.stream_decode_threshold = stream_decode_threshold
+        # 수신 Body 하나에서 허용하는 'L' 중첩 깊이와 아이템 수 (초과 시 S9F13 Abort로 거부)
+        self.max_decode_depth = max_decode_depth
+        self.max_decode_items = max_decode_items
+        # 같은 Body 바이트가 반복 수신되면 디코딩 결과를 재사용합니다 (0이면 사용 안 함).
+        self.parse_cache: Optional[ParseCache] = ParseCache(parse_cache_size) if parse_cache_size > 0 else None
+        # offload_threshold 이상의 Body는 decode_pool의 워커에서 디코딩해 루프를 막지 않습니다 (None이면 사용 안 함).
+        # decode_pool이 있으면 스트리밍 디코딩 임계값 이상의 Body도 여기서 디코딩합니다 (스트리밍은 풀이 없을 때만 사용).
+        self.decode_pool = decode_pool
+        self.offload_threshold = offload_threshold
         # T5 타이머를 위한 마지막 메시지 수신/송신 시간 기록
         self.last_message_time = time.monotonic() 
 
@@ -105,8 +123,18 @@ class HsmsConnection:
                         self.logger.error(f"Invalid message length: {message_length}")
                         break
                     
+                    self._restart_t8(True)
+                    if (self.stream_decode_threshold is not None
+                            and message_length - 10 >= self.stream_decode_threshold
+                            and not self.should_offload(message_length - 10)):
+                        # 큰 Body는 수신과 디코딩을 겹쳐서 처리합니다.
+                        # decode_pool이 있으면 전체를 받아 워커에서 디코딩합니다 (루프 점유 시간이 더 짧고 stats()에 집계됨).
+                        await self._receive_streamed_message(message_length)
+                        continue
+
                     # 메시지 페이로드 읽기
                     message_payload = await self.reader.readexactly(message_length)
+                    self._restart_t8(False)
                     if len(message_payload) != message_length:
                         self.logger.error("Incomplete message received")
                         break
@@ -131,11 +159,67 @@ class HsmsConnection:
         finally:
             await self._cleanup_connection()
 
+    async def _receive_streamed_message(self, message_length: int) -> None:
+        """
+        헤더를 먼저 읽고, 데이터 메시지라면 Body를 청크 단위로 읽으면서 SecsStreamParser로
+        디코딩합니다. 디코딩 비용이 네트워크 수신과 겹치고, 전체 Body를 버퍼링하지 않습니다.
+        """
+        header = await self.reader.readexactly(10)
+        body_length = message_length - 10
+        stype = header[5]
+        if stype != HsmsMessageType.DATA_MESSAGE:
+            # 제어 메시지는 기존 방식으로 처리합니다.
+            # (데이터 메시지는 lazy_decode 설정과 관계없이 수신하면서 디코딩합니다.)
+            body = await self.reader.readexactly(body_length)
+            self._restart_t8(False)
+            await self._process_frame(header, body)
+            return
+
+        parser = SecsStreamParser(max_depth=self.max_decode_depth, max_items=self.max_decode_items)
+        parsed_body: list = []
+        decode_error: Optional[SecsDecodeError] = None
+        remaining = body_length
+        while remaining:
+            chunk = await self.reader.read(min(remaining, STREAM_CHUNK_SIZE))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b'', remaining)
+            self.last_message_time = time.monotonic()
+            self._restart_t8(remaining > len(chunk))
+            remaining -= len(chunk)
+            if decode_error is not None:
+                continue  # 프레임 경계를 유지하기 위해 나머지 Body는 읽어서 버립니다.
+            try:
+                parsed_body.extend(parser.feed(chunk))
+            except SecsDecodeError as e:
+                decode_error = e
+
+        try:
+            if decode_error is not None:
+                raise decode_error
+            parser.close()
+        except SecsDecodeError as e:
+            self.logger.error(f"Error parsing streamed message body: {e}")
+            session_id, s_with_w_bit, _, _, system_bytes = _HEADER.unpack(header)
+            if s_with_w_bit & 0x80:
+                await self._send_abort(system_bytes, session_id)
+            return
+
+        self.logger.debug(f"Stream-decoded {body_length} byte body into {len(parsed_body)} item(s)")
+        await self._process_frame(header, b'', parsed_body=parsed_body)
+
     async def _cleanup_connection(self):
         """연결 정리"""
         self.logger.info("Cleaning up connection")
         self.is_selected = False
         self._disconnect_event.set()
+        self.transactions.fail_all(ConnectionError("HSMS connection closed"))
+        self._restart_t8(False)
+        for future in self._control_replies.values():
+            if not future.done():
+                future.set_exception(ConnectionError("HSMS connection closed"))
+        self._control_replies.clear()
+        # 아직 큐에 남은 프레임(예: Separate.req)을 닫기 전에 내보냅니다.
+        self.outbound.flush()
         
         if self._state_change_callback:
             try:
@@ -150,6 +234,23 @@ class HsmsConnection:
             except Exception as e:
                 self.logger.error(f"Error closing writer: {e}")
 
+    def _restart_t8(self, receiving: bool) -> None:
+        """프레임 수신 중이면 T8 타이머를 다시 걸고, 프레임이 끝났으면 해제합니다."""
+        if receiving and self.t8 and self.timer_wheel is not None:
+            # 프레임마다 타이머를 새로 만들지 않고 같은 핸들의 deadline만 늦춥니다.
+            if self._t8_timer is None:
+                self._t8_timer = self.timer_wheel.schedule(self.t8, self._on_t8_timeout)
+            else:
+                self._t8_timer = self.timer_wheel.rearm(self._t8_timer, self.t8)
+        elif self._t8_timer is not None:
+            self._t8_timer.cancel()
+
+    def _on_t8_timeout(self) -> None:
+        """T8 만료: 프레임이 중간에 멈춘 연결은 닫습니다 (수신 루프가 종료되며 정리됩니다)."""
+        self.logger.error(f"T8 timeout ({self.t8}s): incomplete frame, closing connection")
+        if not self.writer.is_closing():
+            self.writer.close()
+
     async def wait_for_disconnect(self):
         """연결 종료 대기"""
         await self._disconnect_event.wait()
@@ -199,8 +300,13 @@ class HsmsConnection:
         await self.send_hsms_message(HsmsMessageType.LINKTEST_RSP, system_bytes)
 
     async def _handle_linktest_rsp(self, s: int, f: int, w: bool, system_bytes: int, body: bytes) -> None:
-        """Linktest.rsp 처리"""
+        """Linktest.rsp 처리: 같은 System Bytes로 보낸 Linktest.req의 Future를 완료합니다."""
         self.logger.debug("Received Linktest.rsp")
+        future = self._control_replies.pop(system_bytes, None)
+        if future is None:
+            self.logger.warning(f"Unexpected Linktest.rsp (SB={system_bytes})")
+        elif not future.done():
+            future.set_result(True)
 
     async def _handle_separate_req(self, s: int, f: int, w: bool, system_bytes: int, body: bytes) -> None:
         """Separate.req 처리 및 연결 종료"""
@@ -212,34 +318,84 @@ class HsmsConnection:
         reason = body[0] if body else 0
         self.logger.warning(f"Received Reject.req with reason: {reason}")
 
-    async def _handle_data_message(self, s: int, f: int, w: bool, system_bytes: int, body: bytes) -> None:
-        """데이터 메시지 처리 및 콜백 호출"""
+    async def _handle_data_message(self, s: int, f: int, w: bool, system_bytes: int, body: bytes,
+                                   parsed_body: Optional[list] = None, session_id: int = 0) -> None:
+        """
+        데이터 메시지 처리 및 콜백 호출 (parsed_body가 있으면 이미 디코딩된 Body를 사용).
+        HSMS-GS처럼 한 연결에 여러 Session ID가 섞여 올 수 있으므로 session_id를 메시지에 담아 넘깁니다.
+        """
         if not self.is_selected:
             self.logger.warning(f"Received data message S{s}F{f} but not selected, sending reject")
             await self._send_reject(system_bytes, 4)  # Connection not ready
             return
+
+        if self.session_filter is not None and not self.session_filter(session_id):
+            self.logger.warning(f"Received S{s}F{f} for unknown session {session_id}, sending S9F1")
+            await self._send_s9f1(session_id, s, f, w, system_bytes)
+            return
             
         try:
-            parsed_body = parse_body(body) if body else []
+            if parsed_body is None:
+                if not body:
+                    parsed_body = []
+                elif self.should_offload(len(body)):
+                    parsed_body = await self._decode_offloaded(s, f, body)
+                elif self.parse_cache is not None:
+                    parsed_body = self.parse_cache.get_or_parse(body, self._decode_body)
+                else:
+                    parsed_body = self._decode_body(body)
             
             # ✅ [핵심 수정] 수신된 메시지 Body를 로깅하기 전에 안전하게 변환합니다.
-            body_for_log = [_convert_secs_item_to_dict(item) for item in parsed_body]
-            self.logger.debug(f"RECV S{s}F{f} Body: {json.dumps(body_for_log)}")
+            # DEBUG가 꺼져 있으면 로그용 변환(전체 디코딩)을 건너뜁니다.
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"RECV S{s}F{f} Body: {self._body_log_text(body, parsed_body)}")
 
 
-            message = {
-                's': s, 'f': f, 'w_bit': w,
-                'system_bytes': system_bytes,
-                'body': parsed_body
-            }
+            message = SecsMessage(s=s, f=f, w_bit=w, system_bytes=system_bytes, body=parsed_body,
+                                  session_id=session_id)
             
+            # 내가 보낸 요청에 대한 Reply(짝수 Function)이면 Transaction을 완료하고 콜백으로 넘기지 않습니다.
+            if not w and f % 2 == 0 and self.transactions.resolve(message):
+                self.logger.debug(f"Reply S{s}F{f} matched transaction SB={system_bytes}")
+                return
+
             self.logger.debug(f"Parsed data message S{s}F{f}, forwarding to agent")
             await self._message_callback(message)
             
         except Exception as e:
             self.logger.error(f"Error parsing message body: {e}")
             if w:  # W-bit이 설정된 경우 에러 응답 전송
-                await self._send_abort(system_bytes)
+                await self._send_abort(system_bytes, session_id)
+
+    @staticmethod
+    def _body_log_text(body: bytes, parsed_body: list) -> str:
+        """
+        로그용 Body JSON. 원본 바이트가 있으면 트리를 펼치지 않고 바이트에서 바로 만듭니다.
+        파서가 허용한 잘린 Body처럼 바이트에서 변환할 수 없으면 디코딩된 트리로 대신합니다
+        (로그 때문에 메시지 처리가 실패하지 않도록).
+        """
+        if body:
+            try:
+                return dumps_body(body)
+            except (struct.error, ValueError, IndexError):
+                pass
+        return dumps_body(parsed_body)
+
+    def _decode_body(self, body: bytes) -> list:
+        return parse_body(body, lazy=self.lazy_decode,
+                          max_depth=self.max_decode_depth, max_items=self.max_decode_items)
+
+    def should_offload(self, body_length: int) -> bool:
+        """이 크기의 Body를 decode_pool에서 디코딩할지 여부"""
+        return self.decode_pool is not None and body_length >= self.offload_threshold
+
+    async def _decode_offloaded(self, s: int, f: int, body: bytes) -> list:
+        """큰 Body를 워커에서 디코딩하고, 대기 시간과 디코딩 시간을 로그로 남깁니다."""
+        parsed_body, queue_time, decode_time = await self.decode_pool.decode(
+            body, max_depth=self.max_decode_depth, max_items=self.max_decode_items)
+        self.logger.info(f"Offloaded decode of S{s}F{f} ({len(body)} bytes): "
+                         f"queued {queue_time * 1000:.1f}ms, decoded {decode_time * 1000:.1f}ms")
+        return parsed_body
 
     async def _send_reject(self, system_bytes: int, reason: int):
         """Reject 메시지 전송"""
@@ -250,30 +406,87 @@ class HsmsConnection:
             body=body
         )
 
-    async def _send_abort(self, system_bytes: int):
+    async def _send_abort(self, system_bytes: int, session_id: int = 0):
         """Abort 메시지 전송 (S9F13)"""
         try:
-            await self.send_secs_message(9, 13, False, system_bytes, [])
+            await self.send_secs_message(9, 13, False, system_bytes, [], session_id=session_id)
         except Exception as e:
             self.logger.error(f"Failed to send abort: {e}")
 
+    async def _send_s9f1(self, session_id: int, s: int, f: int, w: bool, system_bytes: int):
+        """S9F1 (Unrecognized Device ID) 전송. Body는 거부한 메시지의 10바이트 헤더(MHEAD)입니다."""
+        mhead = _HEADER.pack(session_id, s | 0x80 if w else s, f, 0, system_bytes)
+        try:
+            await self.send_secs_message(9, 1, False, self.get_next_system_bytes(),
+                                         [{'type': 'B', 'value': mhead}], session_id=session_id)
+        except Exception as e:
+            self.logger.error(f"Failed to send S9F1: {e}")
+
+    def open_transaction(self, s: int, f: int, system_bytes: int) -> Transaction:
+        """
+        W-bit 요청을 보내기 전에 Reply를 기다릴 Transaction을 엽니다 (T3 타이머 시작).
+        상한에 도달하면 TransactionLimitError가 발생합니다.
+        """
+        return self.transactions.open(s, f, system_bytes)
+
+    async def send_request(self, s: int, f: int, system_bytes: int,
+                           body_obj: Optional[list | bytes] = None, session_id: int = 0) -> Transaction:
+        """W-bit 요청을 전송하고, Reply(또는 T3 만료)로 완료되는 Transaction을 반환합니다."""
+        transaction = self.open_transaction(s, f, system_bytes)
+        try:
+            await self.send_secs_message(s, f, True, system_bytes, body_obj, session_id=session_id)
+        except Exception as e:
+            self.transactions.discard(system_bytes, e)
+            raise
+        return transaction
+
+    def _on_t3_timeout(self, transaction: Transaction) -> None:
+        """T3 만료 콜백 (타이머 핸들러이므로 동기 함수)"""
+        self.logger.warning(f"T3 timeout: no reply to S{transaction.s}F{transaction.f} (SB={transaction.system_bytes})")
+        if self.send_s9f9_on_t3 and self.is_alive():
+            asyncio.ensure_future(self._send_s9f9(transaction))
+
+    async def _send_s9f9(self, transaction: Transaction):
+        """S9F9 (Transaction Timer Timeout) 전송. Body는 응답이 오지 않은 요청의 10바이트 헤더(SHEAD)입니다."""
+        shead = _HEADER.pack(0, transaction.s | 0x80, transaction.f, 0, transaction.system_bytes)
+        try:
+            await self.send_secs_message(9, 9, False, self.get_next_system_bytes(), [{'type': 'B', 'value': shead}])
+        except Exception as e:
+            self.logger.error(f"Failed to send S9F9: {e}")
+
     async def send_secs_message(self, s: int, f: int, w_bit: bool, 
-                               system_bytes: int, body_obj: Optional[list] = None) -> None:
-        """SECS-II 데이터 메시지 구성 및 전송"""
+                               system_bytes: int, body_obj: Optional[list | bytes] = None,
+                               session_id: int = 0, wait_for_drain: bool = True) -> None:
+        """
+        SECS-II 데이터 메시지 구성 및 전송 (body_obj는 아이템 리스트 또는 인코딩된 bytes).
+        session_id는 헤더의 Session ID(Device ID)로, 한 연결을 여러 가상 장비가 공유할 때 구분에 씁니다.
+        wait_for_drain=False면 송신 버퍼가 high watermark를 넘어도 기다리지 않고 큐에 넣기만 합니다
+        (수신 루프 안에서 보내는 Reply용: 수신 루프가 drain을 기다리면 양쪽이 서로 읽지 않아 멈출 수 있습니다).
+        """
         if not self.is_selected and not (s == 9 and f in [1, 5, 9, 11, 13]):  # 에러 메시지 예외
             raise RuntimeError("Connection not selected")
             
         try:
              # ✅ [핵심 수정] 전송할 메시지 Body를 로깅하기 전에 안전하게 변환합니다.
-            body_for_log = _preprocess_body_for_json(body_obj or [])
-            self.logger.debug(f"SEND S{s}F{f} Body: {json.dumps(body_for_log)}")
-            
-            body_bytes = build_secs_body(body_obj or [])
-            await self.send_hsms_message(
+            if isinstance(body_obj, (bytes, bytearray, memoryview)):
+                # 이미 인코딩된 Body (예: MessageTemplate.render 결과)
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"SEND S{s}F{f} Body(raw): {bytes(body_obj).hex().upper()}")
+                frame = bytearray(FRAME_PREFIX_SIZE + len(body_obj))
+                frame[FRAME_PREFIX_SIZE:] = body_obj
+            else:
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"SEND S{s}F{f} Body: {dumps_body(body_obj or [])}")
+
+                # 길이/헤더 자리를 비워 둔 버퍼에 Body를 인코딩하고, 같은 버퍼를 그대로 전송합니다.
+                frame = encode_secs_body(body_obj or [], headroom=FRAME_PREFIX_SIZE)
+            await self._send_frame(
                 HsmsMessageType.DATA_MESSAGE, 
                 system_bytes, 
-                s, f, w_bit=w_bit, 
-                body=body_bytes
+                s, f, w_bit, 
+                frame,
+                session_id=session_id,
+                wait_for_drain=wait_for_drain
             )
         except Exception as e:
             self.logger.error(f"Failed to send SECS message S{s}F{f}: {e}")
@@ -286,21 +499,29 @@ class HsmsConnection:
     
     async def _process_message(self, payload: bytes) -> None:
         """HSMS 메시지 파싱 및 라우팅"""
-        self.last_message_time = time.monotonic() # 메시지 수신 시 시간 갱신
-        
-    
         if len(payload) < 10:
             self.logger.error("Message too short for HSMS header")
             return
-            
+        await self._process_frame(payload[:10], payload[10:])
+
+    async def _process_frame(self, header: bytes, body: bytes, parsed_body: Optional[list] = None) -> None:
+        """10바이트 헤더와 Body로 분리된 HSMS 메시지를 라우팅합니다."""
+        self.last_message_time = time.monotonic() # 메시지 수신 시 시간 갱신
+
         try:
-            header = payload[:10]
-            body = payload[10:]
-            
             # 표준 10바이트 헤더: SessionID(H), s_byte(B), f_byte(B), ptype(B), stype(B), system(I)
             # unpack 포맷을 표준에 맞게 >HBBHHI 에서 >HBBBB I 로 변경해야 하나,
             # 현재 구조를 유지하며 ptype과 stype을 한 필드에서 분리합니다.
-            session_id, s_with_w_bit, f, ptype_stype_field, system_bytes = struct.unpack('>HBBHI', header)
+            header_fields = _HEADER.unpack(header)
+        except struct.error as e:
+            self.logger.error(f"Invalid message format during unpack: {e}")
+            return
+        await self._route_frame(header_fields, body, parsed_body)
+
+    async def _route_frame(self, header_fields: tuple, body: bytes, parsed_body: Optional[list] = None) -> None:
+        """언팩된 헤더 필드 (session, s|W, f, ptype<<8|stype, system)로 메시지를 핸들러에 전달합니다."""
+        try:
+            session_id, s_with_w_bit, f, ptype_stype_field, system_bytes = header_fields
             
             w_bit = bool(s_with_w_bit & 0x80)
             s = s_with_w_bit & 0x7F 
@@ -329,14 +550,14 @@ class HsmsConnection:
             }
 
             handler = handler_map.get(msg_type)
-            if handler:
+            if msg_type == HsmsMessageType.DATA_MESSAGE:
+                await self._handle_data_message(s, f, w_bit, system_bytes, body, parsed_body, session_id)
+            elif handler:
                 await handler(s, f, w_bit, system_bytes, body)
             else:
                 self.logger.warning(f"No handler for message type {msg_type.name}")
                 await self._send_reject(system_bytes, 3)
                 
-        except struct.error as e:
-            self.logger.error(f"Invalid message format during unpack: {e}")
         except Exception as e:
             self.logger.error(f"Critical error in _process_message: {e}")
 
@@ -346,45 +567,63 @@ class HsmsConnection:
         s: int = 0, f: int = 0, w_bit: bool = False, body: bytes = b''
     ) -> asyncio.Future | None:
         """HSMS 메시지 구성 및 전송"""
+        frame = bytearray(FRAME_PREFIX_SIZE + len(body))
+        frame[FRAME_PREFIX_SIZE:] = body
+        return await self._send_frame(msg_type, system_bytes, s, f, w_bit, frame)
+
+    async def _send_frame(
+        self, msg_type: HsmsMessageType, system_bytes: int,
+        s: int, f: int, w_bit: bool, frame: bytearray, session_id: int = 0,
+        wait_for_drain: bool = True
+    ) -> asyncio.Future | None:
+        """
+        앞쪽 FRAME_PREFIX_SIZE 바이트가 비어 있는 프레임 버퍼에 길이와 헤더를 채워 전송합니다.
+        Body는 이미 버퍼에 들어 있으므로 header + body 연결로 인한 복사가 없습니다.
+        """
         if self.writer.is_closing():
             raise RuntimeError("Connection is closing")
         
         response_future = None
         if msg_type == HsmsMessageType.LINKTEST_REQ:
-            response_future = asyncio.Future()
-            # Linktest.req의 경우 응답을 기다리기 위해 future를 설정합니다.
-
-        async with self._send_lock:
-            try:
-                s_byte = s | 0x80 if w_bit else s
-                stype = msg_type.value
-                ptype = 0
-                
-                # ✅ [핵심 수정] 제어 메시지는 Session ID를 0xFFFF로, 데이터 메시지는 0으로 설정합니다.
-                session_id = 0xFFFF if msg_type != HsmsMessageType.DATA_MESSAGE else 0
-                
-                if msg_type != HsmsMessageType.DATA_MESSAGE:
-                    s_byte = 0
-                    f = 0
-                
-                ptype_stype_field = (ptype << 8) | stype
+            # ✅ [수정] Linktest.req는 응답 Future를 System Bytes로 등록해 두고,
+            # Linktest.rsp 수신 시 _handle_linktest_rsp에서 완료합니다.
+            response_future = asyncio.get_running_loop().create_future()
+            self._control_replies[system_bytes] = response_future
 
-                # ✅ [핵심 수정] 제어 메시지는 Session ID를 0xFFFF로, 데이터 메시지는 0으로 설정합니다.
-                session_id = 0xFFFF if msg_type != HsmsMessageType.DATA_MESSAGE else 0
-                header = struct.pack('>HBBHI', session_id, s_byte, f, ptype_stype_field, system_bytes)
-                payload = header + body
-                length_bytes = len(payload).to_bytes(4, 'big')
-                
-                self.writer.write(length_bytes + payload)
-                await self.writer.drain()
-                
-                self.last_message_time = time.monotonic() # 메시지 전송 시 시간 갱신
-                
-                self.logger.debug(f"SENT: Type={msg_type.name} S{s}F{f} W={w_bit} SB={system_bytes}")
+        try:
+            s_byte = s | 0x80 if w_bit else s
+            stype = msg_type.value
+            ptype = 0
+            
+            if msg_type != HsmsMessageType.DATA_MESSAGE:
+                s_byte = 0
+                f = 0
+            
+            ptype_stype_field = (ptype << 8) | stype
+
+            # ✅ [핵심 수정] 제어 메시지는 Session ID를 0xFFFF로, 데이터 메시지는 지정된 Session ID(기본 0)로 설정합니다.
+            if msg_type != HsmsMessageType.DATA_MESSAGE:
+                session_id = 0xFFFF
+            _FRAME_PREFIX.pack_into(
+                frame, 0,
+                len(frame) - 4, session_id, s_byte, f, ptype_stype_field, system_bytes
+            )
+            
+            # 락 없이 큐에 넣습니다. 송신 버퍼가 high watermark를 넘었을 때만 기다립니다.
+            if wait_for_drain:
+                await self.outbound.send(frame)
+            else:
+                self.outbound.enqueue(frame)
+            
+            self.last_message_time = time.monotonic() # 메시지 전송 시 시간 갱신
+            
+            self.logger.debug(f"SENT: Type={msg_type.name} S{s}F{f} W={w_bit} SB={system_bytes}")
 
-                return response_future # Linktest를 위한 Future 반환
-                
-            except Exception as e:
-                self.logger.error(f"Failed to send HSMS message: {e}")
-                if response_future: response_future.set_exception(e)
-                raise
\ No newline at end of file
+            return response_future # Linktest를 위한 Future 반환
+            
+        except Exception as e:
+            self.logger.error(f"Failed to send HSMS message: {e}")
+            if response_future:
+                self._control_replies.pop(system_bytes, None)
+                response_future.set_exception(e)
+            raise
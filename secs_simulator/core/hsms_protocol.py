@@ -0,0 +1,268 @@
+"""
+BufferedProtocol-based HSMS transport.
+
+StreamReader 기반 HsmsConnection은 프레임마다 readexactly()를 두 번 호출하고 payload를
+헤더/Body로 다시 잘라내므로 메시지마다 최소 두 번 복사가 일어납니다. 이 모듈의 전송 계층은
+asyncio.BufferedProtocol로 재사용 수신 버퍼에 직접 데이터를 받고, 버퍼 안에서 프레임 경계를 찾아
+헤더는 버퍼에서 바로 언팩하고 Body는 memoryview 조각 그대로 디코더에 넘깁니다.
+
+수신 버퍼는 읽은 프레임 뒤에 남은 미완성 프레임만 앞으로 옮겨(compaction) 계속 재사용하며,
+버퍼보다 큰 프레임이 오면 그 크기만큼 한 번 늘립니다. 프레임이 버퍼의 끝에서 잘려
+두 조각으로 나뉘지 않으므로 항상 연속된 memoryview로 디코딩할 수 있습니다.
+
+    server = await start_hsms_server(on_connected, host, port)   # asyncio.start_server 대응
+    protocol, writer = await open_hsms_connection(host, port)    # asyncio.open_connection 대응
+    connection = BufferedHsmsConnection(protocol, writer, message_callback=...)
+
+BufferedHsmsConnection은 HsmsConnection의 공개 API(send_secs_message, send_hsms_message,
+is_selected, 콜백, wait_for_disconnect)를 그대로 유지하므로 DeviceAgent는 설정만으로 전환할 수 있습니다.
+"""
+import asyncio
+import logging
+import struct
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from .hsms import HsmsConnection, HsmsMessageType, _HEADER
+from .secs_parser import SecsDecodeError
+
+# 수신 버퍼의 초기 크기. 더 큰 프레임이 오면 필요한 만큼 늘립니다.
+DEFAULT_RECEIVE_BUFFER_SIZE = 64 * 1024
+# get_buffer()가 최소한 이만큼의 빈 공간을 돌려주도록 앞쪽으로 compaction 합니다.
+_MIN_FREE_SPACE = 4096
+# HsmsConnection.handle_connection과 같은 최대 메시지 길이
+MAX_MESSAGE_LENGTH = 0xFFFFFF
+
+_LENGTH = struct.Struct('>I')
+
+# 프레임 큐 항목: (헤더 필드, Body bytes, 디코딩된 Body 또는 None, 디코딩 오류 또는 None)
+FrameEntry = Tuple[tuple, bytes, Optional[list], Optional[Exception]]
+
+class _TransportWriter:
+    """asyncio.Transport를 HsmsConnection/DeviceAgent가 쓰는 StreamWriter 인터페이스로 감쌉니다."""
+
+    def __init__(self, transport: asyncio.Transport, protocol: 'HsmsProtocol'):
+        self._transport = transport
+        self._protocol = protocol
+
+    @property
+    def transport(self) -> asyncio.Transport:
+        return self._transport
+
+    def write(self, data) -> None:
+        self._transport.write(data)
+
+    def writelines(self, chunks) -> None:
+        self._transport.writelines(chunks)
+
+    async def drain(self) -> None:
+        await self._protocol._drain_helper()
+
+    def is_closing(self) -> bool:
+        return self._transport.is_closing()
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def wait_closed(self) -> None:
+        await asyncio.shield(self._protocol.closed)
+
+    def get_extra_info(self, name: str, default=None):
+        return self._transport.get_extra_info(name, default)
+
+class HsmsProtocol(asyncio.BufferedProtocol):
+    """
+    재사용 수신 버퍼에서 HSMS 프레임을 찾아 전달하는 BufferedProtocol.
+
+    연결 객체가 붙기 전(attach 전)에 도착한 프레임은 bytes로 복사해 frames 큐에 보관하고,
+    붙은 뒤에는 sink(헤더 필드, Body memoryview)를 동기적으로 호출합니다. sink는 호출이 끝나기 전에
+    memoryview를 디코딩하거나 복사해야 합니다 (버퍼는 다음 수신에 재사용됩니다).
+    """
+
+    def __init__(self, on_connected: Optional[Callable[['HsmsProtocol', _TransportWriter], None]] = None,
+                 buffer_size: int = DEFAULT_RECEIVE_BUFFER_SIZE):
+        self._on_connected = on_connected
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0          # 아직 처리하지 않은 데이터의 시작
+        self._end = 0            # 수신된 데이터의 끝
+        self._needed = 0         # 현재 미완성 프레임의 전체 크기 (알 수 없으면 0)
+        self._sink: Optional[Callable[[tuple, memoryview], None]] = None
+        # 수신할 때마다 미완성 프레임이 남았는지(True/False)를 알려 받는 콜백 (T8 타이머용)
+        self.partial_frame_callback: Optional[Callable[[bool], None]] = None
+        self._paused = False
+        self._drain_waiters: List[asyncio.Future] = []
+        self.frames: asyncio.Queue = asyncio.Queue()
+        self.transport: Optional[asyncio.Transport] = None
+        self.writer: Optional[_TransportWriter] = None
+        self.closed: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.logger = logging.getLogger("HSMS-Protocol")
+
+    def attach(self, sink: Callable[[tuple, memoryview], None]) -> None:
+        """이후 수신되는 프레임을 sink로 전달합니다."""
+        self._sink = sink
+
+    # --- asyncio.BufferedProtocol ---
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        self.writer = _TransportWriter(transport, self)
+        if self._on_connected is not None:
+            self._on_connected(self, self.writer)
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        if self._start == self._end:
+            self._start = self._end = 0
+        free = len(self._buffer) - self._end
+        if free < _MIN_FREE_SPACE or free < self._needed - (self._end - self._start):
+            self._compact(max(self._needed, self._end - self._start + _MIN_FREE_SPACE))
+        return self._view[self._end:]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self._end += nbytes
+        buffer, view = self._buffer, self._view
+        start, end = self._start, self._end
+        self._needed = 0
+        while end - start >= 4:
+            (length,) = _LENGTH.unpack_from(buffer, start)
+            if length < 10 or length > MAX_MESSAGE_LENGTH:
+                self.logger.error(f"Invalid message length: {length}")
+                self.transport.close()
+                break
+            frame_end = start + 4 + length
+            if frame_end > end:
+                self._needed = 4 + length
+                break
+            # 헤더는 버퍼에서 바로 언팩하고, Body는 복사 없이 memoryview로 넘깁니다.
+            header_fields = _HEADER.unpack_from(buffer, start + 4)
+            body = view[start + 14:frame_end]
+            try:
+                if self._sink is not None:
+                    self._sink(header_fields, body)
+                else:
+                    self.frames.put_nowait((header_fields, bytes(body), None, None))
+            finally:
+                body.release()
+            start = frame_end
+        self._start = start
+        if self.partial_frame_callback is not None:
+            self.partial_frame_callback(start != end)
+
+    def eof_received(self) -> Optional[bool]:
+        return None  # 트랜스포트를 닫습니다.
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.frames.put_nowait(None)
+        for waiter in self._drain_waiters:
+            if not waiter.done():
+                if exc is None:
+                    waiter.set_result(None)
+                else:
+                    waiter.set_exception(exc)
+        self._drain_waiters.clear()
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+    def pause_writing(self) -> None:
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        self._paused = False
+        for waiter in self._drain_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._drain_waiters.clear()
+
+    # --- helpers ---
+    async def _drain_helper(self) -> None:
+        if self.transport is None or self.transport.is_closing():
+            raise ConnectionResetError("Connection lost")
+        if not self._paused:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._drain_waiters.append(waiter)
+        await waiter
+
+    def _compact(self, capacity: int) -> None:
+        """미처리 데이터를 버퍼 앞으로 옮기고, 필요하면 capacity 이상으로 버퍼를 늘립니다."""
+        pending = self._end - self._start
+        if capacity > len(self._buffer):
+            new_buffer = bytearray(capacity)
+            new_buffer[:pending] = self._view[self._start:self._end]
+            self._view.release()
+            self._buffer = new_buffer
+            self._view = memoryview(new_buffer)
+        elif self._start:
+            self._buffer[:pending] = self._view[self._start:self._end]
+        self._start, self._end = 0, pending
+
+class BufferedHsmsConnection(HsmsConnection):
+    """
+    HsmsProtocol 위에서 동작하는 HsmsConnection.
+
+    데이터 메시지 Body는 수신 버퍼의 memoryview에서 바로 디코딩합니다 (기본 설정: lazy_decode=False,
+    parse_cache_size=0). lazy_decode나 parse_cache를 켜면 디코딩된 트리/캐시 키가 버퍼를 참조하지
+    않도록 Body를 한 번만 bytes로 복사하므로, 복사 없는 경로는 이 두 옵션을 끈 경우에만 적용됩니다.
+    decode_pool로 넘기는 큰 Body도 워커가 디코딩하는 동안 버퍼가 재사용되므로 복사해 둡니다.
+    """
+
+    def __init__(self, reader: HsmsProtocol, writer: _TransportWriter,
+                 message_callback: Callable, **kwargs):
+        # 수신은 프로토콜이 담당하므로 스트리밍 디코딩 임계값은 사용하지 않습니다.
+        kwargs.pop('stream_decode_threshold', None)
+        super().__init__(reader, writer, message_callback, stream_decode_threshold=None, **kwargs)
+        self.protocol = reader
+
+    async def handle_connection(self) -> None:
+        """프로토콜이 만든 프레임을 순서대로 핸들러에 전달합니다."""
+        frames = self.protocol.frames
+        self.protocol.attach(self._frame_received)
+        if self.t8 and self.timer_wheel is not None:
+            self.protocol.partial_frame_callback = self._restart_t8
+        try:
+            while True:
+                entry: Optional[FrameEntry] = await frames.get()
+                if entry is None:
+                    self.logger.info("Connection closed by peer (clean disconnect)")
+                    break
+                header_fields, body, parsed_body, error = entry
+                if error is not None:
+                    self.logger.error(f"Error parsing message body: {error}")
+                    if header_fields[1] & 0x80:
+                        await self._send_abort(header_fields[4])
+                    continue
+                await self._route_frame(header_fields, body, parsed_body)
+        except Exception as e:
+            self.logger.error(f"Critical error in connection handler: {e}")
+        finally:
+            await self._cleanup_connection()
+
+    def _frame_received(self, header_fields: tuple, body: memoryview) -> None:
+        """프로토콜 sink: memoryview가 유효한 동안 디코딩(또는 복사)해 큐에 넣습니다."""
+        self.last_message_time = time.monotonic()
+        stype = header_fields[3] & 0xFF
+        entry: FrameEntry
+        if (stype != HsmsMessageType.DATA_MESSAGE or not body or self.lazy_decode
+                or self.parse_cache is not None or self.should_offload(len(body))):
+            entry = (header_fields, bytes(body), None, None)
+        else:
+            try:
+                entry = (header_fields, b'', self._decode_body(body), None)
+            except SecsDecodeError as e:
+                entry = (header_fields, b'', None, e)
+        self.protocol.frames.put_nowait(entry)
+
+async def start_hsms_server(client_connected_cb: Callable[[HsmsProtocol, _TransportWriter], Awaitable],
+                            host: str, port: int, **kwargs) -> asyncio.AbstractServer:
+    """asyncio.start_server와 같은 방식으로 HsmsProtocol 서버를 시작합니다."""
+    loop = asyncio.get_running_loop()
+
+    def on_connected(protocol: HsmsProtocol, writer: _TransportWriter) -> None:
+        loop.create_task(client_connected_cb(protocol, writer))
+
+    return await loop.create_server(lambda: HsmsProtocol(on_connected), host, port, **kwargs)
+
+async def open_hsms_connection(host: str, port: int, **kwargs) -> Tuple[HsmsProtocol, _TransportWriter]:
+    """asyncio.open_connection과 같은 방식으로 HsmsProtocol 연결을 엽니다."""
+    loop = asyncio.get_running_loop()
+    _, protocol = await loop.create_connection(HsmsProtocol, host, port, **kwargs)
+    return protocol, protocol.writer
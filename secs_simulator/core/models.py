@@ -5,10 +5,10 @@ This module defines standardized data structures for representing
 SECS-II messages and their components, ensuring type safety and
 consistency throughout the application.
 """
-from dataclasses import dataclass
-from typing import Any, List, Union
+from dataclasses import dataclass, field, fields
+from typing import Any, List, Optional, Union
 
-@dataclass
+@dataclass(slots=True)
 class SecsItem:
     """
     Represents a single data item within a SECS-II message body.
@@ -18,6 +18,77 @@ class SecsItem:
         value (Union[List['SecsItem'], Any]): The value of the data item.
             For 'L' type, this will be a list of other SecsItem objects.
             For other types, it will be the corresponding Python type (str, int, float).
+
+    인스턴스별 __dict__ 없이 __slots__만 사용하므로, 대량의 수신 메시지를 보관해도
+    노드당 메모리가 작습니다. 수신된 트리는 여러 곳에서 공유되므로 읽기 전용으로 취급합니다.
+
+    동등 비교는 구조 기준입니다. U4 값이 list든 array.array든 요소가 같으면 같은 아이템으로 봅니다.
+    아이템은 변경 가능하므로 해시하지 않습니다. set/dict 키가 필요하면 secs_fingerprint의
+    item_fingerprint()/SecsMessage.fingerprint() 지문 바이트를 키로 사용합니다.
     """
     type: str
     value: Union[List['SecsItem'], Any]
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, SecsItem):
+            return NotImplemented
+        if self.type != other.type:
+            return False
+        value, other_value = self.value, other.value
+        if type(value) is type(other_value) or isinstance(value, str) or isinstance(other_value, str):
+            return value == other_value
+        # list / tuple / array.array / bytes 처럼 표현만 다른 시퀀스는 요소끼리 비교합니다.
+        try:
+            return list(value) == list(other_value)
+        except TypeError:
+            return value == other_value
+
+@dataclass(slots=True)
+class SecsMessage:
+    """
+    수신/송신된 SECS-II 데이터 메시지 한 건을 나타내는 레코드.
+
+    Attributes:
+        s (int): Stream 번호.
+        f (int): Function 번호.
+        w_bit (bool): 응답 요구(W-bit) 여부.
+        system_bytes (int): 트랜잭션을 식별하는 System Bytes.
+        body (list): SecsItem 리스트 (로그 임포트 결과는 JSON 호환 dict 리스트).
+        timestamp (int): 로그에서 읽은 시각(ms). 실시간 수신 메시지는 0입니다.
+        ascii_data (str): 로그의 AsciiData 컬럼 (로그 임포트 전용).
+        session_id (int): 수신 헤더의 Session ID. 한 연결을 여러 가상 장비가 공유(HSMS-GS)할 때 라우팅에 씁니다.
+
+    기존 dict 기반 코드와의 호환을 위해 ``msg['s']``, ``msg.get('s')`` 형태의 접근도 지원합니다.
+    """
+    s: int
+    f: int
+    w_bit: bool = False
+    system_bytes: int = 0
+    body: list = field(default_factory=list)
+    timestamp: int = 0
+    ascii_data: str = ''
+    session_id: int = 0
+    _fingerprint: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    def __getitem__(self, key: str) -> Any:
+        # 레코드 필드만 키로 취급합니다 (메서드나 내부 캐시가 dict 값처럼 보이지 않도록).
+        if key not in _MESSAGE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _MESSAGE_FIELDS else default
+
+    def to_dict(self) -> dict:
+        """메시지 라이브러리/시나리오에서 사용하는 {'s', 'f', 'w_bit', 'body'} 형태로 변환합니다."""
+        return {"s": self.s, "f": self.f, "w_bit": self.w_bit, "body": self.body}
+
+    def fingerprint(self) -> bytes:
+        """Body의 구조 지문을 반환합니다. 처음 호출할 때 계산해 레코드에 저장해 둡니다."""
+        if self._fingerprint is None:
+            from .secs_fingerprint import body_fingerprint
+            self._fingerprint = body_fingerprint(self.body)
+        return self._fingerprint
+
+# dict 호환 접근(msg['s'], msg.get('s'))에서 허용하는 키: '_'로 시작하지 않는 필드 이름
+_MESSAGE_FIELDS = frozenset(f.name for f in fields(SecsMessage) if not f.name.startswith('_'))
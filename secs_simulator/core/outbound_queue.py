@@ -0,0 +1,114 @@
+"""
+Coalescing outbound frame queue for HSMS connections.
+
+송신자마다 락을 잡고 write() + drain()을 기다리는 대신, 완성된 프레임을 동기적으로 큐에 넣고
+이벤트 루프의 다음 반복에서 한 번의 writelines()로 모아 내보냅니다. 대기 중인 바이트가
+flush_threshold를 넘으면 바로 내보냅니다.
+
+백프레셔는 트랜스포트의 쓰기 버퍼 한계(high/low watermark)로 적용합니다. 트랜스포트 버퍼와 큐에
+남은 바이트의 합이 high_water를 넘으면 송신자는 트랜스포트 버퍼가 low_water 아래로 내려갈 때까지
+기다립니다. 그 아래에서는 송신자가 전혀 await 하지 않습니다.
+"""
+import asyncio
+from typing import Dict, List, Optional
+
+DEFAULT_HIGH_WATER = 1024 * 1024
+DEFAULT_LOW_WATER = 256 * 1024
+# 대기 중인 바이트가 이 크기를 넘으면 다음 루프 반복을 기다리지 않고 바로 내보냅니다.
+DEFAULT_FLUSH_THRESHOLD = 64 * 1024
+
+class OutboundQueue:
+    """
+    HsmsConnection 하나의 송신 프레임 큐.
+
+    enqueue()는 동기 함수이므로 호출 순서가 곧 전송 순서입니다. 프레임 버퍼는 전송될 때까지
+    큐가 참조하므로 호출자는 enqueue 이후 버퍼를 수정하면 안 됩니다.
+    """
+
+    def __init__(self, writer, high_water: int = DEFAULT_HIGH_WATER, low_water: int = DEFAULT_LOW_WATER,
+                 flush_threshold: int = DEFAULT_FLUSH_THRESHOLD):
+        if not 0 <= low_water <= high_water:
+            raise ValueError("OutboundQueue requires 0 <= low_water <= high_water")
+        self.writer = writer
+        self.high_water = high_water
+        self.low_water = low_water
+        self.flush_threshold = flush_threshold
+        self._pending: List[bytes] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._loop = asyncio.get_running_loop()
+        self._transport = getattr(writer, 'transport', None)
+        if self._transport is not None:
+            # 트랜스포트가 high_water를 넘으면 pause_writing, low_water 아래로 내려가면 resume_writing
+            self._transport.set_write_buffer_limits(high=high_water, low=low_water)
+
+        # --- metrics ---
+        self.bytes_pending = 0
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.flushes = 0
+        self.max_batch_frames = 0
+        self.backpressure_waits = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """아직 트랜스포트에 넘기지 않은 프레임 수."""
+        return len(self._pending)
+
+    def write_buffer_size(self) -> int:
+        """트랜스포트 쓰기 버퍼에 남아 있는 바이트 수 (알 수 없으면 0)."""
+        if self._transport is None:
+            return 0
+        return self._transport.get_write_buffer_size()
+
+    def enqueue(self, frame: bytes) -> None:
+        """프레임을 큐에 넣고, 필요하면 이번 루프 반복이 끝날 때의 flush를 예약합니다."""
+        self._pending.append(frame)
+        self.bytes_pending += len(frame)
+        if self.bytes_pending >= self.flush_threshold:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_soon(self.flush)
+
+    async def send(self, frame: bytes) -> None:
+        """프레임을 큐에 넣고, 송신 버퍼가 high_water를 넘었으면 low_water 아래로 내려갈 때까지 기다립니다."""
+        self.enqueue(frame)
+        if self.bytes_pending + self.write_buffer_size() > self.high_water:
+            self.flush()
+            self.backpressure_waits += 1
+            await self.writer.drain()
+
+    def flush(self) -> None:
+        """대기 중인 프레임을 한 번의 writelines()로 트랜스포트에 넘깁니다."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = []
+        if self.writer.is_closing():
+            # 연결이 닫히는 중이면 보낼 수 없는 프레임은 버립니다.
+            self.bytes_pending = 0
+            return
+        if len(pending) == 1:
+            self.writer.write(pending[0])
+        else:
+            self.writer.writelines(pending)
+        self.flushes += 1
+        self.frames_sent += len(pending)
+        self.bytes_sent += self.bytes_pending
+        self.max_batch_frames = max(self.max_batch_frames, len(pending))
+        self.bytes_pending = 0
+
+    def stats(self) -> Dict[str, int]:
+        """모니터링/로그용 카운터 스냅샷."""
+        return {
+            'queue_depth': len(self._pending),
+            'bytes_pending': self.bytes_pending,
+            'write_buffer_bytes': self.write_buffer_size(),
+            'frames_sent': self.frames_sent,
+            'bytes_sent': self.bytes_sent,
+            'flushes': self.flushes,
+            'max_batch_frames': self.max_batch_frames,
+            'backpressure_waits': self.backpressure_waits,
+        }
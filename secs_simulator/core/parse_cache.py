@@ -0,0 +1,130 @@
+"""
+Parse-result memo cache for repeated SECS-II bodies.
+
+S1F1/S1F2, 고정된 S6F12 ACK, 주기적인 S1F3 상태 조회처럼 바이트 단위로 똑같은 Body가
+반복해서 수신되는 경우, 매번 새로 디코딩하지 않고 이전 디코딩 결과를 재사용합니다.
+키는 원본 Body 바이트이며, 크기가 제한된 LRU로 연결(HsmsConnection)마다 하나씩 둡니다.
+
+캐시된 트리는 여러 메시지가 공유하므로 저장할 때 읽기 전용 트리로 바꿉니다. 아이템 속성이나 리스트
+값을 바꾸려 하면 TypeError가 발생합니다 (copy.deepcopy()로 만든 복사본은 일반 SecsItem/list라 변경할
+수 있습니다). 최상위 리스트만은 조회할 때마다 새로 만들어 반환하므로, 수신 측에서 Body 리스트 자체에
+append 해도 캐시는 안전합니다. 손상되어 일부만 디코딩된 Body의 결과는 캐시하지 않습니다.
+"""
+import array
+import copy
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+
+from .models import SecsItem
+from .secs_parser import body_is_complete
+
+# 이 크기보다 큰 Body는 반복될 가능성이 낮고 메모리를 많이 쓰므로 캐시하지 않습니다.
+DEFAULT_MAX_BODY_SIZE = 4096
+
+class _FrozenList(list):
+    """캐시된 트리의 리스트 값. 변경 메서드는 TypeError를 발생시킵니다."""
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Cached SECS-II body is read-only")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return [copy.deepcopy(item, memo) for item in self]
+
+class _FrozenSecsItem(SecsItem):
+    """캐시된 트리의 아이템. 속성을 바꾸려 하면 TypeError를 발생시킵니다."""
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise TypeError("Cached SECS-II body is read-only")
+
+    __delattr__ = __setattr__
+
+    def __deepcopy__(self, memo: dict) -> SecsItem:
+        return SecsItem(type=self.type, value=copy.deepcopy(self.value, memo))
+
+def _freeze(items: List[SecsItem]) -> _FrozenList:
+    """디코딩 결과를 읽기 전용 트리로 복사합니다 (지연 아이템은 이때 모두 디코딩됩니다)."""
+    frozen = []
+    for item in items:
+        value = item.value
+        if item.type == 'L':
+            value = _freeze(value)
+        elif isinstance(value, (list, array.array)):
+            value = _FrozenList(value)
+        node = object.__new__(_FrozenSecsItem)
+        object.__setattr__(node, 'type', item.type)
+        object.__setattr__(node, 'value', value)
+        frozen.append(node)
+    return _FrozenList(frozen)
+
+class ParseCache:
+    """
+    원본 Body 바이트 -> 디코딩된 SecsItem 트리의 LRU 캐시.
+
+    Attributes:
+        max_entries: 보관할 최대 항목 수. 넘으면 가장 오래 사용하지 않은 항목을 버립니다.
+        max_body_size: 캐시 대상 Body의 최대 바이트 수.
+        hits, misses, evictions: 조회 적중/실패/축출 횟수.
+    """
+    __slots__ = ('max_entries', 'max_body_size', 'hits', 'misses', 'evictions', '_entries')
+
+    def __init__(self, max_entries: int = 256, max_body_size: int = DEFAULT_MAX_BODY_SIZE):
+        if max_entries <= 0:
+            raise ValueError("ParseCache max_entries must be positive")
+        self.max_entries = max_entries
+        self.max_body_size = max_body_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[bytes, List[SecsItem]]" = OrderedDict()
+
+    def get_or_parse(self, body: bytes, parse: Callable[[bytes], List[SecsItem]]) -> List[SecsItem]:
+        """
+        body의 디코딩 결과를 반환합니다. 캐시에 없으면 parse(body)로 디코딩해 읽기 전용 트리로 저장합니다.
+        parse에서 발생한 예외(SecsDecodeError 등)는 그대로 전달되며 결과는 저장되지 않습니다.
+        잘린 Body처럼 parse가 일부만 디코딩해 반환한 결과도 저장하지 않고 그대로 반환합니다.
+        """
+        if len(body) > self.max_body_size:
+            self.misses += 1
+            return parse(body)
+
+        key = bytes(body)
+        entries = self._entries
+        cached = entries.get(key)
+        if cached is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return list(cached)
+
+        self.misses += 1
+        items = parse(key)
+        if not body_is_complete(key):
+            return items
+        frozen = entries[key] = _freeze(items)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return list(frozen)
+
+    def clear(self) -> None:
+        """저장된 항목을 모두 버립니다 (카운터는 유지)."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """모니터링/로그용 카운터 스냅샷."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -1,6 +1,8 @@
+import array
 import struct
 from typing import List, Union # Union 추가
 from .models import SecsItem
+from .secs_parser import ARRAY_TYPECODES, LazySecsItem, NEEDS_BYTESWAP
 
 # SECS-II 데이터 타입 코드 (6-bit)
 TYPE_CODES = {
@@ -10,97 +12,199 @@ TYPE_CODES = {
     'U4':   0b101011, 'F4':   0b100100, 'F8':   0b100001,
 }
 
-# ✅ [추가] 딕셔너리를 SecsItem 객체로 변환하는 똑똑한 헬퍼 함수
-def _to_secs_item(item_data: Union[dict, SecsItem]) -> SecsItem:
-    """
-    딕셔너리 또는 SecsItem을 받아 항상 SecsItem 객체를 반환합니다.
-    재귀적으로 동작하여 중첩된 리스트도 모두 변환합니다.
-    """
-    if isinstance(item_data, SecsItem):
-        return item_data  # 이미 올바른 타입이면 그대로 반환
-
-    item_type = item_data.get('type')
-    item_value = item_data.get('value')
-    
-    if item_type == 'L' and isinstance(item_value, list):
-        # 리스트 안의 모든 항목들을 재귀적으로 변환
-        value = [_to_secs_item(sub_item) for sub_item in item_value]
-    else:
-        value = item_value
-        
-    return SecsItem(type=item_type, value=value)
-
-# ✅ [수정] build_secs_body 함수가 변환 로직을 사용하도록 수정
+# 숫자, 바이너리, 불리언 타입의 struct 포맷 문자 (반복 횟수와 함께 '>{n}{c}' 형태로 사용)
+PACK_CODES = {
+    'B': 'B', 'BOOL': '?',
+    'I1': 'b', 'I2': 'h', 'I4': 'i',
+    'U1': 'B', 'U2': 'H', 'U4': 'I',
+    'F4': 'f', 'F8': 'd'
+}
+
+# 숫자 타입 요소 하나의 바이트 크기
+_ITEM_SIZES = {item_type: struct.calcsize(f'>{code}') for item_type, code in PACK_CODES.items()}
+
+# 길이 바이트 수(1~3)에 따라 표현 가능한 최대 길이
+_MAX_LENGTH_1 = 0xFF
+_MAX_LENGTH_2 = 0xFFFF
+
+# ✅ [수정] 크기를 먼저 계산한 뒤 하나의 버퍼에 바로 기록하는 단일 패스 인코더를 사용합니다.
 def build_secs_body(items: List[Union[dict, SecsItem]]) -> bytes:
     """
     SecsItem 객체 또는 dict 객체 리스트로부터
     SECS-II 메시지 Body의 바이너리를 생성합니다.
     """
+    return bytes(encode_secs_body(items))
+
+def encode_secs_body(items: List[Union[dict, SecsItem]], headroom: int = 0) -> bytearray:
+    """
+    Body를 미리 할당한 bytearray 하나에 인코딩합니다.
+
+    1) 첫 번째 패스에서 각 아이템의 헤더/값 크기를 계산하고,
+    2) 전체 크기만큼 버퍼를 한 번 할당한 뒤 두 번째 패스에서 그 자리에 바로 기록합니다.
+    중첩 리스트마다 b''.join/bytes 연결을 하지 않으므로 깊은 리스트도 한 번만 복사됩니다.
+
+    dict(라이브러리 형식)와 SecsItem을 모두 받으며, 중간 SecsItem 변환을 하지 않습니다.
+    ``headroom``만큼 버퍼 앞쪽을 비워 두므로, HSMS 길이/헤더를 같은 버퍼에 채워
+    추가 복사 없이 전송할 수 있습니다.
+    """
     if not isinstance(items, list):
         raise TypeError("SECS message body must be a list of SecsItem or dict objects.")
 
-    # [핵심 수정] 본격적인 빌드 전, 모든 항목을 SecsItem 객체로 변환합니다.
-    secs_items = [_to_secs_item(item) for item in items]
-
-    # 각 SecsItem을 바이너리로 변환하여 합칩니다.
-    body_parts = [_build_item(item) for item in secs_items]
-    return b''.join(body_parts)
-
-def _build_item(item: SecsItem) -> bytes:
-    """단일 SecsItem을 포맷, 길이, 값을 포함한 바이너리로 변환합니다."""
-    item_type = item.type.upper()
-    if item_type not in TYPE_CODES:
-        raise ValueError(f"Unknown SECS data type: {item.type}")
-
-    # 1. 값을 먼저 인코딩하여 길이를 결정합니다.
-    if item_type == 'L':
-        value_bytes = build_secs_body(item.value)
-        length = len(item.value)
-    elif item_type == 'A':
-        value_bytes = str(item.value).encode('ascii')
-        length = len(value_bytes)
-    else: # 숫자, 바이너리, 불리언 타입
-        format_map = {
-            'B': '>B', 'BOOL': '>?',
-            'I1': '>b', 'I2': '>h', 'I4': '>i',
-            'U1': '>B', 'U2': '>H', 'U4': '>I',
-            'F4': '>f', 'F8': '>d'
-        }
-        
-        # ✅ [핵심 수정] 숫자 타입의 값이 리스트일 경우와 단일 값일 경우를 모두 처리합니다.
-        
-        # B 타입은 raw bytes일 수 있으므로 먼저 처리합니다.
-        if item_type == 'B' and isinstance(item.value, bytes):
-             value_bytes = item.value
-        else:
-            # 값이 리스트가 아니면, 처리를 위해 임시 리스트로 만듭니다.
-            values_to_pack = item.value if isinstance(item.value, list) else [item.value]
-            
+    plan: list = []
+    body_size = _plan_items(items, plan)
+
+    buffer = bytearray(headroom + body_size)
+    position = headroom
+    pack_into = struct.pack_into
+    for format_byte, length, payload in plan:
+        if format_byte >= 0:
+            num_length_bytes = format_byte & 0b00000011
+            buffer[position] = format_byte
+            buffer[position + 1:position + 1 + num_length_bytes] = length.to_bytes(num_length_bytes, 'big')
+            position += 1 + num_length_bytes
+        if payload is None:
+            continue
+        if type(payload) is tuple:
+            pack_format, values, size, item_type = payload
             try:
-                # 리스트의 각 항목을 순회하며 pack하고, 그 결과 바이너리를 모두 합칩니다.
-                value_bytes = b''.join([struct.pack(format_map[item_type], v) for v in values_to_pack])
+                pack_into(pack_format, buffer, position, *values)
             except TypeError as e:
                 # 에러 발생 시 더 상세한 정보를 제공합니다.
                 raise TypeError(
                     f"Type mismatch for SECS type '{item_type}'. "
-                    f"Expected numbers, but got: {values_to_pack}. Original error: {e}"
+                    f"Expected numbers, but got: {values}. Original error: {e}"
                 ) from e
+            position += size
+        else:
+            size = len(payload)
+            buffer[position:position + size] = payload
+            position += size
+    return buffer
+
+def encoded_size(items: List[Union[dict, SecsItem]]) -> int:
+    """
+    items를 인코딩했을 때의 Body 바이트 수를 인코딩하지 않고 계산합니다 (메모리 사용량 집계용).
+    값을 pack하거나 문자열을 인코딩하지 않으므로 build_secs_body보다 훨씬 가볍습니다.
+    """
+    total = 0
+    stack = [items]
+    while stack:
+        for item in stack.pop():
+            if isinstance(item, dict):
+                item_type, value = item.get('type'), item.get('value')
+            elif isinstance(item, LazySecsItem) and not item.is_decoded:
+                total += len(item.raw_bytes())
+                continue
+            else:
+                item_type, value = item.type, item.value
+
+            if item_type == 'L':
+                length = len(value) if isinstance(value, list) else 0
+                if length:
+                    stack.append(value)
+            elif item_type == 'A' or isinstance(value, (bytes, bytearray, str)):
+                length = len(value) if value is not None else 0
+            elif isinstance(value, array.array):
+                length = len(value) * _ITEM_SIZES.get(item_type.upper(), value.itemsize)
+            else:
+                count = len(value) if isinstance(value, (list, tuple)) else 1
+                length = count * _ITEM_SIZES.get(item_type.upper(), 1)
+            header = 2 if length <= _MAX_LENGTH_1 else 3 if length <= _MAX_LENGTH_2 else 4
+            total += header + (0 if item_type == 'L' else length)
+    return total
+
+def _plan_items(items: list, plan: list) -> int:
+    """
+    인코딩 계획을 plan에 (포맷 바이트, 길이, 페이로드) 튜플로 쌓고, 전체 바이트 수를 반환합니다.
+    페이로드는 None('L'), bytes류(복사), 또는 pack_into에 넘길 (포맷, 값들, 크기, 타입) 튜플입니다.
+    포맷 바이트가 -1이면 헤더가 이미 포함된 원본 인코딩(LazySecsItem)입니다.
+    """
+    total = 0
+    for item in items:
+        if isinstance(item, dict):
+            item_type, value = item.get('type'), item.get('value')
+        elif isinstance(item, LazySecsItem) and not item.is_decoded:
+            # 아직 디코딩되지 않은 LazySecsItem은 원본 인코딩을 그대로 재사용합니다.
+            raw = item.raw_bytes()
+            plan.append((-1, 0, raw))
+            total += len(raw)
+            continue
+        else:
+            item_type, value = item.type, item.value
+
+        item_type = item_type.upper()
+        type_code = TYPE_CODES.get(item_type)
+        if type_code is None:
+            raise ValueError(f"Unknown SECS data type: {item_type}")
+
+        # 1. 값의 크기를 먼저 계산합니다.
+        if item_type == 'L':
+            if not isinstance(value, list):
+                raise TypeError("SECS message body must be a list of SecsItem or dict objects.")
+            length = len(value)
+            payload = None
+            plan_index = len(plan)
+            plan.append(None)  # 헤더 자리를 먼저 잡고, 자식 계획을 그 뒤에 쌓습니다.
+            value_size = _plan_items(value, plan)
+        elif item_type == 'A':
+            payload = str(value).encode('ascii')
+            length = value_size = len(payload)
+        elif item_type == 'B' and isinstance(value, (bytes, bytearray)):
+            payload = value
+            length = value_size = len(payload)
+        else: # 숫자, 바이너리, 불리언 타입
+            payload = _plan_numeric_array(item_type, value)
+            length = value_size = payload[2] if type(payload) is tuple else len(payload)
 
-        length = len(value_bytes)
+        # 2. 길이를 나타내는 바이트 수를 결정합니다 (1~3 바이트).
+        if length <= _MAX_LENGTH_1:
+            num_length_bytes = 1
+        elif length <= _MAX_LENGTH_2:
+            num_length_bytes = 2
+        else: # 16777215 (0xFFFFFF)
+            num_length_bytes = 3
 
-    # 2. 길이를 나타내는 바이트를 결정합니다 (1~3 바이트).
-    if length <= 255:
-        length_bytes = length.to_bytes(1, 'big')
-        num_length_bytes = 1
-    elif length <= 65535:
-        length_bytes = length.to_bytes(2, 'big')
-        num_length_bytes = 2
-    else: # 16777215 (0xFFFFFF)
-        length_bytes = length.to_bytes(3, 'big')
-        num_length_bytes = 3
+        # 3. 포맷 바이트를 생성합니다. (타입 코드 << 2 | 길이 바이트 수)
+        entry = ((type_code << 2) | num_length_bytes, length, payload)
+        if item_type == 'L':
+            plan[plan_index] = entry
+        else:
+            plan.append(entry)
+        total += 1 + num_length_bytes + value_size
+    return total
+
+def _plan_numeric_array(item_type: str, value):
+    """
+    숫자 배열의 인코딩 페이로드를 준비합니다.
+    array.array는 byteswap된 bytes로, 그 외에는 pack_into로 한 번에 기록할 (포맷, 값들, 크기, 타입) 튜플로 반환합니다.
+    """
+    if isinstance(value, array.array):
+        return _pack_numeric_array(item_type, value)
+
+    # 값이 리스트가 아니면, 처리를 위해 임시 리스트로 만듭니다.
+    values_to_pack = value if isinstance(value, (list, tuple)) else [value]
+    count = len(values_to_pack)
+    return (f'>{count}{PACK_CODES[item_type]}', values_to_pack, count * _ITEM_SIZES[item_type], item_type)
+
+def _pack_numeric_array(item_type: str, value) -> bytes:
+    """
+    숫자 배열 전체를 한 번의 호출로 인코딩합니다.
+    array.array 값은 byteswap만으로, 리스트는 반복 횟수가 포함된 struct 포맷으로 pack합니다.
+    """
+    if isinstance(value, array.array) and value.typecode == ARRAY_TYPECODES.get(item_type, 'B'):
+        if NEEDS_BYTESWAP and value.itemsize > 1:
+            value = array.array(value.typecode, value)
+            value.byteswap()
+        return value.tobytes()
 
-    # 3. 포맷 바이트를 생성합니다. (타입 코드 << 2 | 길이 바이트 수)
-    format_byte = (TYPE_CODES[item_type] << 2) | num_length_bytes
-    
-    return format_byte.to_bytes(1, 'big') + length_bytes + value_bytes
+    # 값이 리스트가 아니면, 처리를 위해 임시 리스트로 만듭니다.
+    values_to_pack = value if isinstance(value, (list, tuple, array.array)) else [value]
 
+    try:
+        return struct.pack(f'>{len(values_to_pack)}{PACK_CODES[item_type]}', *values_to_pack)
+    except TypeError as e:
+        # 에러 발생 시 더 상세한 정보를 제공합니다.
+        raise TypeError(
+            f"Type mismatch for SECS type '{item_type}'. "
+            f"Expected numbers, but got: {values_to_pack}. Original error: {e}"
+        ) from e
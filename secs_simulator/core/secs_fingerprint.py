@@ -0,0 +1,33 @@
+"""
+Structural fingerprints for SECS-II message bodies.
+
+Body의 SECS-II 인코딩은 구조(타입, 개수, 값)를 그대로 담은 정규 형식이므로, 그 바이트를
+blake2b로 해시하면 SecsItem 트리와 JSON dict 형식 Body 모두에 대해 같은 지문을 얻습니다.
+지문끼리의 비교와 dict/set 조회는 O(1)이므로, 메시지 중복 제거나 기대 메시지와의 비교에서
+깊은 트리 비교를 대신할 수 있습니다. 아직 디코딩되지 않은 LazySecsItem은 수신한 원본 바이트를
+그대로 해시하므로 트리를 펼치지 않습니다.
+"""
+import hashlib
+from typing import List, Union
+
+from .models import SecsItem
+from .secs_builder import encode_secs_body
+from .secs_parser import LazySecsItem
+
+FINGERPRINT_SIZE = 16
+
+def fingerprint_bytes(encoded: Union[bytes, bytearray, memoryview]) -> bytes:
+    """이미 인코딩된 Body(또는 아이템) 바이트의 지문을 반환합니다."""
+    return hashlib.blake2b(encoded, digest_size=FINGERPRINT_SIZE).digest()
+
+def body_fingerprint(body: List[Union[dict, SecsItem]]) -> bytes:
+    """SecsItem 또는 dict 리스트로 된 Body의 지문을 반환합니다."""
+    return fingerprint_bytes(encode_secs_body(body))
+
+def item_fingerprint(item: Union[dict, SecsItem]) -> bytes:
+    """아이템 하나의 지문을 반환합니다. 같은 구조의 아이템은 표현 형식과 무관하게 같은 지문을 갖습니다."""
+    if isinstance(item, LazySecsItem):
+        raw = item.raw_bytes()
+        if raw is not None:
+            return fingerprint_bytes(raw)
+    return fingerprint_bytes(encode_secs_body([item]))
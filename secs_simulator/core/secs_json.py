@@ -0,0 +1,160 @@
+"""
+SECS-II Body JSON serializer.
+
+SecsItem 트리, JSON dict 형식 Body, 인코딩된 Body 바이트를 모두 같은 JSON 텍스트로 변환합니다.
+중간 dict 트리를 만들지 않고 명시적 스택으로 트리(또는 바이트)를 한 번만 훑으며 텍스트 조각을
+바로 만들어 냅니다. 출력은 ``json.dumps([{"type": ..., "value": ...}, ...])``와 같고,
+'B' 값은 대문자 hex 문자열로 표현합니다.
+
+    dumps_body(message.body)              # -> '[{"type": "L", "value": [...]}]'
+    dumps_body(raw_body_bytes)            # 디코딩하지 않고 바이트에서 바로 변환
+    dump_body(message.body, fp)           # 큰 Body를 파일 객체에 나눠 쓰기
+    body_to_dicts(message.body)           # 라이브러리 저장용 dict 리스트가 필요할 때
+"""
+import array
+import json
+from typing import Any, Iterator, List, TextIO, Union
+
+from .models import SecsItem
+from .secs_parser import _LIST_CODE, _VALUE_DECODERS
+
+BodyLike = Union[List[Union[SecsItem, dict]], bytes, bytearray, memoryview]
+
+_encode_string = json.encoder.encode_basestring_ascii
+_encode_value = json.JSONEncoder().encode
+_BINARY_TYPES = (bytes, bytearray, memoryview)
+
+_END = object()
+
+# dump_body가 파일에 한 번에 쓰는 텍스트 크기
+_WRITE_CHUNK_SIZE = 64 * 1024
+
+def dumps_body(body: BodyLike) -> str:
+    """Body를 JSON 텍스트로 변환합니다."""
+    return ''.join(iter_body_json(body))
+
+def dump_body(body: BodyLike, fp: TextIO, chunk_size: int = _WRITE_CHUNK_SIZE) -> None:
+    """Body를 JSON 텍스트로 fp에 씁니다. 전체 문자열을 만들지 않고 chunk_size 단위로 나눠 씁니다."""
+    pending: List[str] = []
+    size = 0
+    for piece in iter_body_json(body):
+        pending.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            fp.write(''.join(pending))
+            pending.clear()
+            size = 0
+    if pending:
+        fp.write(''.join(pending))
+
+def iter_body_json(body: BodyLike) -> Iterator[str]:
+    """Body의 JSON 텍스트 조각을 순서대로 생성합니다."""
+    if isinstance(body, _BINARY_TYPES):
+        return _iter_encoded_json(memoryview(body))
+    return _iter_tree_json(body)
+
+def item_to_dict(item: Union[SecsItem, dict]) -> dict:
+    """아이템 하나를 JSON 직렬화 가능한 {'type', 'value'} dict로 변환합니다 ('B'는 hex 문자열)."""
+    if isinstance(item, dict):
+        item_type, value = item.get('type'), item.get('value')
+    else:
+        item_type, value = item.type, item.value
+    if item_type == 'L' and isinstance(value, list):
+        return {"type": item_type, "value": [item_to_dict(child) for child in value]}
+    return {"type": item_type, "value": _json_value(value)}
+
+def body_to_dicts(body: List[Union[SecsItem, dict]]) -> list:
+    """Body 전체를 JSON 직렬화 가능한 dict 리스트로 변환합니다 (메시지 라이브러리 저장용)."""
+    if not isinstance(body, list):
+        return body
+    return [item_to_dict(item) if isinstance(item, (SecsItem, dict)) else item for item in body]
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, _BINARY_TYPES):
+        return bytes(value).hex().upper()
+    if isinstance(value, array.array):
+        return value.tolist()
+    return value
+
+def _value_text(item_type: str, value: Any) -> str:
+    """'L'이 아닌 아이템 값의 JSON 텍스트."""
+    if isinstance(value, str):
+        return _encode_string(value)
+    if isinstance(value, _BINARY_TYPES):
+        return '"' + bytes(value).hex().upper() + '"'
+    if item_type != 'BOOL' and item_type[0] in 'IU' and isinstance(value, (list, array.array)):
+        # 정수 배열은 요소별 인코더 호출 없이 한 번에 만듭니다.
+        return '[' + ', '.join(map(str, value)) + ']'
+    if isinstance(value, array.array):
+        value = value.tolist()
+    return _encode_value(value)
+
+def _iter_tree_json(body: list) -> Iterator[str]:
+    """SecsItem/dict 트리를 재귀 없이 훑으며 JSON 조각을 생성합니다."""
+    yield '['
+    # (남은 형제 아이템 iterator, 첫 번째 형제인지 여부)
+    stack = [[iter(body), True]]
+    while stack:
+        frame = stack[-1]
+        item = next(frame[0], _END)
+        if item is _END:
+            stack.pop()
+            yield ']}' if stack else ']'
+            continue
+        prefix = '' if frame[1] else ', '
+        frame[1] = False
+        if isinstance(item, dict):
+            item_type, value = item.get('type'), item.get('value')
+        elif isinstance(item, SecsItem):
+            item_type, value = item.type, item.value
+        else:
+            yield prefix + _encode_value(item)
+            continue
+        if item_type == 'L' and isinstance(value, list):
+            yield prefix + '{"type": "L", "value": ['
+            stack.append([iter(value), True])
+        else:
+            yield f'{prefix}{{"type": {_encode_string(str(item_type))}, "value": {_value_text(item_type, value)}}}'
+
+def _iter_encoded_json(view: memoryview) -> Iterator[str]:
+    """
+    인코딩된 Body 바이트를 SecsItem으로 만들지 않고 바로 JSON 조각으로 변환합니다.
+    데이터가 중간에 끝나면 열린 리스트를 닫아 유효한 JSON으로 마무리합니다.
+    """
+    yield '['
+    end = len(view)
+    offset = 0
+    remaining = [-1]  # 열린 리스트별 남은 자식 개수 (-1: 최상위)
+    first = True
+    while offset < end:
+        format_char = view[offset]
+        num_length_bytes = format_char & 0b00000011
+        length = int.from_bytes(view[offset + 1:offset + 1 + num_length_bytes], 'big')
+        offset += 1 + num_length_bytes
+        remaining[-1] -= 1
+        code = format_char >> 2
+
+        if code == _LIST_CODE:
+            yield ('{"type": "L", "value": [' if first else ', {"type": "L", "value": [') + ('' if length else ']}')
+            first = False
+            if length:
+                remaining.append(length)
+                first = True
+                continue
+        else:
+            decoder = _VALUE_DECODERS.get(code)
+            if decoder is not None:  # 알 수 없는 포맷은 파서와 같이 건너뜁니다.
+                item_type = decoder[0]
+                value = decoder[1](view, offset, length, False)
+                yield f'{"" if first else ", "}{{"type": "{item_type}", "value": {_value_text(item_type, value)}}}'
+                first = False
+            offset += length
+
+        while len(remaining) > 1 and not remaining[-1]:
+            remaining.pop()
+            first = False
+            yield ']}'
+
+    for _ in range(len(remaining) - 1):
+        yield ']}'
+    yield ']'
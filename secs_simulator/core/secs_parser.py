@@ -1,14 +1,505 @@
+import array
 import struct
+import sys
 import io
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from .models import SecsItem
 
-def parse_body(body_bytes: bytes) -> List[SecsItem]:
+# A/B 비교용 플래그: True로 설정하면 기존 BytesIO 기반 파서를 기본으로 사용합니다.
+USE_LEGACY_PARSER = False
+
+# 데이터 포맷 코드(6-bit) -> (타입 이름, 요소 하나를 읽는 미리 컴파일된 Struct)
+# L/A/B는 요소 단위 언팩이 필요 없으므로 Struct를 두지 않습니다.
+_ITEM_FORMATS = {
+    0b000000: ('L', None),
+    0b010000: ('A', None),
+    0b001000: ('B', None),
+    0b001001: ('BOOL', struct.Struct('>?')),
+    0b011001: ('I1', struct.Struct('>b')),
+    0b011010: ('I2', struct.Struct('>h')),
+    0b011100: ('I4', struct.Struct('>i')),
+    0b101001: ('U1', struct.Struct('>B')),
+    0b101010: ('U2', struct.Struct('>H')),
+    0b101011: ('U4', struct.Struct('>I')),
+    0b100001: ('F8', struct.Struct('>d')),
+    0b100100: ('F4', struct.Struct('>f')),
+}
+
+def _array_typecode(item_size: int, candidates: str) -> str:
+    """플랫폼에서 item_size 바이트 크기를 갖는 array.array 타입 코드를 찾습니다."""
+    for typecode in candidates:
+        if array.array(typecode).itemsize == item_size:
+            return typecode
+    raise RuntimeError(f"No array typecode with itemsize {item_size} in {candidates!r}")
+
+# 숫자 타입 -> 같은 크기의 array.array 타입 코드 (BOOL은 대응하는 타입 코드가 없어 제외)
+ARRAY_TYPECODES = {
+    'I1': 'b', 'U1': 'B',
+    'I2': 'h', 'U2': 'H',
+    'I4': _array_typecode(4, 'ilh'), 'U4': _array_typecode(4, 'ILH'),
+    'F4': 'f', 'F8': 'd',
+}
+
+# SECS-II는 빅엔디언이므로 리틀엔디언 플랫폼에서는 byteswap이 필요합니다.
+NEEDS_BYTESWAP = sys.byteorder == 'little'
+
+# 이 개수 이상의 배열은 array.array로 한 번에 디코딩합니다. 그보다 작으면 struct가 더 빠릅니다.
+_BULK_ARRAY_THRESHOLD = 16
+
+# 하나의 Body에서 허용하는 'L' 중첩 깊이와 아이템 수의 기본 상한.
+# 손상되었거나 악의적인 프레임 하나가 이벤트 루프를 오래 붙잡지 못하도록 막습니다. None이면 제한하지 않습니다.
+DEFAULT_MAX_DEPTH = 1024
+DEFAULT_MAX_ITEMS = 1_000_000
+
+class SecsDecodeError(ValueError):
+    """SECS-II Body를 디코딩할 수 없을 때 (불완전하거나 제한을 초과한 데이터) 발생합니다."""
+
+def _decode_ascii(view: memoryview, offset: int, length: int, as_array: bool):
+    return str(view[offset:offset + length], 'ascii', 'replace')
+
+def _decode_binary(view: memoryview, offset: int, length: int, as_array: bool):
+    return bytes(view[offset:offset + length])
+
+def _numeric_decoder(item_type: str, item_struct: struct.Struct):
+    def decode(view: memoryview, offset: int, length: int, as_array: bool):
+        return _decode_numeric_array(item_type, item_struct, view, offset, length, as_array)
+    return decode
+
+# 'L'이 아닌 포맷 코드 -> (타입 이름, 값 디코더). 모듈 로드 시 한 번만 만들어 모든 아이템이 공유합니다.
+_VALUE_DECODERS = {
+    code: (name, _decode_ascii if name == 'A' else _decode_binary if name == 'B'
+           else _numeric_decoder(name, item_struct))
+    for code, (name, item_struct) in _ITEM_FORMATS.items() if name != 'L'
+}
+_LIST_CODE = 0b000000
+
+class LazySecsItem(SecsItem):
+    """
+    원본 버퍼의 offset만 기록해 두었다가 .value에 처음 접근할 때 자식을 디코딩하는 'L' 아이템.
+
+    SecsItem의 하위 클래스이므로 build_secs_body, JSON 변환 헬퍼 등 SecsItem을 받는
+    모든 곳에서 그대로 사용할 수 있습니다. 자식 중 'L' 아이템도 다시 LazySecsItem으로 만들어집니다.
+
+    최상위 지연 아이템을 만들 때 하위 트리 전체의 헤더를 한 번 훑어 아이템 경계를 검증하고, 모든 'L'
+    아이템의 끝 offset을 ends(시작 offset -> 끝 offset)에 기록해 트리 전체가 공유합니다. 잘린 Body는
+    이때 거부되므로 접근 시점에 디코딩 오류가 나지 않고, 하위 리스트를 만들 때 다시 훑지 않습니다.
+    디코딩되지 않은 아이템은 원본 Body를 참조하며, 자식을 디코딩하면 그 참조를 놓습니다.
+    """
+    __slots__ = ('_view', '_start', '_offset', '_end', '_count', '_as_array', '_ends', '_children')
+
+    def __init__(self, view: memoryview, start: int, offset: int, end: int, count: int,
+                 as_array: bool = False, ends: Optional[Dict[int, int]] = None):
+        self.type = 'L'
+        self._view = view
+        self._start = start
+        self._offset = offset
+        self._end = end
+        self._count = count
+        self._as_array = as_array
+        self._ends = ends
+        self._children: Optional[List[SecsItem]] = None
+
+    @property
+    def value(self) -> List[SecsItem]:
+        if self._children is None:
+            self._children = _decode_children(self._view, self._offset, self._end, self._count,
+                                              self._as_array, self._ends)
+            self._view = self._ends = None
+        return self._children
+
+    @value.setter
+    def value(self, children: List[SecsItem]) -> None:
+        self._children = children
+        self._view = self._ends = None
+
+    @property
+    def is_decoded(self) -> bool:
+        """자식이 이미 디코딩되었는지 여부."""
+        return self._children is not None
+
+    def raw_bytes(self) -> Optional[bytes]:
+        """
+        아직 디코딩되지 않았다면 헤더를 포함한 이 아이템의 원본 인코딩을 반환합니다.
+        디코딩된 이후에는 값이 수정되었을 수 있으므로 None을 반환합니다.
+        """
+        if self._children is not None:
+            return None
+        return bytes(self._view[self._start:self._end])
+
+    def __repr__(self) -> str:
+        if self._children is None:
+            return f"LazySecsItem(type='L', count={self._count}, decoded=False)"
+        return f"LazySecsItem(type='L', value={self._children!r})"
+
+def parse_body(body_bytes: bytes, legacy: Optional[bool] = None, as_array: bool = False,
+               lazy: bool = False, max_depth: Optional[int] = DEFAULT_MAX_DEPTH,
+               max_items: Optional[int] = DEFAULT_MAX_ITEMS) -> List[SecsItem]:
     """
     Parses a SECS-II message body from bytes into a list of SecsItem objects.
     This is the public entry point for the parser.
+
+    기본적으로 memoryview 기반 디코더를 사용합니다. ``legacy=True``(또는
+    ``USE_LEGACY_PARSER``)이면 기존 BytesIO 기반 디코더로 파싱하여 결과를 비교할 수 있습니다.
+    ``as_array=True``이면 숫자 배열 값을 list 대신 array.array로 반환합니다 (BOOL 제외).
+    ``lazy=True``이면 'L' 아이템을 LazySecsItem으로 만들어 자식 디코딩을 첫 접근 시점까지 미룹니다.
+
+    디코더는 재귀 없이 명시적 스택으로 동작하므로 중첩 깊이가 인터프리터 재귀 한도와 무관합니다.
+    'L' 중첩이 ``max_depth``를 넘거나 아이템 수가 ``max_items``를 넘으면 SecsDecodeError를 발생시킵니다.
+    (그 외의 손상된 데이터는 기존과 같이 경고를 출력하고 그때까지 디코딩한 아이템을 반환합니다.)
+    """
+    if legacy is None:
+        legacy = USE_LEGACY_PARSER
+    if legacy:
+        return _parse_body_legacy(body_bytes)
+
+    view = memoryview(body_bytes)
+    end = len(view)
+    items: List[SecsItem] = []
+    try:
+        if not lazy:
+            _decode_items(view, 0, end, items, as_array, max_depth, max_items)
+            return items
+        offset = 0
+        item_count = 0
+        while offset < end:
+            start = offset
+            format_char = view[offset]
+            if format_char >> 2 != _LIST_CODE:
+                item, offset = _decode_item(view, offset, end, as_array)
+                item_count += 1
+            else:
+                # 지연 아이템도 생성 시점에 하위 트리 전체의 헤더를 한 번 훑어 끝 위치를 찾고 제한을 검사합니다.
+                if max_depth is not None and max_depth < 1:
+                    raise SecsDecodeError(f"SECS-II list nesting exceeds max depth {max_depth}")
+                num_length_bytes = format_char & 0b00000011
+                count = int.from_bytes(view[offset + 1:offset + 1 + num_length_bytes], 'big')
+                offset += 1 + num_length_bytes
+                ends: Dict[int, int] = {}
+                item_end, scanned = _scan_items(view, offset, count, 1, max_depth,
+                                                None if max_items is None else max_items - item_count - 1, ends)
+                item = LazySecsItem(view, start, offset, item_end, count, as_array, ends)
+                item_count += 1 + scanned
+                offset = item_end
+            if max_items is not None and item_count > max_items:
+                raise SecsDecodeError(f"SECS-II body has more than {max_items} items")
+            if item is not None:
+                items.append(item)
+    except SecsDecodeError:
+        raise
+    except (IndexError, ValueError, struct.error) as e:
+        print(f"Parsing warning: Encountered malformed data. {e}")
+    return items
+
+def _decode_items(view: memoryview, offset: int, end: int, items: List[SecsItem], as_array: bool = False,
+                  max_depth: Optional[int] = DEFAULT_MAX_DEPTH,
+                  max_items: Optional[int] = DEFAULT_MAX_ITEMS, count: Optional[int] = None) -> int:
+    """
+    offset부터 end까지(count가 주어지면 최상위 아이템 count개까지) 디코딩해 items에 추가하고
+    다음 offset을 반환합니다.
+
+    열린 'L' 아이템마다 (부모 자식 리스트, 부모의 남은 자식 개수)를 스택에 쌓고 자식 리스트를
+    바꿔 가며 진행하므로 재귀 호출이 없습니다. 값 디코딩은 모듈 수준 디스패치 테이블을 사용합니다.
+    데이터가 중간에 끝나면 그때까지 채워진 리스트들을 닫고 반환합니다.
+    """
+    decoders = _VALUE_DECODERS
+    stack: List[Tuple[List[SecsItem], int]] = []
+    children = items
+    remaining = count if count is not None else -1  # -1: 최상위는 개수 제한 없이 end까지 읽습니다.
+    item_count = 0
+
+    while offset < end:
+        format_char = view[offset]
+        num_length_bytes = format_char & 0b00000011
+        if num_length_bytes == 1:
+            length = view[offset + 1]
+        elif num_length_bytes == 0:
+            length = 0
+        else:
+            length = int.from_bytes(view[offset + 1:offset + 1 + num_length_bytes], 'big')
+        offset += 1 + num_length_bytes
+
+        item_count += 1
+        if max_items is not None and item_count > max_items:
+            raise SecsDecodeError(f"SECS-II body has more than {max_items} items")
+
+        code = format_char >> 2
+        if code == _LIST_CODE:
+            if max_depth is not None and len(stack) >= max_depth:
+                raise SecsDecodeError(f"SECS-II list nesting exceeds max depth {max_depth}")
+            if length:
+                stack.append((children, remaining))
+                children, remaining = [], length
+                continue
+            item: Optional[SecsItem] = SecsItem(type='L', value=[])
+        else:
+            decoder = decoders.get(code)
+            if decoder is None:
+                item = None  # 알 수 없는 포맷은 길이만큼 건너뜁니다.
+            else:
+                item = SecsItem(type=decoder[0], value=decoder[1](view, offset, length, as_array))
+            offset += length
+
+        # 완성된 아이템을 부모에 붙이고, 그로 인해 자식이 다 찬 리스트들을 위로 닫아 올라갑니다.
+        while True:
+            if item is not None:
+                children.append(item)
+            remaining -= 1
+            if remaining or not stack:
+                break
+            finished = children
+            children, remaining = stack.pop()
+            item = SecsItem(type='L', value=finished)
+        if not remaining and not stack:
+            break
+
+    while stack:
+        finished = children
+        children, _ = stack.pop()
+        children.append(SecsItem(type='L', value=finished))
+    return offset
+
+def _decode_children(view: memoryview, offset: int, end: int, count: int, as_array: bool,
+                     ends: Dict[int, int]) -> List[SecsItem]:
+    """LazySecsItem의 자식들을 한 단계만 디코딩합니다. 하위 'L' 아이템은 다시 지연됩니다."""
+    children: List[SecsItem] = []
+    for _ in range(count):
+        if offset >= end:
+            break
+        child, offset = _decode_item(view, offset, end, as_array, ends)
+        if child is not None:
+            children.append(child)
+    return children
+
+def _skip_items(view: memoryview, offset: int, count: int) -> int:
+    """아이템 count개를 값 디코딩 없이 헤더만 읽으며 건너뛰고, 다음 offset을 반환합니다."""
+    remaining = count
+    while remaining:
+        format_char = view[offset]
+        num_length_bytes = format_char & 0b00000011
+        length = int.from_bytes(view[offset + 1:offset + 1 + num_length_bytes], 'big')
+        offset += 1 + num_length_bytes
+        remaining -= 1
+        if format_char >> 2 == _LIST_CODE:
+            remaining += length  # L 아이템은 바이트 수가 아니라 자식 개수입니다.
+        else:
+            offset += length
+    if offset > len(view):
+        raise IndexError(f"Item data runs past end of body ({offset} > {len(view)})")
+    return offset
+
+def body_is_complete(body_bytes: bytes) -> bool:
+    """
+    Body가 잘리지 않은 아이템들로 정확히 끝나는지 값 디코딩 없이 헤더만 읽어 확인합니다.
+    parse_body가 경고만 출력하고 일부만 디코딩해 반환하는 손상된 Body를 가려내는 데 씁니다.
+    """
+    view = memoryview(body_bytes)
+    offset, end = 0, len(view)
+    try:
+        while offset < end:
+            offset = _skip_items(view, offset, 1)
+    except IndexError:
+        return False
+    return True
+
+def _scan_items(view: memoryview, offset: int, count: int, depth: int, max_depth: Optional[int],
+                max_items: Optional[int], ends: Optional[Dict[int, int]] = None) -> Tuple[int, int]:
+    """
+    깊이 depth인 리스트의 자식 count개를 헤더만 읽으며 건너뛰고 (다음 offset, 건너뛴 아이템 수)를 반환합니다.
+    _skip_items와 같지만 열린 리스트별 남은 자식 개수를 스택으로 유지해 중첩 깊이/개수 제한을 검사합니다.
+    ends가 주어지면 건너뛴 'L' 아이템마다 시작 offset -> 끝 offset을 기록합니다.
+    """
+    pending = [count]
+    starts: List[int] = [-1]  # 열린 리스트의 시작 offset (-1: 호출자의 리스트)
+    total = 0
+    while pending:
+        if not pending[-1]:
+            pending.pop()
+            list_start = starts.pop()
+            if ends is not None and list_start >= 0:
+                ends[list_start] = offset
+            continue
+        pending[-1] -= 1
+        start = offset
+        format_char = view[offset]
+        num_length_bytes = format_char & 0b00000011
+        length = int.from_bytes(view[offset + 1:offset + 1 + num_length_bytes], 'big')
+        offset += 1 + num_length_bytes
+        total += 1
+        if max_items is not None and total > max_items:
+            raise SecsDecodeError(f"SECS-II body has more than {max_items} items")
+        if format_char >> 2 == _LIST_CODE:
+            if max_depth is not None and depth + len(pending) > max_depth:
+                raise SecsDecodeError(f"SECS-II list nesting exceeds max depth {max_depth}")
+            if length:
+                pending.append(length)
+                starts.append(start)
+            elif ends is not None:
+                ends[start] = offset
+        else:
+            offset += length
+    if offset > len(view):
+        raise IndexError(f"Item data runs past end of body ({offset} > {len(view)})")
+    return offset, total
+
+def _decode_item(view: memoryview, offset: int, end: int, as_array: bool = False,
+                 ends: Optional[Dict[int, int]] = None) -> Tuple[Optional[SecsItem], int]:
+    """
+    memoryview의 offset 위치에서 아이템 하나를 디코딩하고 (아이템, 다음 offset)을 반환합니다.
+    중간 bytes 객체를 만들지 않고 정수 offset만 이동시킵니다.
+    ends(지연 트리의 'L' 끝 offset 표)가 주어지면 'L' 아이템을 LazySecsItem으로 만듭니다.
+    """
+    start = offset
+    format_char = view[offset]
+    offset += 1
+    num_length_bytes = format_char & 0b00000011
+    if num_length_bytes == 1:
+        length = view[offset]
+    elif num_length_bytes == 0:
+        length = 0
+    else:
+        length = int.from_bytes(view[offset:offset + num_length_bytes], 'big')
+    offset += num_length_bytes
+
+    code = format_char >> 2
+    if code == _LIST_CODE:
+        if ends is not None:
+            item_end = ends[start]
+            return LazySecsItem(view, start, offset, item_end, length, as_array, ends), item_end
+        items: List[SecsItem] = []
+        offset = _decode_items(view, start, end, items, as_array, None, None, count=1)
+        return (items[0] if items else None), offset
+
+    decoder = _VALUE_DECODERS.get(code)
+    if decoder is None:
+        # 알 수 없는 포맷은 길이만큼 건너뜁니다.
+        return None, offset + length
+    return SecsItem(type=decoder[0], value=decoder[1](view, offset, length, as_array)), offset + length
+
+def _decode_numeric_array(item_type: str, item_struct: struct.Struct, view: memoryview,
+                          offset: int, length: int, as_array: bool = False):
+    """
+    숫자/불리언 배열 전체를 한 번의 호출로 디코딩합니다.
+    요소마다 unpack을 호출하지 않고 반복 횟수가 포함된 struct 포맷이나
+    array.array + byteswap을 사용합니다.
+    """
+    count = length // item_struct.size
+    typecode = ARRAY_TYPECODES.get(item_type)
+    if typecode is None:
+        # BOOL: '>{count}?' 포맷 하나로 전체를 언팩합니다.
+        return list(struct.unpack_from(f'>{count}{item_struct.format[-1]}', view, offset))
+
+    if as_array or count >= _BULK_ARRAY_THRESHOLD:
+        data_end = offset + count * item_struct.size
+        if data_end > len(view):
+            raise struct.error(f"{item_type} array needs {count * item_struct.size} bytes at offset {offset}")
+        values = array.array(typecode)
+        values.frombytes(view[offset:data_end])
+        if NEEDS_BYTESWAP and values.itemsize > 1:
+            values.byteswap()
+        return values if as_array else values.tolist()
+
+    return list(struct.unpack_from(f'>{count}{item_struct.format[-1]}', view, offset))
+
+class SecsStreamParser:
+    """
+    TCP 청크 단위로 도착하는 SECS-II Body를 이어서 디코딩하는 push-parser.
+
+    feed()에 청크를 넣을 때마다 디코딩할 수 있는 만큼 진행하고, 완성된 최상위 아이템을 반환합니다.
+    열려 있는 'L' 아이템은 (자식 리스트, 남은 개수) 스택으로 유지하며, 버퍼에는 아직 끝나지 않은
+    아이템 하나의 바이트만 남기 때문에 전체 Body를 한 번에 버퍼링하지 않습니다.
+
+    Example:
+        parser = SecsStreamParser()
+        for chunk in chunks:
+            items.extend(parser.feed(chunk))
+        parser.close()
     """
+
+    def __init__(self, as_array: bool = False, max_depth: Optional[int] = DEFAULT_MAX_DEPTH,
+                 max_items: Optional[int] = DEFAULT_MAX_ITEMS):
+        self._as_array = as_array
+        self._max_depth = max_depth
+        self._max_items = max_items
+        self._buffer = bytearray()
+        self._stack: List[list] = []  # [자식 리스트, 남은 자식 개수]
+        self.bytes_fed = 0
+        self.items_decoded = 0
+
+    @property
+    def is_complete(self) -> bool:
+        """열린 리스트나 미완성 아이템 없이 아이템 경계에 있는지 여부."""
+        return not self._stack and not self._buffer
+
+    def feed(self, chunk: bytes) -> List[SecsItem]:
+        """
+        청크를 추가하고, 이번 호출에서 완성된 최상위 아이템 리스트를 반환합니다.
+        중첩 깊이나 아이템 수 제한을 넘으면 SecsDecodeError를 발생시킵니다.
+        """
+        self.bytes_fed += len(chunk)
+        self._buffer += chunk
+        completed: List[SecsItem] = []
+        view = memoryview(self._buffer)
+        end = len(view)
+        offset = 0
+        try:
+            while offset < end:
+                format_char = view[offset]
+                num_length_bytes = format_char & 0b00000011
+                data_offset = offset + 1 + num_length_bytes
+                if data_offset > end:
+                    break  # 길이 바이트가 아직 도착하지 않았습니다.
+                length = int.from_bytes(view[offset + 1:data_offset], 'big')
+                is_list = format_char >> 2 == _LIST_CODE
+                if not is_list and data_offset + length > end:
+                    break  # 값이 아직 다 도착하지 않았습니다.
+
+                self.items_decoded += 1
+                if self._max_items is not None and self.items_decoded > self._max_items:
+                    raise SecsDecodeError(f"SECS-II body has more than {self._max_items} items")
+
+                if is_list:
+                    if self._max_depth is not None and len(self._stack) >= self._max_depth:
+                        raise SecsDecodeError(f"SECS-II list nesting exceeds max depth {self._max_depth}")
+                    offset = data_offset
+                    if length:
+                        self._stack.append([[], length])
+                        continue
+                    item = SecsItem(type='L', value=[])
+                else:
+                    item, offset = _decode_item(view, offset, end, self._as_array)
+
+                self._complete(item, completed)
+        finally:
+            view.release()
+            del self._buffer[:offset]
+        return completed
+
+    def close(self) -> None:
+        """Body 끝에서 호출합니다. 미완성 아이템이 남아 있으면 SecsDecodeError를 발생시킵니다."""
+        if not self.is_complete:
+            raise SecsDecodeError(
+                f"Incomplete SECS-II body: {len(self._stack)} open list(s), "
+                f"{len(self._buffer)} undecoded byte(s)"
+            )
+
+    def _complete(self, item: Optional[SecsItem], completed: List[SecsItem]) -> None:
+        """완성된 아이템을 부모 리스트에 붙이고, 그로 인해 완성된 리스트들을 위로 전파합니다."""
+        stack = self._stack
+        while stack:
+            frame = stack[-1]
+            if item is not None:
+                frame[0].append(item)
+            frame[1] -= 1
+            if frame[1]:
+                return
+            stack.pop()
+            item = SecsItem(type='L', value=frame[0])
+        if item is not None:
+            completed.append(item)
+
+def _parse_body_legacy(body_bytes: bytes) -> List[SecsItem]:
+    """기존 BytesIO 기반 파서입니다. 새 디코더와의 A/B 비교를 위해 유지합니다."""
     body_io = io.BytesIO(body_bytes)
     items: List[SecsItem] = []
     # ✅ [개선] 메시지 바디 전체를 파싱할 때까지 아이템을 순차적으로 읽도록 루프를 추가합니다.
@@ -0,0 +1,157 @@
+"""
+Compiled path accessors for SECS-II message bodies.
+
+Body 안의 값을 가리키는 작은 경로 언어와, 이를 한 번만 해석해 두는 컴파일러를 제공합니다.
+컴파일된 접근자는 경로 문자열별로 캐시되며, SecsItem 트리와 JSON dict 형식 Body 모두에서 동작합니다.
+
+경로 문법:
+    '0/1/0'             Body[0] -> 자식[1] -> 값 배열[0]  ('/' 또는 '.'로 구분)
+    'L[0].L[1].U4[0]'   각 단계에서 선택한 아이템의 타입을 함께 검사합니다.
+    [0, "value", 1]     log_converter 규칙 파일의 기존 리스트 형식 ("value"는 한 단계 내려간다는 의미)
+
+문자열 경로의 결과는 마지막으로 선택한 아이템의 값입니다. 요소가 하나뿐인 숫자 배열
+(예: U2 [251], B [0])은 스칼라로 풀어서 반환합니다. 경로가 맞지 않으면 None을 반환합니다.
+"""
+import re
+from array import array
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+PathStep = Tuple[int, Optional[str]]  # (인덱스, 기대 타입 또는 None)
+PathLike = Union[str, Sequence[Union[int, str]]]
+
+_SEGMENT_PATTERN = re.compile(r'^(?:([A-Za-z][A-Za-z0-9]*)\[(\d+)\]|(\d+))$')
+
+def parse_path(path: str) -> List[PathStep]:
+    """경로 문자열을 (인덱스, 기대 타입) 단계 리스트로 변환합니다."""
+    steps: List[PathStep] = []
+    for segment in re.split(r'[/.]', path.strip().strip('/')):
+        if not segment:
+            continue
+        match = _SEGMENT_PATTERN.match(segment)
+        if not match:
+            raise ValueError(f"Invalid SECS path segment '{segment}' in '{path}'")
+        type_name, typed_index, plain_index = match.groups()
+        if type_name is not None:
+            steps.append((int(typed_index), type_name.upper()))
+        else:
+            steps.append((int(plain_index), None))
+    return steps
+
+def compile_path(path: PathLike) -> Callable[[list], Any]:
+    """
+    경로를 접근자 함수로 컴파일합니다. 같은 경로는 캐시된 함수를 재사용합니다.
+
+    Example:
+        get_ceid = compile_path('0/1')
+        ceid = get_ceid(message.body)
+    """
+    if isinstance(path, str):
+        return _compile_string_path(path)
+    return _compile_legacy_path(tuple(path))
+
+def _item_parts(node: Any) -> Tuple[Optional[str], Any]:
+    """dict 또는 SecsItem에서 (타입, 값)을 꺼냅니다. 아이템이 아니면 (None, None)."""
+    if type(node) is dict:
+        return node.get('type'), node.get('value')
+    item_type = getattr(node, 'type', None)
+    if item_type is None:
+        return None, None
+    return item_type, node.value
+
+def _make_walker(steps: Sequence[PathStep]) -> Callable[[list], Any]:
+    """단계 리스트를 따라가 마지막으로 선택한 노드(아이템 또는 배열 요소)를 반환하는 함수를 만듭니다."""
+    steps = tuple(steps)
+
+    def walk(body: list) -> Any:
+        node: Any = body
+        is_body = True
+        try:
+            for index, expected_type in steps:
+                if is_body:
+                    container = node
+                    is_body = False
+                else:
+                    _, container = _item_parts(node)
+                    if isinstance(container, str) or container is None:
+                        return None
+                node = container[index]
+                if expected_type is not None and _item_parts(node)[0] != expected_type:
+                    return None
+        except (IndexError, KeyError, TypeError):
+            return None
+        return node
+
+    return walk
+
+@lru_cache(maxsize=1024)
+def _compile_string_path(path: str) -> Callable[[list], Any]:
+    walk = _make_walker(parse_path(path))
+
+    def accessor(body: list) -> Any:
+        node = walk(body)
+        item_type, value = _item_parts(node)
+        if item_type is None:
+            return node  # 배열 요소(스칼라) 또는 None
+        if item_type != 'L' and not isinstance(value, str):
+            try:
+                if len(value) == 1:
+                    return value[0]
+            except TypeError:
+                pass
+        return value
+
+    return accessor
+
+@lru_cache(maxsize=1024)
+def _compile_legacy_path(path: Tuple[Union[int, str], ...]) -> Callable[[list], Any]:
+    """
+    규칙 파일의 [0, "value", 1, "value", 0] 형식을 컴파일합니다.
+    log_converter의 기존 해석과 같이, 마지막 결과가 리스트이면 첫 요소를 반환합니다.
+    """
+    steps: List[PathStep] = []
+    ends_with_value = False
+    expect_index = True
+    for key in path:
+        if isinstance(key, int) and expect_index:
+            steps.append((key, None))
+            ends_with_value, expect_index = False, False
+        elif key == 'value' and not expect_index:
+            ends_with_value, expect_index = True, True
+        else:
+            # 'type' 같은 다른 키를 쓰는 경로는 기존 방식대로 한 단계씩 해석합니다.
+            return lambda body: _interpret_legacy_path(body, path)
+
+    walk = _make_walker(steps)
+
+    def accessor(body: list) -> Any:
+        node = walk(body)
+        if ends_with_value:
+            node = _item_parts(node)[1]
+        elif not steps:
+            node = body
+        if isinstance(node, _SEQUENCE_TYPES):
+            return node[0] if len(node) else None
+        return node
+
+    return accessor
+
+_SEQUENCE_TYPES = (list, tuple, array)
+
+def _interpret_legacy_path(body: list, path: Sequence[Union[int, str]]) -> Any:
+    current_level: Any = body
+    try:
+        for key in path:
+            if isinstance(key, int) and isinstance(current_level, list):
+                current_level = current_level[key]
+            elif isinstance(key, str) and type(current_level) is dict:
+                current_level = current_level[key]
+            elif key in ('type', 'value') and hasattr(current_level, 'type'):
+                current_level = getattr(current_level, key)
+            else:
+                return None
+        if isinstance(current_level, _SEQUENCE_TYPES):
+            return current_level[0] if current_level else None
+        return current_level
+    except (IndexError, KeyError, TypeError):
+        return None
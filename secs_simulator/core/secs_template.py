@@ -0,0 +1,177 @@
+"""
+Compiled SECS-II message templates.
+
+라이브러리 메시지(resources/messages/*.json)를 한 번 인코딩해 두고, 값이 바뀌는 필드만
+이름 있는 슬롯으로 노출합니다. 전송 시에는 미리 인코딩된 상수 바이트에 슬롯 값만
+다시 인코딩해 끼워 넣으므로, 매번 전체 Body를 JSON dict에서 인코딩할 필요가 없습니다.
+
+SECS-II의 'L' 길이는 바이트 수가 아니라 자식 개수이므로, 슬롯 값의 길이가 바뀌어도
+상위 리스트 헤더는 그대로이고 슬롯 아이템 자신의 길이 바이트만 달라집니다.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .models import SecsItem
+from .secs_builder import TYPE_CODES, encode_secs_body
+from .secs_path import parse_path
+
+SlotPath = Tuple[int, ...]
+
+def parse_slot_path(path: Union[str, Iterable[int]]) -> SlotPath:
+    """'0/1/0' 형태의 문자열 또는 정수 시퀀스를 Body 인덱스 경로 튜플로 변환합니다."""
+    if isinstance(path, str):
+        return tuple(index for index, _ in parse_path(path))
+    return tuple(int(part) for part in path)
+
+def is_slot_path(name: str) -> bool:
+    """'0/1/0'처럼 인덱스 경로로 해석되는 슬롯 이름인지 확인합니다 ('CEID' 같은 이름 슬롯은 False)."""
+    try:
+        return bool(parse_slot_path(name))
+    except ValueError:
+        return False
+
+class MessageTemplate:
+    """
+    상수 바이트와 슬롯으로 미리 컴파일된 SECS-II 메시지.
+
+    Attributes:
+        s, f, w_bit: 원본 라이브러리 메시지의 헤더 정보.
+        slot_names: 렌더링 시 값을 바꿀 수 있는 슬롯 이름 목록.
+    """
+    __slots__ = ('s', 'f', 'w_bit', 'slot_names', '_segments', '_slots', '_default_body', '_slot_ranges')
+
+    def __init__(self, s: int, f: int, w_bit: bool, segments: List[bytes], slots: List[Tuple[str, str, Any]]):
+        self.s = s
+        self.f = f
+        self.w_bit = w_bit
+        # segments[i] 다음에 slots[i]가 오고, 마지막 segment로 끝납니다 (len(segments) == len(slots) + 1).
+        self._segments = segments
+        self._slots = slots
+        self.slot_names = tuple(name for name, _, _ in slots)
+
+        # 기본값으로 렌더링한 Body와 각 슬롯의 바이트 범위를 미리 계산합니다.
+        default_parts = []
+        self._slot_ranges = []
+        position = 0
+        for segment, (_, item_type, default) in zip(segments, slots):
+            position += len(segment)
+            encoded = _encode_slot(item_type, default)
+            self._slot_ranges.append((position, position + len(encoded)))
+            default_parts.append(segment)
+            default_parts.append(encoded)
+            position += len(encoded)
+        default_parts.append(segments[-1])
+        self._default_body = b''.join(default_parts)
+
+    def render(self, values: Optional[Dict[str, Any]] = None, headroom: int = 0) -> bytearray:
+        """
+        슬롯 값을 채운 Body 바이너리를 반환합니다. 지정하지 않은 슬롯은 라이브러리 값을 사용합니다.
+
+        모든 슬롯의 인코딩 길이가 기본값과 같으면 미리 렌더링된 Body를 복사해 해당 범위만
+        덮어쓰고, 길이가 달라지면 상수 세그먼트와 슬롯 인코딩을 이어 붙입니다.
+        """
+        values = values or {}
+        unknown = set(values) - set(self.slot_names)
+        if unknown:
+            raise KeyError(f"Unknown template slot(s): {', '.join(sorted(unknown))}")
+
+        patches = []
+        same_size = True
+        for index, (name, item_type, _) in enumerate(self._slots):
+            if name not in values:
+                continue
+            encoded = _encode_slot(item_type, values[name])
+            start, end = self._slot_ranges[index]
+            same_size = same_size and len(encoded) == end - start
+            patches.append((index, encoded))
+
+        if same_size:
+            buffer = bytearray(headroom + len(self._default_body))
+            buffer[headroom:] = self._default_body
+            for index, encoded in patches:
+                start, end = self._slot_ranges[index]
+                buffer[headroom + start:headroom + end] = encoded
+            return buffer
+
+        encoded_slots = dict(patches)
+        parts = [bytes(headroom)]
+        for index, segment in enumerate(self._segments[:-1]):
+            parts.append(segment)
+            start, end = self._slot_ranges[index]
+            parts.append(encoded_slots.get(index, self._default_body[start:end]))
+        parts.append(self._segments[-1])
+        return bytearray(b''.join(parts))
+
+    def __repr__(self) -> str:
+        return f"MessageTemplate(S{self.s}F{self.f}, slots={list(self.slot_names)})"
+
+def compile_template(message: dict, slots: Optional[Iterable[str]] = None) -> MessageTemplate:
+    """
+    라이브러리 메시지({'s', 'f', 'w_bit', 'body'})를 MessageTemplate으로 컴파일합니다.
+
+    슬롯은 두 가지 방법으로 지정합니다.
+      - 라이브러리 아이템에 ``"slot": "LOTID"`` 키가 있으면 그 이름의 슬롯이 됩니다.
+      - ``slots``에 '0/1/0' 같은 인덱스 경로를 주면 해당 위치의 아이템이 그 경로 이름의 슬롯이 됩니다.
+    슬롯은 'L'이 아닌 단일 아이템이어야 합니다.
+    """
+    path_slots: Dict[SlotPath, str] = {}
+    for name in slots or ():
+        path_slots[parse_slot_path(name)] = name
+
+    segments: List[bytes] = []
+    slot_specs: List[Tuple[str, str, Any]] = []
+    pending: List[bytes] = []
+    found_paths = set()
+
+    def visit(items: list, prefix: SlotPath) -> None:
+        for index, item in enumerate(items):
+            path = prefix + (index,)
+            if isinstance(item, dict):
+                item_type, value, slot_name = item.get('type'), item.get('value'), item.get('slot')
+            else:
+                item_type, value, slot_name = item.type, item.value, None
+            item_type = str(item_type).upper()
+
+            if path in path_slots:
+                slot_name = path_slots[path]
+                found_paths.add(path)
+
+            if slot_name is not None:
+                if item_type == 'L':
+                    raise ValueError(f"Template slot '{slot_name}' must not be a list item")
+                segments.append(b''.join(pending))
+                pending.clear()
+                slot_specs.append((slot_name, item_type, value))
+            elif item_type == 'L':
+                if not isinstance(value, list):
+                    raise TypeError("SECS message body must be a list of SecsItem or dict objects.")
+                pending.append(_list_header(len(value)))
+                visit(value, path)
+            else:
+                pending.append(bytes(encode_secs_body([SecsItem(type=item_type, value=value)])))
+
+    visit(message.get('body') or [], ())
+    missing = set(path_slots) - found_paths
+    if missing:
+        names = ', '.join(path_slots[path] for path in sorted(missing))
+        raise KeyError(f"Template slot path(s) not found in message body: {names}")
+
+    segments.append(b''.join(pending))
+    return MessageTemplate(
+        s=message.get('s', 0),
+        f=message.get('f', 0),
+        w_bit=message.get('w_bit', False),
+        segments=segments,
+        slots=slot_specs,
+    )
+
+def _encode_slot(item_type: str, value: Any) -> bytes:
+    return bytes(encode_secs_body([SecsItem(type=item_type, value=value)]))
+
+def _list_header(count: int) -> bytes:
+    if count <= 0xFF:
+        num_length_bytes = 1
+    elif count <= 0xFFFF:
+        num_length_bytes = 2
+    else:
+        num_length_bytes = 3
+    return bytes([(TYPE_CODES['L'] << 2) | num_length_bytes]) + count.to_bytes(num_length_bytes, 'big')
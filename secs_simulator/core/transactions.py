@@ -0,0 +1,168 @@
+"""
+HSMS transaction table (Primary 메시지 -> Reply 매칭과 T3 Reply Timeout).
+
+W-bit가 설정된 Primary 메시지를 보낼 때 System Bytes를 키로 Transaction을 열고, 같은 System Bytes의
+Reply가 수신되면 완료합니다. T3 안에 Reply가 오지 않으면 TransactionTimeout으로 실패시키고
+항목을 제거하므로, 아무도 기다리지 않는 요청이 있어도 테이블이 계속 커지지 않습니다.
+
+    transaction = connection.open_transaction(s=1, f=1, system_bytes=sb)
+    await connection.send_secs_message(1, 1, True, sb, body)
+    reply = await transaction            # SecsMessage, 또는 TransactionTimeout / ConnectionError
+"""
+import asyncio
+import time
+from typing import Callable, Dict, Optional
+
+from .models import SecsMessage
+
+# SEMI E37 기본 T3 (Reply Timeout)
+DEFAULT_T3 = 45.0
+# 동시에 열어 둘 수 있는 Transaction의 기본 상한
+DEFAULT_MAX_OUTSTANDING = 256
+
+class TransactionTimeout(asyncio.TimeoutError):
+    """T3 안에 Reply를 받지 못했을 때 Transaction을 실패시키는 예외."""
+
+class TransactionLimitError(RuntimeError):
+    """열려 있는 Transaction 수가 상한에 도달해 새 Transaction을 열 수 없을 때 발생합니다."""
+
+def describe_failure(exc: BaseException) -> str:
+    """Reply 없이 끝난 Transaction의 원인(T3 만료, 연결 종료, 전송 실패 등)을 상태 메시지용 문구로 만듭니다."""
+    if isinstance(exc, TransactionTimeout):
+        return str(exc)
+    if isinstance(exc, asyncio.TimeoutError):
+        return "timed out waiting for reply"
+    if isinstance(exc, ConnectionError):
+        return f"connection closed ({exc})"
+    return f"send failed ({type(exc).__name__}: {exc})"
+
+class Transaction:
+    """
+    Reply를 기다리는 Primary 메시지 하나. ``await transaction``으로 Reply SecsMessage를 받습니다.
+    """
+    __slots__ = ('s', 'f', 'system_bytes', 'started', 'future', '_timer')
+
+    def __init__(self, s: int, f: int, system_bytes: int, future: asyncio.Future):
+        self.s = s
+        self.f = f
+        self.system_bytes = system_bytes
+        self.started = time.monotonic()
+        self.future = future
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def __await__(self):
+        return self.future.__await__()
+
+    def __repr__(self) -> str:
+        state = 'done' if self.future.done() else 'pending'
+        return f"Transaction(S{self.s}F{self.f}, system_bytes={self.system_bytes}, {state})"
+
+def _consume_exception(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+class TransactionTable:
+    """
+    System Bytes -> Transaction 테이블. T3 타이머는 loop.call_later로 Transaction마다 예약합니다.
+
+    Attributes:
+        t3: Reply Timeout(초). None이면 타이머를 걸지 않습니다.
+        max_outstanding: 동시에 열 수 있는 최대 Transaction 수 (0이면 제한 없음).
+        on_timeout: T3 만료 시 호출할 콜백 (예: S9F9 전송). 인자는 만료된 Transaction입니다.
+    """
+
+    def __init__(self, t3: Optional[float] = DEFAULT_T3, max_outstanding: int = DEFAULT_MAX_OUTSTANDING,
+                 on_timeout: Optional[Callable[[Transaction], None]] = None):
+        self.t3 = t3
+        self.max_outstanding = max_outstanding
+        self.on_timeout = on_timeout
+        self._transactions: Dict[int, Transaction] = {}
+        self._loop = asyncio.get_running_loop()
+        self.opened = 0
+        self.completed = 0
+        self.timed_out = 0
+        self.failed = 0
+
+    def open(self, s: int, f: int, system_bytes: int) -> Transaction:
+        """Transaction을 열고 T3 타이머를 시작합니다. 같은 System Bytes가 열려 있으면 ValueError."""
+        if system_bytes in self._transactions:
+            raise ValueError(f"Transaction already open for system_bytes={system_bytes}")
+        if self.max_outstanding and len(self._transactions) >= self.max_outstanding:
+            raise TransactionLimitError(f"Too many outstanding transactions ({self.max_outstanding})")
+        transaction = Transaction(s, f, system_bytes, self._loop.create_future())
+        # 아무도 기다리지 않는 요청이 T3로 실패해도 "exception was never retrieved" 경고가 남지 않도록 합니다.
+        transaction.future.add_done_callback(_consume_exception)
+        if self.t3 is not None:
+            transaction._timer = self._loop.call_later(self.t3, self._expire, system_bytes)
+        self._transactions[system_bytes] = transaction
+        self.opened += 1
+        return transaction
+
+    def resolve(self, message: SecsMessage) -> bool:
+        """message가 열린 Transaction의 Reply이면 완료시키고 True를 반환합니다."""
+        transaction = self._transactions.pop(message.system_bytes, None)
+        if transaction is None:
+            return False
+        self._close(transaction)
+        if not transaction.future.done():
+            transaction.future.set_result(message)
+        self.completed += 1
+        return True
+
+    def discard(self, system_bytes: int, exc: Optional[BaseException] = None) -> None:
+        """Transaction을 제거합니다 (예: 전송 실패). exc가 있으면 기다리는 쪽에 전달합니다."""
+        transaction = self._transactions.pop(system_bytes, None)
+        if transaction is None:
+            return
+        self._close(transaction)
+        if not transaction.future.done():
+            if exc is None:
+                transaction.future.cancel()
+            else:
+                transaction.future.set_exception(exc)
+        self.failed += 1
+
+    def fail_all(self, exc: BaseException) -> None:
+        """연결이 끊겼을 때 열린 Transaction을 모두 exc로 실패시킵니다."""
+        for system_bytes in list(self._transactions):
+            self.discard(system_bytes, exc)
+
+    def get(self, system_bytes: int) -> Optional[Transaction]:
+        return self._transactions.get(system_bytes)
+
+    def __contains__(self, system_bytes: int) -> bool:
+        return system_bytes in self._transactions
+
+    def __len__(self) -> int:
+        return len(self._transactions)
+
+    def stats(self) -> Dict[str, int]:
+        """모니터링/로그용 카운터 스냅샷."""
+        return {
+            'outstanding': len(self._transactions),
+            'opened': self.opened,
+            'completed': self.completed,
+            'timed_out': self.timed_out,
+            'failed': self.failed,
+        }
+
+    def _expire(self, system_bytes: int) -> None:
+        transaction = self._transactions.pop(system_bytes, None)
+        if transaction is None:
+            return
+        transaction._timer = None
+        self.timed_out += 1
+        if not transaction.future.done():
+            transaction.future.set_exception(TransactionTimeout(
+                f"T3 timeout waiting for reply to S{transaction.s}F{transaction.f} (SB={system_bytes})"))
+        if self.on_timeout is not None:
+            self.on_timeout(transaction)
+
+    @staticmethod
+    def _close(transaction: Transaction) -> None:
+        if transaction._timer is not None:
+            transaction._timer.cancel()
+            transaction._timer = None
@@ -0,0 +1,164 @@
+"""
+Declarative auto-reply rules per device type.
+
+W-bit Primary 메시지를 받으면 장비 타입별 규칙 표에서 (S, F)로 규칙을 찾아, 메시지 라이브러리
+(resources/messages/<type>.json)에 정의된 Secondary 메시지로 응답합니다. 규칙 파일은
+resources/reply_rules/<type>.json에 둡니다.
+
+    [
+        {"s": 1, "f": 1, "reply": "S1F2_OnLineData"},
+        {"s": 1, "f": 3, "reply": "S1F4_SelectedStatusData",
+         "items": {"from": "0", "values": {"1": {"type": "U1", "value": [5]}}, "default": {"type": "L", "value": []}}},
+        {"s": 6, "f": 11, "when": {"0/1": 251}, "reply": "S6F12_EventReportAck"},
+        {"s": 6, "f": 11, "reply": {"s": 6, "f": 12, "body": [{"type": "B", "value": [0]}]}}
+    ]
+
+"reply"는 라이브러리 메시지 ID 또는 메시지 dict이며, "when"은 secs_path 경로 -> 기대값으로 된 Body
+조건입니다. 같은 (S, F)의 규칙은 파일에 적힌 순서대로 검사하므로 조건 없는 규칙을 마지막에 둡니다.
+응답 Body는 규칙을 불러올 때 한 번만 인코딩해 두고, 응답할 때는 그 바이트를 그대로 보냅니다.
+
+S1F3(SVID 목록)/S2F13(ECID 목록)처럼 요청한 ID 개수만큼 값을 돌려줘야 하는 메시지는 "items"로
+응답 Body를 요청에 맞춰 만듭니다. 요청 Body의 "from" 경로에 있는 리스트의 ID마다 "values"의 아이템을
+(없으면 "default" 아이템을) 담은 L을 응답합니다. 요청 리스트가 비어 있으면 "values" 전체를 응답합니다.
+아이템도 미리 인코딩해 두므로 응답할 때는 L 헤더와 아이템 바이트를 이어 붙이기만 합니다.
+"""
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from secs_simulator.core.models import SecsMessage
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.core.secs_path import compile_path
+from secs_simulator.core.secs_template import compile_template
+
+DEFAULT_RULES_DIR = './resources/reply_rules'
+DEFAULT_LIBRARY_DIR = './resources/messages'
+
+def _list_header(count: int) -> bytes:
+    """자식 count개인 'L' 아이템의 헤더 (포맷 바이트 + 1~3바이트 길이)."""
+    num_length_bytes = 1 if count <= 0xFF else 2 if count <= 0xFFFF else 3
+    return bytes([num_length_bytes]) + count.to_bytes(num_length_bytes, 'big')
+
+def _id_key(value: Any) -> str:
+    """요청 아이템 값(U4 [1], A "SVID" 등)을 "values" 표의 키 문자열로 바꿉니다."""
+    if isinstance(value, (str, int, float)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return str(value[0]) if len(value) == 1 else value.hex().upper()
+    if len(value) == 1:
+        return str(value[0])
+    return ','.join(str(element) for element in value)
+
+class ListReply:
+    """요청 리스트의 ID마다 값 아이템을 담은 'L' 응답 Body를 만듭니다 (아이템은 미리 인코딩)."""
+    __slots__ = ('source', 'values', 'default', '_all')
+
+    def __init__(self, source: Callable[[list], Any], values: Dict[str, bytes], default: bytes):
+        self.source = source
+        self.values = values
+        self.default = default
+        self._all = _list_header(len(values)) + b''.join(values.values())
+
+    def render(self, message: SecsMessage) -> bytes:
+        requested = self.source(message.body)
+        if not requested or not isinstance(requested, list):
+            return self._all
+        values, default = self.values, self.default
+        return _list_header(len(requested)) + b''.join(
+            values.get(_id_key(item.value), default) for item in requested)
+
+class ReplyRule:
+    """Primary (S, F) + Body 조건 -> 미리 인코딩된 Secondary 메시지."""
+    __slots__ = ('s', 'f', 'conditions', 'reply_s', 'reply_f', 'body', 'message_id', 'items')
+
+    def __init__(self, s: int, f: int, reply_s: int, reply_f: int, body: bytes,
+                 conditions: Optional[List[Tuple[Callable[[list], Any], Any]]] = None,
+                 message_id: str = '', items: Optional[ListReply] = None):
+        self.s = s
+        self.f = f
+        self.reply_s = reply_s
+        self.reply_f = reply_f
+        self.body = body
+        self.conditions = conditions or []
+        self.message_id = message_id
+        self.items = items
+
+    def matches(self, message: SecsMessage) -> bool:
+        return all(accessor(message.body) == expected for accessor, expected in self.conditions)
+
+    def render(self, message: SecsMessage) -> bytes:
+        """message에 대한 응답 Body 바이트. "items" 규칙이 아니면 미리 인코딩한 Body를 그대로 반환합니다."""
+        if self.items is None:
+            return self.body
+        return self.items.render(message)
+
+    def __repr__(self) -> str:
+        return f"ReplyRule(S{self.s}F{self.f} -> S{self.reply_s}F{self.reply_f} {self.message_id})"
+
+class AutoReplyTable:
+    """(S, F) -> ReplyRule 목록. lookup()은 dict 조회 한 번과 그 (S, F)의 조건 검사만 합니다."""
+
+    def __init__(self, rules: Optional[List[ReplyRule]] = None):
+        self._rules: Dict[Tuple[int, int], List[ReplyRule]] = {}
+        for rule in rules or ():
+            self.add(rule)
+
+    def add(self, rule: ReplyRule) -> None:
+        self._rules.setdefault((rule.s, rule.f), []).append(rule)
+
+    def lookup(self, message: SecsMessage) -> Optional[ReplyRule]:
+        """message에 맞는 첫 규칙을 반환합니다 (없으면 None)."""
+        for rule in self._rules.get((message.s, message.f), ()):
+            if not rule.conditions or rule.matches(message):
+                return rule
+        return None
+
+    def __len__(self) -> int:
+        return sum(len(rules) for rules in self._rules.values())
+
+    @classmethod
+    def from_rules(cls, rules: List[Dict[str, Any]], library: Dict[str, Any]) -> 'AutoReplyTable':
+        """
+        규칙 dict 목록과 메시지 라이브러리로 표를 만듭니다.
+        라이브러리에 없는 메시지 ID나 잘못된 경로는 ValueError로 알립니다.
+        """
+        table = cls()
+        for spec in rules:
+            reply = spec.get('reply')
+            if isinstance(reply, str):
+                message_id, message = reply, library.get(reply)
+                if message is None:
+                    raise ValueError(f"Reply message '{reply}' not found in message library")
+            elif isinstance(reply, dict):
+                message_id, message = '', reply
+            else:
+                raise ValueError(f"Invalid reply in rule for S{spec.get('s')}F{spec.get('f')}: {reply!r}")
+
+            conditions = [(compile_path(path), expected) for path, expected in (spec.get('when') or {}).items()]
+            s, f = spec['s'], spec['f']
+            body = bytes(compile_template(message).render())
+            items = None
+            if (items_spec := spec.get('items')) is not None:
+                items = ListReply(
+                    compile_path(items_spec.get('from', '0')),
+                    {str(key): build_secs_body([item]) for key, item in (items_spec.get('values') or {}).items()},
+                    build_secs_body([items_spec.get('default', {'type': 'L', 'value': []})]))
+            table.add(ReplyRule(s, f, message.get('s', s), message.get('f', f + 1), body,
+                                conditions, message_id, items))
+        return table
+
+    @classmethod
+    def load(cls, device_type: str, rules_dir: str = DEFAULT_RULES_DIR,
+             library_dir: str = DEFAULT_LIBRARY_DIR) -> Optional['AutoReplyTable']:
+        """장비 타입의 규칙 파일과 메시지 라이브러리를 읽어 표를 만듭니다. 규칙 파일이 없으면 None."""
+        rules_path = Path(rules_dir) / f"{device_type}.json"
+        if not rules_path.exists():
+            return None
+        with rules_path.open('r', encoding='utf-8') as f:
+            rules = json.load(f)
+        library_path = Path(library_dir) / f"{device_type}.json"
+        library: Dict[str, Any] = {}
+        if library_path.exists():
+            with library_path.open('r', encoding='utf-8') as f:
+                library = json.load(f)
+        return cls.from_rules(rules, library)
@@ -1,10 +1,25 @@
 import asyncio
 import logging
-from typing import Callable, Awaitable, Optional
+import os
+from typing import TYPE_CHECKING, Callable, Awaitable, Optional
 from enum import Enum
 import time
 
 from secs_simulator.core.hsms import HsmsConnection, HsmsMessageType
+from secs_simulator.core.decode_pool import DecodePool, DEFAULT_OFFLOAD_THRESHOLD
+from secs_simulator.core.hsms_protocol import BufferedHsmsConnection, open_hsms_connection, start_hsms_server
+from secs_simulator.core.models import SecsMessage
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.engine.auto_reply import AutoReplyTable
+from secs_simulator.engine.message_waiters import MessageWaiters, MessagePredicate, OverflowPolicy, DEFAULT_HISTORY_SIZE
+from secs_simulator.engine.pipeline import LatencyStats, PipelineStats
+from secs_simulator.engine.status_events import StatusCode, StatusEvents, DEFAULT_FLUSH_INTERVAL
+from secs_simulator.engine.timer_wheel import TimerWheel, WheelTimer
+from secs_simulator.core.transactions import (Transaction, TransactionLimitError, TransactionTimeout,
+                                              DEFAULT_MAX_OUTSTANDING, describe_failure)
+
+if TYPE_CHECKING:
+    from secs_simulator.engine.virtual_device import VirtualDevice
 
 class ConnectionState(Enum):
     DISCONNECTED = "DISCONNECTED"
@@ -22,18 +37,61 @@ class DeviceAgent:
     def __init__(self, device_id: str, host: str, port: int, 
                  status_callback: Callable[[str, str, str], Awaitable], 
                  connection_mode: str = "Passive",
-                 t3: int = 10, t5: int = 10, t6: int = 5, t7: int = 10): # 타임아웃 파라미터 추가
+                 t3: int = 10, t5: int = 10, t6: int = 5, t7: int = 10, # 타임아웃 파라미터 추가
+                 lazy_decode: Optional[bool] = None, parse_cache_size: int = 0,
+                 transport: str = "stream",
+                 max_outstanding_transactions: int = DEFAULT_MAX_OUTSTANDING,
+                 send_s9f9_on_t3: bool = False,
+                 t8: float = 5, timer_wheel: Optional[TimerWheel] = None,
+                 pipeline_window: int = 16, session_id: int = 0,
+                 decode_pool: Optional[DecodePool] = None,
+                 offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+                 message_history_size: int = DEFAULT_HISTORY_SIZE,
+                 message_overflow_policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+                 message_history_max_bytes: Optional[int] = None,
+                 message_journal_dir: Optional[str] = None,
+                 auto_replies: Optional[AutoReplyTable] = None,
+                 status_flush_interval: float = DEFAULT_FLUSH_INTERVAL):
         self.device_id = device_id
         self.host = host
         self.port = port
         self.status_callback = status_callback
         self.connection_mode = connection_mode
+        # 반복 수신되는 동일 Body의 디코딩 결과를 재사용할 LRU 크기 (0이면 사용 안 함)
+        self.parse_cache_size = parse_cache_size
+        # 수신 전송 계층: "stream"(StreamReader) 또는 "buffered"(BufferedProtocol, 수신 버퍼 재사용)
+        if transport not in ("stream", "buffered"):
+            raise ValueError(f"Invalid transport: {transport}")
+        self.transport = transport
+        # True이면 수신 Body의 리스트 자식을 필요할 때만 디코딩합니다 (응답 매칭만 하는 메시지는 디코딩 비용 없음).
+        # None이면 전송 계층에 따라 정합니다. "stream"은 readexactly가 이미 Body를 복사하므로 지연 디코딩을 켜고,
+        # "buffered"는 수신 버퍼에서 복사 없이 바로 디코딩하도록 끕니다.
+        self.lazy_decode = (transport == "stream") if lazy_decode is None else lazy_decode
+        # offload_threshold 이상의 수신 Body는 decode_pool(Orchestrator 공유)의 워커에서 디코딩합니다.
+        self.decode_pool = decode_pool
+        self.offload_threshold = offload_threshold
 
         # HSMS 타임아웃 설정
         self.t3_timeout = t3
         self.t5_timeout = t5
         self.t6_timeout = t6
         self.t7_timeout = t7
+        self.t8_timeout = t8
+        # HSMS 타이머는 Orchestrator가 공유하는 타이머 휠에 예약합니다 (단독 사용 시 자체 휠 생성).
+        self.timer_wheel = timer_wheel or TimerWheel()
+        # 송수신 상태는 장비별 최신값만 남겨 두었다가 status_flush_interval마다 한 번 알립니다.
+        self._status_events = StatusEvents(self._publish_status, self.timer_wheel, status_flush_interval)
+        self._timers: list[WheelTimer] = []  # 현재 연결에 걸려 있는 타이머
+        # 동시에 Reply를 기다릴 수 있는 요청 수와, T3 만료 시 S9F9 전송 여부
+        self.max_outstanding_transactions = max_outstanding_transactions
+        self.send_s9f9_on_t3 = send_s9f9_on_t3
+        # send_pipelined()에서 동시에 Reply를 기다릴 기본 요청 수 (윈도우 크기)
+        self.pipeline_window = pipeline_window
+        # 이 에이전트 자신의 Session ID(Device ID)와, 같은 연결을 공유하는 가상 장비들 (Session ID -> VirtualDevice)
+        self.session_id = session_id
+        # W-bit Primary에 보낼 Secondary를 고르는 장비 타입별 규칙 표 (None이거나 규칙이 없으면 F+1 ACK)
+        self.auto_replies = auto_replies
+        self.virtual_devices: dict[int, 'VirtualDevice'] = {}
         
         # 연결 관리
         self._server: Optional[asyncio.AbstractServer] = None
@@ -44,13 +102,25 @@ class DeviceAgent:
         # 태스크 관리
         self._main_task: Optional[asyncio.Task] = None
         self._command_processor_task: Optional[asyncio.Task] = None
-        self._heartbeat_task: Optional[asyncio.Task] = None
-        self._t5_timer_task: Optional[asyncio.Task] = None # T5 타이머 태스크 추가
         
         # 메시지 관리
+        # 연결이 준비되어 있고 앞서 큐에 들어간 명령이 없으면 명령 큐를 거치지 않고 바로 전송합니다.
+        # 큐는 연결 준비 전/앞선 명령이 처리 중일 때 전송 순서를 지키기 위해서만 사용합니다.
         self._command_queue = asyncio.Queue()
-        self._incoming_message_queue = asyncio.Queue()
-        self._pending_replies = {}  # system_bytes -> Future
+        self._queued_commands = 0  # 큐에 넣었지만 아직 처리가 끝나지 않은 명령 수
+        self.direct_sends = 0
+        self.queued_sends = 0
+        # send_message/send_request 호출부터 프레임이 송신 큐(OutboundQueue)에 들어갈 때까지의 지연 시간
+        self.send_latency = LatencyStats()
+        # 수신 메시지를 기다리는 wait_for_message 대기자와, 대기자가 없던 메시지의 히스토리
+        # (개수/인코딩 크기 한도와 넘칠 때의 정책은 같은 연결의 가상 장비에도 그대로 적용됩니다.
+        #  message_history_max_bytes는 Body의 SECS-II 인코딩 크기 합계이며 디코딩된 트리의 메모리 사용량이 아닙니다)
+        self.message_history_size = message_history_size
+        self.message_overflow_policy = OverflowPolicy(message_overflow_policy)
+        self.message_history_max_bytes = message_history_max_bytes
+        self.message_journal_dir = message_journal_dir
+        self._waiters = self.create_message_waiters(device_id)
+        self._pending_replies: dict[int, Transaction] = {}  # system_bytes -> 아직 Reply를 기다리는 Transaction
         self._system_bytes_counter = 0
         
         # 동기화
@@ -64,6 +134,29 @@ class DeviceAgent:
         
         self.logger = logging.getLogger(f"DeviceAgent-{device_id}")
 
+    def attach_virtual_device(self, device: 'VirtualDevice') -> None:
+        """가상 장비의 Session을 등록합니다. 이후 그 Session ID로 수신된 메시지는 해당 장비로 라우팅됩니다."""
+        current = self.virtual_devices.get(device.session_id)
+        if current is device:
+            return
+        if device.session_id == self.session_id or current is not None:
+            raise ValueError(f"Session {device.session_id} is already used on {self.device_id}")
+        self.virtual_devices[device.session_id] = device
+
+    def detach_virtual_device(self, device: 'VirtualDevice') -> None:
+        if self.virtual_devices.get(device.session_id) is device:
+            del self.virtual_devices[device.session_id]
+
+    def _accepts_session(self, session_id: int) -> bool:
+        """수신 메시지의 Session ID를 처리할 수 있는지 확인합니다 (가상 장비가 없으면 단일 Session으로 모두 수용)."""
+        return not self.virtual_devices or session_id == self.session_id or session_id in self.virtual_devices
+
+    def _session_target(self, session_id: Optional[int]):
+        """Session ID에 해당하는 가상 장비를 반환합니다 (자기 자신의 Session이면 self)."""
+        if session_id is None or session_id == self.session_id:
+            return self
+        return self.virtual_devices.get(session_id, self)
+
     def _get_next_system_bytes(self) -> int:
         self._system_bytes_counter = (self._system_bytes_counter + 1) & 0xFFFFFFFF
         return self._system_bytes_counter
@@ -91,7 +184,8 @@ class DeviceAgent:
         """서버(Passive) 모드 실행"""
         try:
             # 올바른 서버 시작 방식
-            self._server = await asyncio.start_server(
+            start_server = start_hsms_server if self.transport == "buffered" else asyncio.start_server
+            self._server = await start_server(
                 self._handle_client_connection, 
                 self.host, 
                 self.port
@@ -133,8 +227,9 @@ class DeviceAgent:
         while not self._shutdown_event.is_set():
             try:
                 await self._update_status(f"Connecting to {self.host}:{self.port}...", "yellow")
+                open_connection = open_hsms_connection if self.transport == "buffered" else asyncio.open_connection
                 reader, writer = await asyncio.wait_for(
-                    asyncio.open_connection(self.host, self.port),
+                    open_connection(self.host, self.port),
                     timeout=self.t7_timeout # connection_timeout을 t7_timeout으로 변경
                 )
                 
@@ -169,18 +264,25 @@ class DeviceAgent:
             self._connection_state = ConnectionState.CONNECTED
             self._connection_ready.clear()
             
-            self._connection = HsmsConnection(
+            connection_class = BufferedHsmsConnection if self.transport == "buffered" else HsmsConnection
+            self._connection = connection_class(
                 reader, writer,
                 message_callback=self._on_message_received,
-                state_change_callback=self._on_connection_state_change
+                state_change_callback=self._on_connection_state_change,
+                lazy_decode=self.lazy_decode,
+                parse_cache_size=self.parse_cache_size,
+                t3=self.t3_timeout,
+                max_outstanding_transactions=self.max_outstanding_transactions,
+                send_s9f9_on_t3=self.send_s9f9_on_t3,
+                timer_wheel=self.timer_wheel,
+                t8=self.t8_timeout,
+                session_filter=self._accepts_session,
+                decode_pool=self.decode_pool,
+                offload_threshold=self.offload_threshold
             )
             
-            # 하트비트 및 T5 타이머 시작
-            if self._heartbeat_task: self._heartbeat_task.cancel()
-            if self._t5_timer_task: self._t5_timer_task.cancel() # 기존 T5 타이머 정리
-            
-            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
-            self._t5_timer_task = asyncio.create_task(self._t5_timer_loop()) # T5 타이머 시작
+            # T5(유휴), T7(Select 대기), Linktest(T6) 타이머 시작
+            self._start_timers(self._connection)
             
             asyncio.create_task(self._connection.handle_connection())
             
@@ -188,22 +290,86 @@ class DeviceAgent:
             self.logger.error(f"Connection establishment failed: {e}")
             await self._cleanup_connection()
 
-    async def _t5_timer_loop(self):
-        """T5 유휴 연결 타이머 루프"""
+    def _start_timers(self, connection: HsmsConnection) -> None:
+        """새 연결의 HSMS 타이머를 공유 타이머 휠에 예약합니다 (이전 연결의 타이머는 취소)."""
+        self._cancel_timers()
+        wheel = self.timer_wheel
+        self._timers = [
+            wheel.schedule(self.t5_timeout, self._on_t5_check, connection),
+            wheel.schedule(self.t7_timeout, self._on_t7_timeout, connection),
+            wheel.schedule(self.t6_timeout / 2, self._send_linktest, connection),
+        ]
+
+    def _cancel_timers(self) -> None:
+        for timer in self._timers:
+            timer.cancel()
+        self._timers = []
+
+    def _schedule(self, delay: float, callback, *args) -> None:
+        self._timers = [timer for timer in self._timers if not timer.cancelled]
+        self._timers.append(self.timer_wheel.schedule(delay, callback, *args))
+
+    def _on_t5_check(self, connection: HsmsConnection):
+        """T5 유휴 타이머: 마지막 송수신 이후 T5가 지났으면 연결을 끊고, 아니면 남은 시간만큼 다시 예약합니다."""
+        if connection is not self._connection:
+            return None
+        idle_time = time.monotonic() - connection.last_message_time
+        if idle_time < self.t5_timeout:
+            self._schedule(self.t5_timeout - idle_time, self._on_t5_check, connection)
+            return None
+        self.logger.warning(f"T5 timeout ({self.t5_timeout}s) exceeded. Disconnecting.")
+        return self._disconnect_on_timeout(connection, "Idle Timeout (T5)")
+
+    def _on_t7_timeout(self, connection: HsmsConnection):
+        """T7: TCP 연결 후 T7 안에 Select되지 않으면 연결을 끊습니다."""
+        if connection is not self._connection or connection.is_selected:
+            return None
+        self.logger.warning(f"T7 timeout ({self.t7_timeout}s): not selected. Disconnecting.")
+        return self._disconnect_on_timeout(connection, "Not Selected Timeout (T7)")
+
+    async def _send_linktest(self, connection: HsmsConnection):
+        """주기적 Linktest (T6의 절반 주기). Linktest.rsp를 T6 안에 받지 못하면 연결을 끊습니다."""
+        if connection is not self._connection or self._shutdown_event.is_set():
+            return
+        interval = self.t6_timeout / 2
+        if not connection.is_selected:
+            self._schedule(interval, self._send_linktest, connection)
+            return
         try:
-            while not self._shutdown_event.is_set() and self._connection:
-                await asyncio.sleep(1) # 1초마다 확인
-                if self._connection:
-                    idle_time = time.monotonic() - self._connection.last_message_time
-                    if idle_time > self.t5_timeout:
-                        self.logger.warning(f"T5 timeout ({self.t5_timeout}s) exceeded. Disconnecting.")
-                        await self._update_status(f"Idle Timeout (T5)", "red")
-                        await self._cleanup_connection()
-                        break
-        except asyncio.CancelledError:
-            pass
+            future = await connection.send_hsms_message(
+                msg_type=HsmsMessageType.LINKTEST_REQ,
+                system_bytes=self._get_next_system_bytes()
+            )
         except Exception as e:
-            self.logger.error(f"Error in T5 timer loop: {e}")
+            self.logger.error(f"Heartbeat failed: {e}")
+            await self._disconnect_on_timeout(connection, f"Linktest failed: {e}")
+            return
+
+        t6_timer = self.timer_wheel.schedule(self.t6_timeout, self._on_t6_timeout, connection, future)
+        self._timers.append(t6_timer)
+
+        def on_linktest_rsp(done: asyncio.Future) -> None:
+            t6_timer.cancel()
+            if not done.cancelled() and done.exception() is None and connection is self._connection:
+                self.logger.debug("Heartbeat sent and reply received")
+                self._schedule(interval, self._send_linktest, connection)
+
+        future.add_done_callback(on_linktest_rsp)
+
+    def _on_t6_timeout(self, connection: HsmsConnection, future: asyncio.Future):
+        """T6: Linktest.rsp가 오지 않았으면 연결을 끊습니다."""
+        if future.done() or connection is not self._connection:
+            return None
+        self.logger.error("Linktest (T6) timeout. Disconnecting.")
+        return self._disconnect_on_timeout(connection, "Linktest Timeout (T6)")
+
+    async def _disconnect_on_timeout(self, connection: HsmsConnection, status: str):
+        # 같은 틱에 여러 타이머가 만료돼도 한 번만 끊도록, 먼저 동기적으로 writer를 닫습니다.
+        if connection is not self._connection or connection.writer.is_closing():
+            return
+        connection.writer.close()
+        await self._update_status(status, "red")
+        await self._cleanup_connection()
 
     async def _initiate_hsms_handshake(self):
         """HSMS 핸드셰이크 시작 (Active 모드)"""
@@ -221,81 +387,70 @@ class DeviceAgent:
                 await self._update_status(f"Handshake failed: {e}", "red")
                 await self._cleanup_connection()
 
-    async def _heartbeat_loop(self):
-        """주기적 연결 상태 확인 (T6 기반)"""
-        try:
-            # T6 타임아웃의 절반 주기로 Linktest 전송
-            linktest_interval = self.t6_timeout / 2
-            while not self._shutdown_event.is_set() and self._connection:
-                await asyncio.sleep(linktest_interval)
-                
-                if self._connection and self._connection.is_selected:
-                    try:
-                        system_bytes = self._get_next_system_bytes()
-                        # Linktest 응답을 T6 시간 내에 기다림
-                        future = self._connection.send_hsms_message(
-                            msg_type=HsmsMessageType.LINKTEST_REQ,
-                            system_bytes=system_bytes
-                        )
-                        await asyncio.wait_for(future, timeout=self.t6_timeout)
-                        self.logger.debug("Heartbeat sent and reply received")
-                    except asyncio.TimeoutError:
-                        self.logger.error("Linktest (T6) timeout. Disconnecting.")
-                        await self._update_status("Linktest Timeout (T6)", "red")
-                        await self._cleanup_connection()
-                        break
-                    except Exception as e:
-                        self.logger.error(f"Heartbeat failed: {e}")
-                        await self._cleanup_connection()
-                        break
-        except asyncio.CancelledError:
-            pass
-
     async def _on_connection_state_change(self, state: str):
         """연결 상태 변경 콜백"""
         if state == "SELECTED":
             self._connection_state = ConnectionState.SELECTED
             await self._update_status("HSMS Selected (Ready)", "green")
             self._connection_ready.set()
+            for session_id in list(self.virtual_devices):
+                await self._update_status(f"HSMS Selected (Ready) via {self.device_id}", "green", session_id=session_id)
         elif state == "DISCONNECTED":
             self._connection_state = ConnectionState.DISCONNECTED
             self._connection_ready.clear()
             await self._cleanup_connection()
-
-    async def _on_message_received(self, message: dict):
+            for session_id in list(self.virtual_devices):
+                await self._update_status(f"Disconnected ({self.device_id})", "red", session_id=session_id)
+
+    def create_message_waiters(self, device_id: str) -> MessageWaiters:
+        """이 에이전트의 히스토리 설정으로 MessageWaiters를 만듭니다 (저널은 <message_journal_dir>/<device_id>.jsonl)."""
+        journal_path = None
+        if self.message_journal_dir:
+            journal_path = os.path.join(self.message_journal_dir, f"{device_id}.jsonl")
+        return MessageWaiters(self.message_history_size, self.message_overflow_policy,
+                              self.message_history_max_bytes, journal_path)
+
+    async def _on_message_received(self, message: SecsMessage):
         """[수정됨] 메시지 수신 콜백 (로깅 및 처리 흐름 개선)"""
-        system_bytes = message.get('system_bytes')
-        s, f = message.get('s', '?'), message.get('f', '?')
-        w_bit = message.get('w_bit', False)
-        
-        # ✅ 1. 모든 수신 메시지를 먼저 로그로 남깁니다.
-        await self._update_status(f"Received S{s}F{f}", "green")
-
-        # ✅ 2. 이 메시지가 내가 보낸 요청에 대한 '응답'인지 확인합니다.
-        if system_bytes in self._pending_replies:
-            future = self._pending_replies.pop(system_bytes)
-            if not future.cancelled():
-                future.set_result(message)
-            # 응답 메시지는 여기서 처리가 완료되므로, 함수를 종료합니다.
-            return
+        system_bytes = message.system_bytes
+        s, f = message.s, message.f
+        w_bit = message.w_bit
+        # 등록되지 않은 Session은 HsmsConnection에서 S9F1로 거부되므로, 여기서는 자신 또는 가상 장비입니다.
+        target = self._session_target(message.session_id)
+        session_id = message.session_id if target is not self else self.session_id
         
+        # ✅ 1. 수신 상태는 문자열을 만들지 않고 슬롯에 기록합니다 (주기적으로 모아서 로그/UI로 알림).
+        self._post_status(StatusCode.RECEIVED, s, f, system_bytes, session_id)
+
+        # ✅ 2. 내가 보낸 요청에 대한 '응답'은 HsmsConnection의 Transaction 테이블에서 처리되어
+        # 여기로 오지 않습니다 (_on_transaction_done 참고).
+
         # ✅ 3. 응답이 아니라면, 나에게 응답을 요구하는 새로운 '요청'인지 확인합니다.
         if w_bit:
-            reply_s = s
-            reply_f = f + 1
-            reply_body = [{'type': 'B', 'value': 0}] # Acknowledge OK
+            # 규칙 표에 맞는 Secondary가 있으면 미리 인코딩된 Body로 응답합니다.
+            rule = target.auto_replies.lookup(message) if target.auto_replies is not None else None
+            if rule is not None:
+                reply_s, reply_f, reply_body = rule.reply_s, rule.reply_f, rule.render(message)
+            else:
+                reply_s = s
+                reply_f = f + 1
+                reply_body = [{'type': 'B', 'value': 0}] # Acknowledge OK
 
+            # Reply는 요청이 온 Session으로 돌려보냅니다. 이 콜백은 연결의 수신 루프에서 실행되므로
+            # 송신 버퍼가 가득 차도 drain을 기다리지 않습니다 (상대도 같은 상태면 양쪽 모두 읽기를 멈춰 교착).
             command = {
                 "action": "send",
                 "s": reply_s, "f": reply_f, "w_bit": False,
                 "body": reply_body,
-                "system_bytes": system_bytes
+                "system_bytes": system_bytes,
+                "session_id": message.session_id,
+                "wait_for_drain": False
             }
-            await self._command_queue.put(command)
+            await self._submit_command(command)
 
-        # ✅ 4. 시나리오의 'wait' 스텝 등에서 사용할 수 있도록, 수신된 요청을 큐에 넣습니다.
+        # ✅ 4. 시나리오의 'wait' 스텝 등에서 기다리는 대기자에게 바로 전달하고, 없으면 히스토리에 남깁니다.
         # (w_bit=False인 단방향 메시지도 여기에 포함됩니다)
-        await self._incoming_message_queue.put(message)
+        target._waiters.dispatch(message)
 
     async def stop(self) -> None:
         """에이전트 중지"""
@@ -305,17 +460,19 @@ class DeviceAgent:
         tasks_to_cancel = [
             self._main_task,
             self._command_processor_task,
-            self._heartbeat_task
         ]
         
         for task in tasks_to_cancel:
             if task and not task.done():
                 task.cancel()
+        self._drain_command_queue(ConnectionError("Agent stopped"))
+        await self._waiters.close()
         
         # 연결 정리
         await self._cleanup_connection()
         await self._cleanup_server()
         
+        await self._status_events.flush()
         await self._update_status("Stopped", "gray")
 
     async def _cleanup_connection(self):
@@ -323,6 +480,7 @@ class DeviceAgent:
         if self._connection:
             try:
                 if not self._connection.writer.is_closing():
+                    self._connection.outbound.flush()  # 큐에 남은 프레임을 먼저 내보냅니다.
                     self._connection.writer.close()
                     await self._connection.writer.wait_closed()
             except Exception as e:
@@ -331,9 +489,7 @@ class DeviceAgent:
                 self._connection = None
                 self._connection_ready.clear()
                 
-        if self._heartbeat_task:
-            self._heartbeat_task.cancel()
-            self._heartbeat_task = None
+        self._cancel_timers()
 
     async def _cleanup_server(self):
         """서버 정리"""
@@ -343,64 +499,196 @@ class DeviceAgent:
             self._server = None
 
     async def send_message(self, s: int, f: int, w_bit: bool = False, 
-                          body: Optional[list] = None) -> int:
+                          body: Optional[list | bytes] = None, session_id: Optional[int] = None) -> int:
         """
         [수정됨] 메시지를 즉시 전송하고, 응답을 기다리지 않고 system_bytes를 반환합니다.
+        body는 아이템 리스트 또는 이미 인코딩된 bytes(MessageTemplate.render 결과)입니다.
+        w_bit=True이면 send_request와 같이 Transaction을 엽니다 (Reply를 기다리려면 send_request 사용).
+        session_id를 주면 그 Session(가상 장비)으로 전송합니다 (기본값은 에이전트 자신의 Session).
         """
+        if w_bit:
+            transaction = await self.send_request(s, f, body, session_id=session_id)
+            return transaction.system_bytes if transaction else -1
+
+        started = time.perf_counter()
         if not await self._wait_for_ready(timeout=5.0):
             # 연결이 준비되지 않으면 -1과 같은 실패 값을 반환할 수 있습니다.
             return -1
             
         system_bytes = self._get_next_system_bytes()
-        
-        # w_bit가 True일 때만 응답을 기다리기 위한 Future를 생성합니다.
-        if w_bit:
-            self._pending_replies[system_bytes] = asyncio.Future()
-        
-        # 메시지 전송 명령을 큐에 넣습니다.
-        command = {
+        command = self._send_command(s, f, False, body, system_bytes, self._resolve_session(session_id))
+        command['started'] = started
+        await self._submit_command(command)
+        return system_bytes
+
+    async def send_request(self, s: int, f: int, body: Optional[list | bytes] = None,
+                           session_id: Optional[int] = None) -> Optional[Transaction]:
+        """
+        W-bit 요청을 전송 큐에 넣고, Reply SecsMessage로 완료되는 Transaction을 반환합니다.
+        Reply가 T3 안에 오지 않으면 TransactionTimeout, 연결이 끊기면 ConnectionError로 실패합니다.
+        연결이 준비되지 않았거나 열린 Transaction이 상한에 도달하면 None을 반환합니다.
+        """
+        session_id = self._resolve_session(session_id)
+        started = time.perf_counter()
+        if not await self._wait_for_ready(timeout=5.0, session_id=session_id) or not self._connection:
+            return None
+
+        system_bytes = self._get_next_system_bytes()
+        try:
+            # Reply가 전송 직후 바로 와도 놓치지 않도록, 큐에 넣기 전에 Transaction을 엽니다.
+            # System Bytes는 에이전트 전체에서 유일하므로 Session이 달라도 Transaction 테이블을 공유합니다.
+            transaction = self._connection.open_transaction(s, f, system_bytes)
+        except TransactionLimitError as e:
+            await self._update_status(f"Send S{s}F{f} rejected: {e}", "red", session_id=session_id)
+            return None
+
+        self._pending_replies[system_bytes] = transaction
+        transaction.future.add_done_callback(lambda _: self._on_transaction_done(transaction, session_id))
+        command = self._send_command(s, f, True, body, system_bytes, session_id)
+        command['started'] = started
+        await self._submit_command(command)
+        return transaction
+
+    async def send_pipelined(self, s: int, f: int, body: Optional[list | bytes] = None,
+                             count: int = 1, window: Optional[int] = None,
+                             session_id: Optional[int] = None) -> PipelineStats:
+        """
+        같은 W-bit 요청을 count번, Reply를 기다리는 요청이 최대 window개가 되도록 겹쳐서 전송합니다.
+        Reply는 System Bytes로 매칭되며, Transaction마다 지연 시간이 PipelineStats에 기록됩니다.
+
+        부하 시험용이므로 명령 큐를 거치지 않고 연결에 바로 전송하며, Body는 한 번만 인코딩합니다.
+        연결이 끊기거나 전송에 실패하면 남은 요청은 보내지 않고 그때까지의 결과를 반환합니다.
+        """
+        window = window or self.pipeline_window
+        if window <= 0:
+            raise ValueError("Pipeline window must be positive")
+        session_id = self._resolve_session(session_id)
+        if not await self._wait_for_ready(timeout=5.0, session_id=session_id) or not self._connection:
+            stats = PipelineStats(window)
+            stats.finish()
+            return stats
+
+        connection = self._connection
+        if connection.transactions.max_outstanding:
+            window = min(window, connection.transactions.max_outstanding)
+        encoded_body = body if isinstance(body, (bytes, bytearray)) else build_secs_body(body or [])
+        stats = PipelineStats(window)
+        slots = asyncio.Semaphore(window)
+
+        def on_done(transaction: Transaction, _: asyncio.Future) -> None:
+            stats.on_done(transaction)
+            slots.release()
+
+        await self._update_status(f"Pipelining S{s}F{f} x{count} (window={window})", "yellow", session_id=session_id)
+        for _ in range(count):
+            await slots.acquire()
+            if connection is not self._connection or not connection.is_selected:
+                slots.release()
+                break
+            try:
+                transaction = await connection.send_request(s, f, self._get_next_system_bytes(), encoded_body,
+                                                            session_id=session_id)
+            except Exception as e:
+                slots.release()
+                await self._update_status(f"Pipelined send failed: {e}", "red", session_id=session_id)
+                break
+            stats.on_sent()
+            transaction.future.add_done_callback(lambda future, t=transaction: on_done(t, future))
+
+        # 열린 Transaction이 모두 끝날 때까지 (Reply, T3 만료 또는 연결 종료) 기다립니다.
+        for _ in range(window):
+            await slots.acquire()
+        stats.finish()
+        await self._update_status(f"Pipeline finished: {stats!r}", "green" if stats.completed == stats.sent else "red",
+                                  session_id=session_id)
+        return stats
+
+    def _resolve_session(self, session_id: Optional[int]) -> int:
+        return self.session_id if session_id is None else session_id
+
+    @staticmethod
+    def _send_command(s: int, f: int, w_bit: bool, body: Optional[list | bytes], system_bytes: int,
+                      session_id: int = 0) -> dict:
+        return {
             "action": "send",
             "s": s, "f": f, "w_bit": w_bit,
             "body": body or [],
-            "system_bytes": system_bytes
+            "system_bytes": system_bytes,
+            "session_id": session_id
         }
-        await self._command_queue.put(command)
-        
-        # 응답을 기다리지 않고, 요청에 사용된 system_bytes를 즉시 반환합니다.
-        return system_bytes
 
-    async def _wait_for_ready(self, timeout: float = 5.0) -> bool:
+    def _on_transaction_done(self, transaction: Transaction, session_id: Optional[int] = None) -> None:
+        """Transaction 완료 콜백: 대기 목록에서 제거하고 결과를 상태로 알립니다."""
+        self._pending_replies.pop(transaction.system_bytes, None)
+        future = transaction.future
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is None:
+            reply = future.result()
+            self._post_status(StatusCode.REPLY_RECEIVED, reply.s, reply.f, transaction.system_bytes, session_id)
+            return
+        elif isinstance(exc, TransactionTimeout):
+            status, color = f"Reply Timeout (T3) for S{transaction.s}F{transaction.f} (SB={transaction.system_bytes})", "red"
+        else:
+            return  # 전송 실패/연결 종료는 이미 다른 경로에서 알립니다.
+        if not self._shutdown_event.is_set():
+            asyncio.ensure_future(self._update_status(status, color, session_id=session_id))
+
+    async def _wait_for_ready(self, timeout: float = 5.0, session_id: Optional[int] = None) -> bool:
         """연결 준비 상태 대기"""
+        if self._connection_ready.is_set():
+            return True  # 준비된 상태에서는 wait_for가 만드는 태스크 없이 바로 반환합니다.
         try:
             await asyncio.wait_for(self._connection_ready.wait(), timeout=timeout)
             return True
         except asyncio.TimeoutError:
-            await self._update_status("Connection not ready", "red")
+            await self._update_status("Connection not ready", "red", session_id=session_id)
             return False
 
+    async def _submit_command(self, command: dict) -> None:
+        """
+        명령을 전송합니다. 연결이 Select되어 있고 큐에 남은 명령이 없으면 호출한 태스크에서 바로
+        전송하고(fast path), 그렇지 않으면 앞선 명령 뒤에 순서대로 처리되도록 큐에 넣습니다.
+        """
+        if self._queued_commands == 0 and self._connection is not None and self._connection.is_selected:
+            self.direct_sends += 1
+            await self._process_command(command)
+            return
+        self._queued_commands += 1
+        self.queued_sends += 1
+        self._command_queue.put_nowait(command)
+
     async def _command_processor(self):
-        """명령 처리 루프"""
+        """명령 처리 루프. stop()에서 태스크를 취소하면 끝납니다 (종료 확인용 폴링 없음)."""
         try:
-            while not self._shutdown_event.is_set():
+            while True:
+                command = await self._command_queue.get()
                 try:
-                    command = await asyncio.wait_for(
-                        self._command_queue.get(),
-                        timeout=1.0
-                    )
                     await self._process_command(command)
+                finally:
+                    self._queued_commands -= 1
                     self._command_queue.task_done()
-                except asyncio.TimeoutError:
-                    continue  # 주기적으로 종료 신호 확인
         except asyncio.CancelledError:
             self.logger.info("Command processor cancelled")
 
+    def _drain_command_queue(self, exc: Exception) -> None:
+        """처리되지 못한 명령을 버리고, 그중 W-bit 요청의 Transaction은 exc로 실패시킵니다."""
+        while not self._command_queue.empty():
+            command = self._command_queue.get_nowait()
+            self._command_queue.task_done()
+            self._fail_pending_request(command, exc)
+        self._queued_commands = 0
+
     async def _process_command(self, command: dict):
         """개별 명령 처리"""
         if command['action'] != 'send':
             return
             
+        session_id = command.get('session_id', self.session_id)
         if not self._connection or not self._connection.is_selected:
-            await self._update_status("Cannot send: Not connected/selected", "red")
+            await self._update_status("Cannot send: Not connected/selected", "red", session_id=session_id)
+            self._fail_pending_request(command, ConnectionError("Not connected/selected"))
             return
             
         try:
@@ -409,56 +697,76 @@ class DeviceAgent:
                 f=command['f'],
                 w_bit=command['w_bit'],
                 system_bytes=command['system_bytes'],
-                body_obj=command['body']
-            )
-            await self._update_status(
-                f"Sent S{command['s']}F{command['f']} (SB={command['system_bytes']})", 
-                "green"
+                body_obj=command['body'],
+                session_id=session_id,
+                wait_for_drain=command.get('wait_for_drain', True)
             )
+            if 'started' in command:
+                self.send_latency.record(time.perf_counter() - command['started'])
+            self._post_status(StatusCode.SENT, command['s'], command['f'], command['system_bytes'], session_id)
         except Exception as e:
-            await self._update_status(f"Send failed: {e}", "red")
+            await self._update_status(f"Send failed: {e}", "red", session_id=session_id)
+            self._fail_pending_request(command, e)
+
+    def _fail_pending_request(self, command: dict, exc: Exception) -> None:
+        """전송하지 못한 W-bit 요청의 Transaction을 실패시킵니다."""
+        transaction = self._pending_replies.get(command['system_bytes'])
+        if command['w_bit'] and transaction is not None and not transaction.done():
+            if self._connection:
+                self._connection.transactions.discard(command['system_bytes'], exc)
+            else:
+                transaction.future.set_exception(exc)
 
     async def wait_for_message(self, s: int, f: int, timeout: float = 10.0, 
-                               reply_to_system_bytes: Optional[int] = None) -> Optional[dict]:
+                               reply_to_system_bytes: Optional[int] = None,
+                               session_id: Optional[int] = None,
+                               predicate: Optional[MessagePredicate] = None) -> Optional[SecsMessage]:
         """
         [수정됨] 특정 메시지 또는 특정 요청에 대한 응답을 기다립니다.
+        session_id를 주면 그 Session(가상 장비)으로 수신된 메시지만 기다립니다.
+        predicate를 주면 S/F가 같고 predicate(message)가 참인 메시지만 받습니다 (예: 특정 CEID의 S6F11).
+        이미 도착해 히스토리에 남아 있는 메시지도 대상이며, 가장 먼저 도착한 메시지를 반환합니다.
         """
         # --- 특정 요청(system_bytes)에 대한 응답을 기다리는 경우 ---
         if reply_to_system_bytes is not None:
-            await self._update_status(f"Waiting for reply to SB={reply_to_system_bytes}", "yellow")
-            future = self._pending_replies.get(reply_to_system_bytes)
-            if not future:
-                await self._update_status(f"Error: No pending reply found for SB={reply_to_system_bytes}", "red")
+            await self._update_status(f"Waiting for reply to SB={reply_to_system_bytes}", "yellow", session_id=session_id)
+            transaction = self._pending_replies.get(reply_to_system_bytes)
+            if not transaction:
+                await self._update_status(f"Error: No pending reply found for SB={reply_to_system_bytes}", "red",
+                                          session_id=session_id)
                 return None
             
             try:
-                # 해당 future가 완료될 때까지 기다립니다.
-                response = await asyncio.wait_for(future, timeout=timeout)
-                # 완료 후에는 딕셔너리에서 제거합니다.
-                self._pending_replies.pop(reply_to_system_bytes, None)
-                return response
-            except asyncio.TimeoutError:
-                self._pending_replies.pop(reply_to_system_bytes, None)
-                await self._update_status(f"Timeout waiting for reply to SB={reply_to_system_bytes}", "red")
+                # Transaction이 완료될 때까지 기다립니다 (T3 만료/연결 종료/전송 실패 시 예외).
+                return await asyncio.wait_for(asyncio.shield(transaction.future), timeout=timeout)
+            except Exception as e:
+                await self._update_status(f"No reply to SB={reply_to_system_bytes}: {describe_failure(e)}", "red",
+                                          session_id=session_id)
                 return None
 
         # --- 일반 메시지(S/F)를 기다리는 경우 (기존 로직) ---
-        await self._update_status(f"Waiting for S{s}F{f}", "yellow")
+        await self._update_status(f"Waiting for S{s}F{f}", "yellow", session_id=session_id)
         try:
-            async with asyncio.timeout(timeout):
-                while True:
-                    msg = await self._incoming_message_queue.get()
-                    if msg.get('s') == s and msg.get('f') == f:
-                        return msg
-                    else:
-                        await self._incoming_message_queue.put(msg)
-                        await asyncio.sleep(0.01)
+            return await self._session_target(session_id)._waiters.wait(s, f, predicate, timeout)
         except asyncio.TimeoutError:
-            await self._update_status(f"Timeout waiting for S{s}F{f}", "red")
+            await self._update_status(f"Timeout waiting for S{s}F{f}", "red", session_id=session_id)
             return None
 
-    async def _update_status(self, status: str, color: str = "default"):
-        """상태 업데이트"""
+    def _post_status(self, code: StatusCode, s: int, f: int, system_bytes: int,
+                     session_id: Optional[int] = None) -> None:
+        """송수신 같은 고빈도 상태를 장비의 최신값 슬롯에 기록합니다 (다음 flush 때 한 번에 알림)."""
+        if self._shutdown_event.is_set():
+            return  # 중지 중에는 "Stopped" 뒤에 송수신 상태가 보이지 않게 합니다.
+        self._status_events.post(self._session_target(session_id).device_id, code, s, f, system_bytes)
+
+    async def _update_status(self, status: str, color: str = "default", session_id: Optional[int] = None):
+        """상태 업데이트 (바로 알림). 슬롯에 쌓여 있던 송수신 상태를 먼저 내보내 순서를 유지합니다."""
+        device_id = self._session_target(session_id).device_id
+        await self._status_events.flush_device(device_id)
+        await self._publish_status(device_id, status, color)
+
+    async def _publish_status(self, device_id: str, status: str, color: str = "default"):
+        """상태를 로그로 남기고 status_callback으로 알립니다."""
         # 1. 색상에 기반하여 로그 레벨을 결정합니다.
         log_level = logging.INFO
         if color == "red":
@@ -466,8 +774,8 @@ class DeviceAgent:
         elif color in ["yellow", "orange"]:
             log_level = logging.WARNING
         
-        # 2. 결정된 레벨로 로그를 기록합니다.
-        self.logger.log(log_level, status)
+        # 2. 결정된 레벨로 로그를 기록합니다. 가상 장비의 Session이면 그 장비 ID로 알립니다.
+        self.logger.log(log_level, status if device_id == self.device_id else f"[{device_id}] {status}")
         
         final_color = color
         if color == "default":
@@ -482,10 +790,23 @@ class DeviceAgent:
                 final_color = "red"
         
         try:
-            await self.status_callback(self.device_id, status, final_color)
+            await self.status_callback(device_id, status, final_color)
         except Exception as e:
             self.logger.error(f"Status callback failed: {e}")
 
+    def status_stats(self) -> dict:
+        """상태 이벤트 통계: 슬롯에 기록/병합(coalesced)된 건수, flush 횟수, 이 에이전트의 이벤트별 누적 건수."""
+        return {**self._status_events.stats(), **self._status_events.counts(self.device_id)}
+
+    def send_stats(self) -> dict:
+        """송신 경로 통계: 바로 전송/큐 경유 건수, 큐에 남은 명령 수, 송신 지연 요약(ms)."""
+        return {
+            'direct_sends': self.direct_sends,
+            'queued_sends': self.queued_sends,
+            'queued_commands': self._queued_commands,
+            **{f'latency_{key}': value for key, value in self.send_latency.summary().items()},
+        }
+
     @property
     def is_connected(self) -> bool:
         """연결 상태 확인"""
@@ -0,0 +1,248 @@
+"""
+Waiter registry for incoming SECS messages.
+
+시나리오의 wait 스텝 등이 특정 S/F 메시지를 기다릴 때, 수신 큐를 꺼냈다 다시 넣으며 폴링하지 않고
+(S, F)별로 등록된 대기자(Future)에게 수신 메시지를 바로 전달합니다. 기다리는 대기자가 없는
+메시지는 크기가 제한된 히스토리에 남겨 두어, 나중에 시작한 wait도 이미 도착한 메시지를 받을 수 있습니다.
+
+    waiters = MessageWaiters()
+    waiters.dispatch(message)                       # 수신 콜백에서 (동기, O(1) 조회)
+    message = await waiters.wait(6, 11, predicate=lambda m: m.body[0].value[1].value == [5], timeout=10)
+
+히스토리는 개수(history_size)와, 선택적으로 Body의 SECS-II 인코딩 크기 합계(max_bytes)로 제한됩니다.
+max_bytes는 전송 크기 기준이며, 디코딩된 Python 객체 트리는 실제로 그 수십 배의 메모리를 쓰므로
+메모리 상한을 정할 때는 그만큼 작게 잡아야 합니다. 한도를 넘으면 overflow_policy에 따라 가장 오래된
+메시지를 버리거나(drop-oldest), 새 메시지를 버리거나(drop-newest), 가장 오래된 메시지를 저널 파일
+(JSON Lines)로 옮깁니다(spill-to-journal). 저널로 옮긴 메시지는 wait로 받을 수 없지만 장시간 무인
+실행 뒤에도 확인할 수 있습니다. 저널 파일 쓰기는 수신 경로를 막지 않도록 모아서 워커 스레드에서 합니다.
+"""
+import asyncio
+import functools
+import json
+import logging
+import time
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from secs_simulator.core.models import SecsMessage
+from secs_simulator.core.secs_builder import encoded_size
+from secs_simulator.core.secs_json import dumps_body
+
+# 대기자가 없던 수신 메시지를 보관할 최대 개수
+DEFAULT_HISTORY_SIZE = 256
+
+MessagePredicate = Callable[[SecsMessage], bool]
+
+class OverflowPolicy(Enum):
+    """히스토리가 가득 찼을 때의 처리 방식"""
+    DROP_OLDEST = "drop-oldest"
+    DROP_NEWEST = "drop-newest"
+    SPILL_TO_JOURNAL = "spill-to-journal"
+
+def _append_lines(path: str, lines: List[str]) -> None:
+    """워커 스레드에서 실행됩니다. 저널 파일 끝에 lines를 한 번에 씁니다."""
+    journal = Path(path)
+    journal.parent.mkdir(parents=True, exist_ok=True)
+    with journal.open('a', encoding='utf-8') as f:
+        f.writelines(lines)
+
+class _Waiter:
+    __slots__ = ('predicate', 'future')
+
+    def __init__(self, predicate: Optional[MessagePredicate], future: asyncio.Future):
+        self.predicate = predicate
+        self.future = future
+
+    def matches(self, message: SecsMessage) -> bool:
+        return self.predicate is None or bool(self.predicate(message))
+
+class MessageWaiters:
+    """
+    (S, F) -> 대기자 목록 레지스트리와 미매칭 메시지 히스토리.
+
+    같은 메시지를 기다리는 대기자가 여럿이면 먼저 등록한 대기자부터 받으며, 메시지 하나는 대기자
+    하나에게만 전달됩니다. 히스토리가 가득 차면 overflow_policy에 따라 메시지를 버리거나 (dropped에
+    집계) 저널로 옮깁니다 (spilled에 집계). max_bytes를 주면 메시지마다 Body의 인코딩 크기를 계산해
+    히스토리 전체 크기도 제한합니다 (주지 않으면 크기를 계산하지 않습니다). 저널에 쓰지 못한 메시지는
+    journal_errors에 집계하고 로그로 남길 뿐, dispatch()로 예외를 전달하지 않습니다.
+    """
+
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE,
+                 overflow_policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+                 max_bytes: Optional[int] = None, journal_path: Optional[str] = None):
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        if self.overflow_policy is OverflowPolicy.SPILL_TO_JOURNAL and not journal_path:
+            raise ValueError("spill-to-journal policy requires a journal path")
+        self._waiters: Dict[Tuple[int, int], Deque[_Waiter]] = {}
+        self.history_limit = history_size
+        self.max_bytes = max_bytes
+        self.journal_path = journal_path
+        # 아직 파일에 쓰지 않은 저널 줄과, 진행 중인 쓰기 (한 번에 하나씩 순서대로 씁니다)
+        self._journal_pending: List[str] = []
+        self._journal_write: Optional[asyncio.Future] = None
+        self.journal_errors = 0
+        self.logger = logging.getLogger("MessageWaiters")
+        # (메시지, 크기) - 크기는 max_bytes가 있을 때만 계산합니다.
+        self._history: Deque[Tuple[SecsMessage, int]] = deque()
+        self.history_bytes = 0
+        self.dispatched = 0
+        self.dropped = 0
+        self.dropped_bytes = 0
+        self.spilled = 0
+        self.spilled_bytes = 0
+
+    def dispatch(self, message: SecsMessage) -> bool:
+        """수신 메시지를 기다리는 대기자에게 전달합니다. 대기자가 없으면 히스토리에 넣고 False를 반환합니다."""
+        key = (message.s, message.f)
+        waiters = self._waiters.get(key)
+        if waiters:
+            for waiter in list(waiters):
+                if waiter.future.done():  # 타임아웃/취소된 대기자
+                    waiters.remove(waiter)
+                    continue
+                try:
+                    matched = waiter.matches(message)
+                except Exception as e:
+                    waiters.remove(waiter)
+                    waiter.future.set_exception(e)
+                    continue
+                if matched:
+                    waiters.remove(waiter)
+                    waiter.future.set_result(message)
+                    self.dispatched += 1
+                    if not waiters:
+                        del self._waiters[key]
+                    return True
+            if not waiters:
+                del self._waiters[key]
+
+        self._store(message)
+        return False
+
+    def _store(self, message: SecsMessage) -> None:
+        """대기자가 없던 메시지를 한도와 overflow_policy에 맞춰 히스토리에 넣습니다."""
+        size = encoded_size(message.body) if self.max_bytes is not None else 0
+        history = self._history
+        max_bytes = self.max_bytes
+        fits = self.history_limit > 0 and (max_bytes is None or size <= max_bytes)
+        if fits and self.overflow_policy is OverflowPolicy.DROP_NEWEST:
+            fits = len(history) < self.history_limit and (max_bytes is None or self.history_bytes + size <= max_bytes)
+        if not fits:
+            self._evict(message, size)
+            return
+        # 새 메시지가 들어갈 자리를 오래된 메시지부터 비웁니다.
+        while len(history) >= self.history_limit or (max_bytes is not None and self.history_bytes + size > max_bytes):
+            oldest, oldest_size = history.popleft()
+            self.history_bytes -= oldest_size
+            self._evict(oldest, oldest_size)
+        history.append((message, size))
+        self.history_bytes += size
+
+    def _evict(self, message: SecsMessage, size: int) -> None:
+        if self.overflow_policy is OverflowPolicy.SPILL_TO_JOURNAL:
+            self._write_journal(message)
+            self.spilled += 1
+            self.spilled_bytes += size
+        else:
+            self.dropped += 1
+            self.dropped_bytes += size
+
+    def _write_journal(self, message: SecsMessage) -> None:
+        """메시지를 저널 줄(JSON)로 만들어 쓰기 대기열에 넣습니다. 진행 중인 쓰기가 없으면 시작합니다."""
+        try:
+            header = json.dumps({'time': time.time(), 's': message.s, 'f': message.f, 'w_bit': message.w_bit,
+                                 'system_bytes': message.system_bytes, 'session_id': message.session_id})
+            # Body는 트리를 dict로 바꾸지 않고 바로 JSON 텍스트로 만듭니다.
+            self._journal_pending.append(f'{header[:-1]}, "body": {dumps_body(message.body)}}}\n')
+        except Exception as e:
+            self.journal_errors += 1
+            self.logger.error(f"Cannot journal S{message.s}F{message.f}: {e}")
+            return
+        if self._journal_write is None:
+            self._start_journal_write()
+
+    def _start_journal_write(self) -> None:
+        lines, self._journal_pending = self._journal_pending, []
+        future = asyncio.get_running_loop().run_in_executor(None, _append_lines, self.journal_path, lines)
+        future.add_done_callback(functools.partial(self._journal_written, len(lines)))
+        self._journal_write = future
+
+    def _journal_written(self, count: int, future: asyncio.Future) -> None:
+        """쓰기 완료 콜백: 실패를 집계하고, 그동안 쌓인 줄이 있으면 다음 쓰기를 시작합니다."""
+        self._journal_write = None
+        exc = asyncio.CancelledError() if future.cancelled() else future.exception()
+        if exc is not None:
+            self.journal_errors += count
+            self.logger.error(f"Failed to write {count} message(s) to journal {self.journal_path}: {exc!r}")
+        if self._journal_pending:
+            self._start_journal_write()
+
+    async def wait(self, s: int, f: int, predicate: Optional[MessagePredicate] = None,
+                   timeout: Optional[float] = None) -> SecsMessage:
+        """
+        S/F(와 predicate)에 맞는 메시지를 기다립니다. 히스토리에 이미 있으면 가장 오래된 것을 바로 반환합니다.
+        timeout 안에 오지 않으면 asyncio.TimeoutError가 발생합니다.
+        """
+        message = self.take_from_history(s, f, predicate)
+        if message is not None:
+            return message
+
+        waiter = _Waiter(predicate, asyncio.get_running_loop().create_future())
+        self._waiters.setdefault((s, f), deque()).append(waiter)
+        try:
+            return await asyncio.wait_for(waiter.future, timeout)
+        finally:
+            if not waiter.future.done() or waiter.future.cancelled():
+                self._remove_waiter((s, f), waiter)
+
+    def take_from_history(self, s: int, f: int, predicate: Optional[MessagePredicate] = None) -> Optional[SecsMessage]:
+        """히스토리에서 조건에 맞는 가장 오래된 메시지를 꺼냅니다 (없으면 None)."""
+        for index, (message, size) in enumerate(self._history):
+            if message.s == s and message.f == f and (predicate is None or predicate(message)):
+                del self._history[index]
+                self.history_bytes -= size
+                return message
+        return None
+
+    def _remove_waiter(self, key: Tuple[int, int], waiter: _Waiter) -> None:
+        waiters = self._waiters.get(key)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            pass
+        if not waiters:
+            del self._waiters[key]
+
+    @property
+    def history_size(self) -> int:
+        return len(self._history)
+
+    def pending(self) -> int:
+        """등록되어 있는 대기자 수"""
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def clear_history(self) -> None:
+        self._history.clear()
+        self.history_bytes = 0
+
+    async def close(self) -> None:
+        """대기 중인 저널 쓰기가 모두 끝날 때까지 기다립니다 (이후 다시 넘치면 이어서 씁니다)."""
+        while self._journal_write is not None:
+            await asyncio.wait([self._journal_write])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'waiters': self.pending(),
+            'history': len(self._history),
+            'history_bytes': self.history_bytes,
+            'dispatched': self.dispatched,
+            'dropped': self.dropped,
+            'dropped_bytes': self.dropped_bytes,
+            'spilled': self.spilled,
+            'spilled_bytes': self.spilled_bytes,
+            'journal_errors': self.journal_errors,
+        }
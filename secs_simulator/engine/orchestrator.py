@@ -1,18 +1,92 @@
 import asyncio
 import json
-from typing import Callable, Awaitable, Dict, Any
+from typing import Callable, Awaitable, Dict, Any, Optional, Union
 
+from secs_simulator.core.decode_pool import DecodePool, DEFAULT_OFFLOAD_THRESHOLD
+from secs_simulator.core.secs_template import is_slot_path
+from secs_simulator.core.transactions import Transaction, describe_failure
+from secs_simulator.engine.auto_reply import AutoReplyTable, DEFAULT_LIBRARY_DIR, DEFAULT_RULES_DIR
 from secs_simulator.engine.device_agent import DeviceAgent
+from secs_simulator.engine.message_waiters import DEFAULT_HISTORY_SIZE
+from secs_simulator.engine.scenario_manager import ScenarioManager
+from secs_simulator.engine.timer_wheel import TimerWheel
+from secs_simulator.engine.virtual_device import VirtualDevice
 
 class Orchestrator:
     def __init__(self, status_callback: Callable[[str, str, str], Awaitable]):
-        self._agents: Dict[str, DeviceAgent] = {}
+        self._agents: Dict[str, Union[DeviceAgent, VirtualDevice]] = {}
         self._device_configs: Dict[str, Any] = {}
         self._status_callback = status_callback
         self._scenario_task: asyncio.Task | None = None
         self.is_running = False
-        self._last_request_context: Dict[str, int] = {}
+        self._last_request_context: Dict[str, Optional[Transaction]] = {}  # device_id -> 마지막 W-bit 요청
         self.config_path: str = ""
+        # 'slots' 스텝을 미리 컴파일된 템플릿으로 전송할 때 사용합니다 (MainWindow가 연결).
+        self.scenario_manager: Optional[ScenarioManager] = None
+        # 모든 에이전트의 HSMS 타이머(T5/T6/T7/T8, Linktest)를 하나의 타이머 휠에서 관리합니다.
+        self.timer_wheel = TimerWheel()
+        # 큰 수신 Body는 모든 에이전트가 공유하는 워커 풀에서 디코딩해 이벤트 루프(UI)를 막지 않습니다.
+        self.decode_pool = DecodePool()
+        # 장비 타입별 자동 응답 규칙 (resources/reply_rules/<type>.json + 메시지 라이브러리)
+        self.message_library_dir = DEFAULT_LIBRARY_DIR
+        self.reply_rules_dir = DEFAULT_RULES_DIR
+        self._reply_tables: Dict[str, Optional[AutoReplyTable]] = {}
+
+    def _create_agent(self, device_id: str, config: Dict[str, Any]) -> Union[DeviceAgent, VirtualDevice]:
+        """
+        장비 설정(dict)으로부터 DeviceAgent를 생성합니다.
+        'parent'가 있는 설정은 부모 에이전트의 연결을 'session_id'로 공유하는 VirtualDevice를 만듭니다.
+        """
+        if 'parent' in config:
+            parent = self._agents.get(config['parent'])
+            if not isinstance(parent, DeviceAgent):
+                raise ValueError(f"Parent agent '{config['parent']}' not found for virtual device '{device_id}'")
+            # 기본값 0은 부모 자신의 Session이므로 항상 충돌합니다. Session ID는 반드시 지정해야 합니다.
+            if 'session_id' not in config:
+                raise ValueError(f"Virtual device '{device_id}' has no 'session_id'")
+            return VirtualDevice(device_id, parent, config['session_id'], self._status_callback,
+                                 auto_replies=self._get_reply_table(config))
+        return DeviceAgent(
+            device_id=device_id,
+            host=config['host'],
+            port=config['port'],
+            connection_mode=config.get('connection_mode', 'Passive'),
+            status_callback=self._status_callback,
+            # JSON 파일에서 타임아웃 값들을 읽어서 전달
+            t3=config.get('t3', 10),
+            t5=config.get('t5', 10),
+            t6=config.get('t6', 5),
+            t7=config.get('t7', 10),
+            t8=config.get('t8', 5),
+            timer_wheel=self.timer_wheel,
+            lazy_decode=config.get('lazy_decode'),
+            parse_cache_size=config.get('parse_cache_size', 0),
+            transport=config.get('transport', 'stream'),
+            max_outstanding_transactions=config.get('max_outstanding_transactions', 256),
+            send_s9f9_on_t3=config.get('s9f9_on_t3', False),
+            session_id=config.get('session_id', 0),
+            decode_pool=self.decode_pool,
+            offload_threshold=config.get('offload_threshold', DEFAULT_OFFLOAD_THRESHOLD),
+            message_history_size=config.get('message_history_size', DEFAULT_HISTORY_SIZE),
+            message_overflow_policy=config.get('message_overflow_policy', 'drop-oldest'),
+            message_history_max_bytes=config.get('message_history_max_bytes'),
+            message_journal_dir=config.get('message_journal_dir'),
+            auto_replies=self._get_reply_table(config)
+        )
+
+    def _get_reply_table(self, config: Dict[str, Any]) -> Optional[AutoReplyTable]:
+        """장비 타입의 자동 응답 규칙 표를 반환합니다 (타입별로 한 번만 로드, 'auto_reply': false면 None)."""
+        device_type = config.get('type')
+        if not device_type or not config.get('auto_reply', True):
+            return None
+        if device_type not in self._reply_tables:
+            try:
+                self._reply_tables[device_type] = AutoReplyTable.load(
+                    device_type, self.reply_rules_dir, self.message_library_dir)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error loading auto-reply rules for type '{device_type}': {e}")
+                self._reply_tables[device_type] = None
+        return self._reply_tables[device_type]
 
     def load_device_configs(self, config_path: str) -> Dict[str, Any]:
         self.config_path = config_path
@@ -20,20 +94,12 @@ class Orchestrator:
             with open(config_path, 'r', encoding='utf-8') as f:
                 self._device_configs = json.load(f)
 
-            for device_id, settings in self._device_configs.items():
-                agent = DeviceAgent(
-                    device_id=device_id,
-                    host=settings['host'],
-                    port=settings['port'],
-                    connection_mode=settings.get('connection_mode', 'Passive'),
-                    status_callback=self._status_callback,
-                    # JSON 파일에서 타임아웃 값들을 읽어서 전달
-                    t3=settings.get('t3', 10),
-                    t5=settings.get('t5', 10),
-                    t6=settings.get('t6', 5),
-                    t7=settings.get('t7', 10)
-                )
-                self._agents[device_id] = agent
+            # 가상 장비는 부모 에이전트가 있어야 하므로 실제 연결을 가진 장비부터 만듭니다.
+            for device_id, settings in sorted(self._device_configs.items(), key=lambda item: 'parent' in item[1]):
+                try:
+                    self._agents[device_id] = self._create_agent(device_id, settings)
+                except ValueError as e:
+                    print(f"Error: {e}")
             
             print(f"Loaded {len(self._agents)} agents from '{config_path}'")
             return self._device_configs
@@ -58,20 +124,13 @@ class Orchestrator:
         if device_id in self._device_configs:
             print(f"Error: Device ID '{device_id}' already exists.")
             return False
+        try:
+            agent = self._create_agent(device_id, config)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
         
         self._device_configs[device_id] = config
-        agent = DeviceAgent(
-            device_id=device_id,
-            host=config['host'],
-            port=config['port'],
-            connection_mode=config.get('connection_mode', 'Passive'),
-            status_callback=self._status_callback,
-            # 새로 추가된 장비의 타임아웃 값도 전달
-            t3=config.get('t3', 10),
-            t5=config.get('t5', 10),
-            t6=config.get('t6', 5),
-            t7=config.get('t7', 10)
-        )
         self._agents[device_id] = agent
         return self.save_device_configs()
 
@@ -88,6 +147,8 @@ class Orchestrator:
         
         stop_tasks = [agent.stop() for agent in self._agents.values()]
         await asyncio.gather(*stop_tasks)
+        await self.timer_wheel.stop()
+        self.decode_pool.shutdown()
 
     async def start_agent(self, device_id: str):
         agent = self._agents.get(device_id)
@@ -126,44 +187,84 @@ class Orchestrator:
                 if not target_agent:
                     continue
 
+                # --- 'Send Template' 스텝 처리 (message_id + slots) ---
+                # 라이브러리 메시지를 템플릿으로 한 번만 컴파일하고, 슬롯 값만 바꿔 전송합니다.
+                if 'slots' in step and (template := self._get_step_template(step)) is not None:
+                    # W-bit 요청이면 Reply를 기다릴 Transaction을 저장해 둡니다.
+                    if template.w_bit:
+                        self._last_request_context[device_id] = await target_agent.send_request(
+                            s=template.s,
+                            f=template.f,
+                            body=template.render(step['slots'])
+                        )
+                    else:
+                        await target_agent.send_message(
+                            s=template.s,
+                            f=template.f,
+                            w_bit=False,
+                            body=template.render(step['slots'])
+                        )
+
                 # --- 'Send Message' 스텝 처리 ---
-                if 'message' in step:
+                elif 'message' in step:
                     message = step['message']
                     w_bit = message.get('w_bit', False)
                     
-                    # 1. 메시지를 보내고, 요청에 사용된 system_bytes를 받습니다.
-                    sent_system_bytes = await target_agent.send_message(
+                    # 1. 응답이 필요한 메시지라면, Reply로 완료되는 Transaction을 받아 저장해 둡니다.
+                    if w_bit:
+                        self._last_request_context[device_id] = await target_agent.send_request(
+                            s=message.get('s', 0),
+                            f=message.get('f', 0),
+                            body=message.get('body')
+                        )
+                    else:
+                        await target_agent.send_message(
+                            s=message.get('s', 0),
+                            f=message.get('f', 0),
+                            w_bit=False,
+                            body=message.get('body')
+                        )
+
+                # --- 'Pipeline' 스텝 처리 (부하 시험: 같은 요청을 window개씩 겹쳐 전송) ---
+                elif 'pipeline' in step:
+                    spec = step['pipeline']
+                    message = spec.get('message', {})
+                    stats = await target_agent.send_pipelined(
                         s=message.get('s', 0),
                         f=message.get('f', 0),
-                        w_bit=w_bit,
-                        body=message.get('body')
+                        body=message.get('body'),
+                        count=spec.get('count', 1),
+                        window=spec.get('window')
                     )
-                    
-                    # 2. 만약 응답이 필요한 메시지였다면, 해당 system_bytes를 저장해 둡니다.
-                    if w_bit:
-                        self._last_request_context[device_id] = sent_system_bytes
+                    await self._status_callback("Orchestrator", f"Pipeline result for {device_id}: {stats!r}", "blue")
 
                 # --- 'Wait for Reply' 스텝 처리 ---
                 elif 'wait_recv' in step:
-                    # 3. 이전에 저장해 둔 요청의 system_bytes를 가져옵니다.
-                    system_bytes_to_wait_for = self._last_request_context.get(device_id)
-                    if system_bytes_to_wait_for is None:
+                    # 2. 이전에 저장해 둔 요청의 Transaction을 꺼냅니다 (Reply는 한 번만 기다릴 수 있습니다).
+                    transaction = self._last_request_context.pop(device_id, None)
+                    if transaction is None:
                         error_msg = f"Scenario FAIL: Device '{device_id}' is waiting for a reply, but no prior request was made."
                         await self._status_callback("Orchestrator", error_msg, "red")
                         break
                     
-                    match_criteria = step['wait_recv']
-                    s, f, timeout = match_criteria.get('s'), match_criteria.get('f'), step.get('timeout', 10.0)
-
-                    # 4. S/F 정보와 함께, 기다려야 할 정확한 system_bytes를 전달합니다.
-                    result = await target_agent.wait_for_message(
-                        s=s, 
-                        f=f, 
-                        timeout=timeout, 
-                        reply_to_system_bytes=system_bytes_to_wait_for
-                    )
-                    if result is None:
-                        error_msg = f"Scenario FAIL: Timed out waiting for reply to request (SB={system_bytes_to_wait_for}) from {device_id}"
+                    timeout = step.get('timeout', 10.0)
+
+                    # 3. Reply가 오면 완료되고, T3가 먼저 만료되거나 연결이 끊기면 예외로 끝납니다.
+                    try:
+                        reply = await asyncio.wait_for(asyncio.shield(transaction.future), timeout=timeout)
+                    except Exception as e:
+                        # 스텝 타임아웃, T3 만료, 연결 종료, 전송 실패(빌더/writer 예외)를 원인과 함께 알립니다.
+                        error_msg = (f"Scenario FAIL: No reply to request (SB={transaction.system_bytes}) "
+                                     f"from {device_id}: {describe_failure(e)}")
+                        await self._status_callback("Orchestrator", error_msg, "red")
+                        break
+
+                    # 4. 스텝에 지정한 S/F와 다른 Reply(예: SxF0 Abort)는 실패로 처리합니다 (0 또는 생략은 검사 안 함).
+                    expected = step['wait_recv'] or {}
+                    expected_s, expected_f = expected.get('s'), expected.get('f')
+                    if (expected_s and reply.s != expected_s) or (expected_f and reply.f != expected_f):
+                        error_msg = (f"Scenario FAIL: Expected S{expected_s or '*'}F{expected_f or '*'} from {device_id}, "
+                                     f"but received S{reply.s}F{reply.f} (SB={transaction.system_bytes})")
                         await self._status_callback("Orchestrator", error_msg, "red")
                         break
                 
@@ -172,10 +273,24 @@ class Orchestrator:
         
         except asyncio.CancelledError:
             print("Scenario execution was cancelled.")
+        except (KeyError, ValueError) as e:
+            # 템플릿 슬롯 경로/이름이 잘못된 스텝 등: 태스크가 조용히 죽지 않도록 실패로 알립니다.
+            await self._status_callback("Orchestrator", f"Scenario FAIL: Invalid step: {e}", "red")
         finally:
             self.is_running = False
             await self._status_callback("Orchestrator", "Scenario Finished", "blue")
 
+    def _get_step_template(self, step: Dict[str, Any]):
+        """'message_id'와 'slots'가 있는 스텝의 컴파일된 템플릿을 반환합니다 (없으면 None)."""
+        if not self.scenario_manager or not step.get('message_id'):
+            return None
+        device_type = self._device_configs.get(step.get('device_id'), {}).get('type')
+        if not device_type:
+            return None
+        # 'CEID'처럼 이름으로 된 슬롯은 라이브러리 아이템의 "slot" 태그로 정해지므로, 경로 형태의 키만 넘깁니다.
+        path_slots = [name for name in step['slots'] if is_slot_path(name)]
+        return self.scenario_manager.get_message_template(device_type, step['message_id'], slots=path_slots)
+
     def send_single_message(self, device_id: str, message: dict):
         agent = self._agents.get(device_id)
         if not agent:
@@ -206,28 +321,43 @@ class Orchestrator:
         self._device_configs[new_device_id] = config
         
         # 3. 새로운 설정으로 에이전트를 다시 생성합니다.
-        agent = DeviceAgent(
-            device_id=new_device_id,
-            host=config['host'],
-            port=config['port'],
-            connection_mode=config.get('connection_mode', 'Passive'),
-            status_callback=self._status_callback,
-            t3=config.get('t3', 10),
-            t5=config.get('t5', 10),
-            t6=config.get('t6', 5),
-            t7=config.get('t7', 10)
-        )
-        self._agents[new_device_id] = agent
+        try:
+            self._agents[new_device_id] = self._create_agent(new_device_id, config)
+        except ValueError as e:
+            # 새 에이전트를 만들지 못했으면 가상 장비를 옮길 부모가 없으므로 자식 설정은 그대로 둡니다.
+            print(f"Error: {e}")
+            return False
+
+        # 3-1. 이 에이전트를 부모로 쓰던 가상 장비는 새 에이전트에 다시 연결합니다.
+        for device_id, settings in self._device_configs.items():
+            if settings.get('parent') == old_device_id:
+                settings['parent'] = new_device_id
+                old_agent = self._agents.pop(device_id, None)
+                if old_agent is not None:
+                    await old_agent.stop()
+                try:
+                    self._agents[device_id] = self._create_agent(device_id, settings)
+                except ValueError as e:
+                    print(f"Error: {e}")
         
         # 4. 변경된 내용을 파일에 저장합니다.
         return self.save_device_configs()
 
     async def delete_device(self, device_id: str) -> bool:
-        """✅ [추가] 디바이스를 삭제합니다."""
-        if device_id in self._agents:
-            await self._agents[device_id].stop()
-            del self._agents[device_id]
-        
+        """
+        ✅ [추가] 디바이스를 삭제합니다.
+        이 장비를 부모로 쓰는 가상 장비도 부모 연결 없이는 동작할 수 없으므로 함께 정지하고 삭제합니다.
+        """
+        children = [child_id for child_id, settings in self._device_configs.items()
+                    if settings.get('parent') == device_id]
+        # 가상 장비를 먼저 정지해 부모에서 분리한 뒤 부모를 정지합니다.
+        for agent_id in children + [device_id]:
+            agent = self._agents.pop(agent_id, None)
+            if agent is not None:
+                await agent.stop()
+
+        for child_id in children:
+            del self._device_configs[child_id]
         if device_id in self._device_configs:
             del self._device_configs[device_id]
             return self.save_device_configs()
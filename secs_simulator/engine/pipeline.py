@@ -0,0 +1,127 @@
+"""
+Latency/throughput statistics for pipelined W-bit requests.
+
+DeviceAgent.send_pipelined()는 TCP 윈도우처럼 Reply를 기다리는 요청을 최대 window개까지 동시에
+열어 두고 전송합니다. 각 Transaction이 끝날 때마다 여기의 PipelineStats에 결과와 지연 시간
+(Transaction을 연 시점부터 Reply 수신까지)을 기록합니다.
+
+LatencyStats는 DeviceAgent의 송신 지연(send_message 호출부터 프레임이 송신 큐에 들어갈 때까지)처럼
+계속 쌓이는 측정값의 최근 구간만 보관하는 집계입니다.
+"""
+import array
+import collections
+import math
+import time
+from typing import Dict, Optional
+
+from secs_simulator.core.transactions import Transaction, TransactionTimeout
+
+def _percentile(ordered, fraction: float) -> float:
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+class LatencyStats:
+    """최근 ``window``개 측정값의 백분위수와 전체 건수/최댓값을 제공하는 지연 시간 집계 (초 단위 기록)."""
+
+    def __init__(self, window: int = 4096):
+        self._samples: collections.deque = collections.deque(maxlen=window)
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """최근 측정값의 백분위수(초). 측정값이 없으면 0."""
+        if not self._samples:
+            return 0.0
+        return _percentile(sorted(self._samples), fraction)
+
+    def summary(self) -> Dict[str, float]:
+        """로그/상태 표시용 요약 (ms)"""
+        samples = self._samples
+        return {
+            'count': self.count,
+            'avg_ms': sum(samples) / len(samples) * 1000 if samples else 0.0,
+            'p50_ms': self.percentile(0.50) * 1000,
+            'p99_ms': self.percentile(0.99) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+class PipelineStats:
+    """파이프라인 한 번 실행의 결과 집계."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.sent = 0
+        self.completed = 0
+        self.timed_out = 0
+        self.failed = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._latencies = array.array('d')  # 완료된 Transaction의 지연 시간(초)
+        self._started = time.monotonic()
+        self._finished: Optional[float] = None
+
+    def on_sent(self) -> None:
+        self.sent += 1
+        self._in_flight += 1
+        if self._in_flight > self.max_in_flight:
+            self.max_in_flight = self._in_flight
+
+    def on_done(self, transaction: Transaction) -> None:
+        """Transaction 완료 콜백에서 호출합니다."""
+        self._in_flight -= 1
+        future = transaction.future
+        if future.cancelled():
+            self.failed += 1
+            return
+        exc = future.exception()
+        if exc is None:
+            self.completed += 1
+            self._latencies.append(time.monotonic() - transaction.started)
+        elif isinstance(exc, TransactionTimeout):
+            self.timed_out += 1
+        else:
+            self.failed += 1
+
+    def finish(self) -> None:
+        self._finished = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return (self._finished or time.monotonic()) - self._started
+
+    def percentile(self, fraction: float) -> float:
+        """완료된 Transaction 지연 시간의 백분위수(초). 완료된 것이 없으면 0."""
+        if not self._latencies:
+            return 0.0
+        return _percentile(sorted(self._latencies), fraction)
+
+    def summary(self) -> Dict[str, float]:
+        """로그/상태 표시용 요약 (지연 시간은 ms)."""
+        elapsed = self.elapsed
+        latencies = self._latencies
+        return {
+            'window': self.window,
+            'sent': self.sent,
+            'completed': self.completed,
+            'timed_out': self.timed_out,
+            'failed': self.failed,
+            'max_in_flight': self.max_in_flight,
+            'elapsed_s': elapsed,
+            'tps': self.completed / elapsed if elapsed > 0 else 0.0,
+            'latency_avg_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            'latency_p50_ms': self.percentile(0.50) * 1000,
+            'latency_p99_ms': self.percentile(0.99) * 1000,
+            'latency_max_ms': max(latencies) * 1000 if latencies else 0.0,
+        }
+
+    def __repr__(self) -> str:
+        s = self.summary()
+        return (f"PipelineStats(window={self.window}, sent={s['sent']}, completed={s['completed']}, "
+                f"timed_out={s['timed_out']}, failed={s['failed']}, tps={s['tps']:.0f}, "
+                f"p50={s['latency_p50_ms']:.2f}ms, p99={s['latency_p99_ms']:.2f}ms)")
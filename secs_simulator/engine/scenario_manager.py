@@ -1,8 +1,10 @@
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional, Tuple
 import copy
 
+from secs_simulator.core.secs_template import MessageTemplate, compile_template
+
 class ScenarioManager:
     """
     시나리오 파일과 메시지 라이브러리를 로드하고,
@@ -14,6 +16,7 @@ class ScenarioManager:
         self._device_types = {dev_id: conf.get('type') for dev_id, conf in device_configs.items()}
         self._message_library_dir = Path(message_library_dir)
         self._message_libraries_cache: Dict[str, Any] = {}
+        self._template_cache: Dict[Tuple[str, str, Tuple[str, ...]], MessageTemplate] = {}
 
     def get_message_body(self, device_type: str, message_id: str) -> dict | None:
         """
@@ -24,6 +27,22 @@ class ScenarioManager:
         # ✅ [핵심 수정] 원본 라이브러리가 수정되지 않도록 깊은 복사본을 반환합니다.
         return copy.deepcopy(message) if message else None
 
+    def get_message_template(self, device_type: str, message_id: str,
+                             slots: Optional[Iterable[str]] = None) -> MessageTemplate | None:
+        """
+        라이브러리 메시지를 미리 인코딩된 MessageTemplate으로 컴파일하여 반환합니다.
+        같은 (장비 타입, 메시지 ID, 슬롯 목록)에 대해서는 캐시된 템플릿을 재사용합니다.
+        """
+        key = (device_type, message_id, tuple(sorted(slots or ())))
+        template = self._template_cache.get(key)
+        if template is None:
+            message = self._load_message_library(device_type).get(message_id)
+            if not message:
+                return None
+            template = compile_template(message, slots=key[2])
+            self._template_cache[key] = template
+        return template
+
     def _load_message_library(self, device_type: str) -> Dict[str, Any]:
         """장비 타입에 맞는 메시지 라이브러리를 로드하고 캐싱합니다."""
         if device_type in self._message_libraries_cache:
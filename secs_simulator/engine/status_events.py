@@ -0,0 +1,128 @@
+"""
+Coalesced status events for high-rate message traffic.
+
+메시지를 보내고 받을 때마다 상태 문자열을 만들고 로그를 남기고 UI 콜백을 호출하면, 초당 수천 건의
+트래픽에서는 상태 경로가 프로토콜 처리보다 비싸집니다. 송수신 같은 고빈도 이벤트는 장비별 최신값
+슬롯에 (코드, S, F, SB)만 기록하고, 타이머 휠로 일정 주기(기본 10Hz)마다 한 번씩 모아서 알립니다.
+연결/오류처럼 드물고 중요한 상태는 지금처럼 바로 알립니다.
+
+    events = StatusEvents(flush_callback, timer_wheel)
+    events.post("EQ", StatusCode.SENT, 6, 11, system_bytes)      # 동기, 문자열을 만들지 않음
+    # 0.1초 뒤: flush_callback("EQ", "Sent S6F11 (SB=...) [+999 coalesced]", "green")
+"""
+import time
+from enum import Enum
+from typing import Awaitable, Callable, Dict, Optional
+
+from secs_simulator.engine.timer_wheel import TimerWheel, WheelTimer
+
+# UI/로그로 내보내는 주기 (초)
+DEFAULT_FLUSH_INTERVAL = 0.1
+
+class StatusCode(Enum):
+    """모아서 알리는 고빈도 상태 이벤트"""
+    SENT = "Sent"
+    RECEIVED = "Received"
+    REPLY_RECEIVED = "Reply"
+
+class _Slot:
+    """장비 하나의 최신 이벤트와, 마지막 flush 이후 / 누적 이벤트 수"""
+    __slots__ = ('code', 's', 'f', 'system_bytes', 'pending', 'counts')
+
+    def __init__(self):
+        self.code: Optional[StatusCode] = None
+        self.s = self.f = self.system_bytes = 0
+        self.pending = 0
+        self.counts: Dict[StatusCode, int] = dict.fromkeys(StatusCode, 0)
+
+    def describe(self) -> str:
+        if self.code is StatusCode.REPLY_RECEIVED:
+            text = f"Received S{self.s}F{self.f} (reply to SB={self.system_bytes})"
+        else:
+            text = f"{self.code.value} S{self.s}F{self.f} (SB={self.system_bytes})"
+        if self.pending > 1:
+            text += f" [+{self.pending - 1} coalesced]"
+        return text
+
+class StatusEvents:
+    """
+    장비 ID별 최신값 슬롯. post()는 슬롯만 갱신하고, 주기마다 flush()가 이벤트가 있었던 장비마다
+    마지막 이벤트를 한 번만 flush_callback(device_id, status, "green")으로 알립니다. 그 사이에 덮어쓴
+    이벤트 수는 coalesced로 집계합니다.
+    """
+
+    def __init__(self, flush_callback: Callable[[str, str, str], Awaitable],
+                 timer_wheel: TimerWheel, interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.flush_callback = flush_callback
+        self.timer_wheel = timer_wheel
+        self.interval = interval
+        self._slots: Dict[str, _Slot] = {}
+        # 이벤트가 쌓인 장비 ID (삽입 순서를 유지하는 집합으로 사용)
+        self._dirty: Dict[str, None] = {}
+        self._timer: Optional[WheelTimer] = None
+        self.posted = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.last_flush = 0.0
+
+    def post(self, device_id: str, code: StatusCode, s: int, f: int, system_bytes: int = 0) -> None:
+        """이벤트를 장비의 슬롯에 기록합니다. 다음 flush가 예약되어 있지 않으면 예약합니다."""
+        slot = self._slots.get(device_id)
+        if slot is None:
+            slot = self._slots[device_id] = _Slot()
+        if slot.pending:
+            self.coalesced += 1
+        else:
+            self._dirty[device_id] = None
+        slot.code, slot.s, slot.f, slot.system_bytes = code, s, f, system_bytes
+        slot.pending += 1
+        slot.counts[code] += 1
+        self.posted += 1
+        if self._timer is None:
+            self._timer = self.timer_wheel.schedule(self.interval, self.flush)
+
+    async def flush(self) -> None:
+        """쌓인 이벤트를 장비마다 한 번씩 알립니다."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # 알리는 도중(콜백이 양보하는 동안)에 들어온 이벤트는 새 목록에 쌓여 다음 flush에서 알립니다.
+        dirty, self._dirty = self._dirty, {}
+        if dirty:
+            self.flushes += 1
+            self.last_flush = time.monotonic()
+        for device_id in dirty:
+            await self._flush_slot(device_id)
+
+    async def flush_device(self, device_id: str) -> None:
+        """device_id의 쌓인 이벤트를 바로 알립니다 (이후의 즉시 상태보다 먼저 보이도록)."""
+        # 진행 중인 flush가 이미 목록을 가져갔을 수 있으므로 목록에 없어도 됩니다.
+        self._dirty.pop(device_id, None)
+        await self._flush_slot(device_id)
+
+    async def _flush_slot(self, device_id: str) -> None:
+        slot = self._slots.get(device_id)
+        if slot is None or not slot.pending:
+            return  # flush_device가 먼저 알린 장비
+        status = slot.describe()
+        slot.pending = 0
+        await self.flush_callback(device_id, status, "green")
+
+    def cancel(self) -> None:
+        """예약된 flush를 취소합니다 (쌓인 이벤트는 다음 flush나 flush_device에서 알립니다)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def counts(self, device_id: str) -> Dict[str, int]:
+        """device_id의 누적 이벤트 수 (코드 값 -> 건수)."""
+        slot = self._slots.get(device_id)
+        return {code.value: (slot.counts[code] if slot else 0) for code in StatusCode}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'posted': self.posted,
+            'coalesced': self.coalesced,
+            'flushes': self.flushes,
+            'pending_devices': len(self._dirty),
+        }
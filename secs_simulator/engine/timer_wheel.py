@@ -0,0 +1,195 @@
+"""
+Hashed timer wheel shared by all DeviceAgents.
+
+에이전트마다 T5/하트비트 루프가 1초마다 깨어나 타임스탬프를 비교하는 대신, Orchestrator가 소유한
+하나의 타이머 휠이 모든 연결의 HSMS 타이머(T5/T6/T7/T8, Linktest 주기)를 관리합니다.
+
+휠은 ``slots``개의 슬롯을 ``tick`` 간격으로 한 칸씩 돌며, 현재 슬롯에서 만료된 타이머의 콜백을
+한꺼번에 실행합니다. 예약/취소는 O(1)이고, 휠 한 바퀴보다 긴 타이머는 남은 바퀴 수(rounds)로
+표현합니다. 타이머 정밀도는 tick 단위이며(HSMS 타이머는 초 단위이므로 충분합니다), 대기 중인 타이머가
+없으면 틱 태스크를 멈췄다가 다음 예약 때 다시 시작합니다.
+
+    wheel = TimerWheel()
+    handle = wheel.schedule(t6, on_t6_timeout, connection)
+    handle.cancel()
+
+T8처럼 수신할 때마다 다시 거는 타이머는 ``rearm()``으로 같은 핸들의 deadline만 늦춥니다. 슬롯에 있는
+타이머는 그 슬롯을 지날 때 deadline이 남았으면 새 슬롯으로 옮기므로, 다시 걸 때마다 타이머를 새로
+만들지 않습니다.
+"""
+import asyncio
+import inspect
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+DEFAULT_TICK = 0.1
+DEFAULT_SLOTS = 512
+
+class WheelTimer:
+    """TimerWheel.schedule()이 반환하는 핸들."""
+    __slots__ = ('deadline', 'rounds', 'callback', 'args', 'cancelled', 'armed')
+
+    def __init__(self, deadline: float, callback: Callable[..., Any], args: tuple):
+        self.deadline = deadline
+        self.rounds = 0
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self.armed = False   # 휠의 슬롯에 들어 있는지 (취소되어 아직 정리되지 않은 경우 포함)
+
+    def cancel(self) -> None:
+        """타이머를 취소합니다. 슬롯에서는 다음에 그 슬롯을 지날 때 제거됩니다."""
+        self.cancelled = True
+
+class TimerWheel:
+    """
+    asyncio 이벤트 루프 위에서 동작하는 해시 타이머 휠.
+
+    콜백은 이벤트 루프에서 동기적으로 호출되며, 코루틴을 반환하면 태스크로 실행합니다. 실행 중인
+    태스크는 끝날 때까지 휠이 참조를 들고 있고, 실패하면 로그로 남깁니다.
+    """
+
+    def __init__(self, tick: float = DEFAULT_TICK, slots: int = DEFAULT_SLOTS):
+        if tick <= 0 or slots <= 0:
+            raise ValueError("TimerWheel requires a positive tick and slot count")
+        self.tick = tick
+        self._slots: List[List[WheelTimer]] = [[] for _ in range(slots)]
+        self._cursor = 0                  # 다음에 처리할 슬롯
+        self._next_tick = 0.0             # 다음 슬롯을 처리할 시각 (monotonic)
+        self._pending = 0                 # 슬롯에 들어 있는 (취소되지 않았을 수도 있는) 타이머 수
+        self._task: Optional[asyncio.Task] = None
+        self._callback_tasks: Set[asyncio.Future] = set()  # 코루틴 콜백으로 실행 중인 태스크
+        self.fired = 0
+        self.logger = logging.getLogger("TimerWheel")
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args) -> WheelTimer:
+        """delay초 뒤에 callback(*args)를 호출하도록 예약합니다."""
+        self._ensure_running()
+        timer = WheelTimer(time.monotonic() + max(delay, 0.0), callback, args)
+        self._place(timer)
+        return timer
+
+    def rearm(self, timer: WheelTimer, delay: float) -> WheelTimer:
+        """
+        이 휠에서 만든 timer를 (취소했거나 이미 실행되었더라도) delay초 뒤로 다시 겁니다.
+        슬롯에 남아 있고 deadline이 늦어지기만 하면 deadline만 바꿉니다. deadline을 앞당기면 기존
+        핸들을 취소하고 새 타이머를 반환하므로, 항상 반환값을 핸들로 사용하세요.
+        """
+        self._ensure_running()
+        deadline = time.monotonic() + max(delay, 0.0)
+        if timer.armed:
+            if deadline < timer.deadline:
+                timer.cancel()
+                return self.schedule(delay, timer.callback, *timer.args)
+            timer.deadline = deadline
+            timer.cancelled = False
+            return timer
+        timer.deadline = deadline
+        timer.cancelled = False
+        self._place(timer)
+        return timer
+
+    def _place(self, timer: WheelTimer) -> None:
+        # _cursor 슬롯은 _next_tick에 처리되므로, deadline 이후에 처리되는 첫 슬롯을 고릅니다.
+        ticks = max(0, math.ceil((timer.deadline - self._next_tick) / self.tick))
+        slot_count = len(self._slots)
+        timer.rounds = ticks // slot_count
+        timer.armed = True
+        self._slots[(self._cursor + ticks) % slot_count].append(timer)
+        self._pending += 1
+
+    @property
+    def pending(self) -> int:
+        """슬롯에 남아 있는 타이머 수 (아직 정리되지 않은 취소 타이머 포함)."""
+        return self._pending
+
+    def stats(self) -> Dict[str, int]:
+        return {'pending': self._pending, 'fired': self.fired, 'running': int(self.is_running)}
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def stop(self) -> None:
+        """틱 태스크를 멈추고 예약된 타이머를 모두 버립니다. 실행 중인 콜백 태스크는 취소합니다."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for slot in self._slots:
+            for timer in slot:
+                timer.armed = False
+            slot.clear()
+        self._pending = 0
+        tasks = list(self._callback_tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _ensure_running(self) -> None:
+        if self.is_running:
+            return
+        self._next_tick = time.monotonic() + self.tick
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        slot_count = len(self._slots)
+        while self._pending:
+            delay = self._next_tick - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # 루프가 늦게 깨어났다면 밀린 틱을 한꺼번에 처리합니다.
+            now = time.monotonic()
+            while self._next_tick <= now and self._pending:
+                # 콜백이 새 타이머를 예약할 수 있으므로 커서를 먼저 옮긴 뒤 슬롯을 처리합니다.
+                slot = self._slots[self._cursor]
+                self._cursor = (self._cursor + 1) % slot_count
+                self._next_tick += self.tick
+                self._advance(slot)
+        self._task = None
+
+    def _advance(self, slot: List[WheelTimer]) -> None:
+        if not slot:
+            return
+        due: List[WheelTimer] = []
+        keep: List[WheelTimer] = []
+        moved: List[WheelTimer] = []
+        # 커서는 이미 다음 슬롯으로 옮겨졌으므로, 이 슬롯의 시각은 _next_tick - tick입니다.
+        # rearm()으로 deadline이 그보다 (반 틱 넘게) 늦어진 타이머는 새 슬롯으로 옮깁니다.
+        late_edge = self._next_tick - self.tick / 2
+        for timer in slot:
+            if timer.cancelled:
+                timer.armed = False
+            elif timer.rounds:
+                timer.rounds -= 1
+                keep.append(timer)
+            elif timer.deadline > late_edge:
+                moved.append(timer)
+            else:
+                timer.armed = False
+                due.append(timer)
+        self._pending -= len(slot) - len(keep)
+        slot[:] = keep
+        for timer in moved:
+            self._place(timer)
+        for timer in due:
+            self.fired += 1
+            try:
+                result = timer.callback(*timer.args)
+                if inspect.isawaitable(result):
+                    task = asyncio.ensure_future(result)
+                    self._callback_tasks.add(task)
+                    task.add_done_callback(self._callback_done)
+            except Exception as e:
+                self.logger.error(f"Timer callback {timer.callback!r} failed: {e}")
+
+    def _callback_done(self, task: asyncio.Future) -> None:
+        self._callback_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"Timer callback task failed: {task.exception()!r}")
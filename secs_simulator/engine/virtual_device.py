@@ -0,0 +1,92 @@
+"""
+Virtual device sharing one HSMS connection (HSMS-GS style multi-session).
+
+여러 장비를 시뮬레이션할 때 장비마다 TCP 연결을 열지 않고, 하나의 DeviceAgent 연결 위에서
+Session ID(Device ID)만 다르게 주고받습니다. 부모 에이전트가 수신 메시지의 Session ID를 보고
+해당 가상 장비로 라우팅하며, 가상 장비가 보내는 메시지에는 자신의 Session ID가 실립니다.
+
+    agent = DeviceAgent("CLUSTER", host, port, status_callback)
+    pm1 = VirtualDevice("PM1", agent, session_id=1, status_callback=status_callback)
+    await agent.start(); await pm1.start()
+    await pm1.send_request(1, 1)     # Session ID 1로 전송, Reply도 Session 1에서 수신
+"""
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+from secs_simulator.core.models import SecsMessage
+from secs_simulator.core.transactions import Transaction
+from secs_simulator.engine.auto_reply import AutoReplyTable
+from secs_simulator.engine.message_waiters import MessagePredicate
+from secs_simulator.engine.pipeline import PipelineStats
+
+if TYPE_CHECKING:
+    from secs_simulator.engine.device_agent import DeviceAgent
+
+class VirtualDevice:
+    """
+    부모 DeviceAgent의 연결을 공유하는 가상 장비. Orchestrator에서는 DeviceAgent와 같은 방식
+    (start/stop/send_message/send_request/wait_for_message)으로 사용합니다.
+
+    start()는 부모에 Session을 등록하고 stop()은 등록을 해제할 뿐, 연결 자체는 부모가 관리합니다.
+    """
+
+    def __init__(self, device_id: str, parent: 'DeviceAgent', session_id: int,
+                 status_callback: Callable[[str, str, str], Awaitable],
+                 auto_replies: Optional[AutoReplyTable] = None):
+        if not 0 <= session_id < 0xFFFF:
+            raise ValueError(f"Invalid session id: {session_id}")
+        self.device_id = device_id
+        self.parent = parent
+        self.session_id = session_id
+        self.status_callback = status_callback
+        # 이 가상 장비(장비 타입)의 자동 응답 규칙 (부모와 타입이 다를 수 있으므로 따로 가집니다)
+        self.auto_replies = auto_replies
+        # 이 Session으로 수신된 메시지의 대기자/히스토리 (wait_for_message에서 사용)
+        self._waiters = parent.create_message_waiters(device_id)
+
+    async def start(self) -> None:
+        """부모 에이전트에 Session을 등록합니다 (이미 등록되어 있으면 무시)."""
+        try:
+            self.parent.attach_virtual_device(self)
+        except ValueError as e:
+            await self._update_status(f"Cannot attach session {self.session_id}: {e}", "red")
+            return
+        if self.parent.is_connected:
+            await self._update_status(f"HSMS Selected (Ready) via {self.parent.device_id}", "green")
+        else:
+            await self._update_status(f"Waiting for {self.parent.device_id} (session {self.session_id})", "orange")
+
+    async def stop(self) -> None:
+        """Session 등록을 해제합니다. 부모에 다른 가상 장비가 남아 있으면 이후 이 Session으로 오는 메시지는 S9F1로 거부됩니다."""
+        self.parent.detach_virtual_device(self)
+        await self._waiters.close()
+        await self._update_status("Stopped", "gray")
+
+    async def send_message(self, s: int, f: int, w_bit: bool = False,
+                           body: Optional[list | bytes] = None) -> int:
+        return await self.parent.send_message(s, f, w_bit, body, session_id=self.session_id)
+
+    async def send_request(self, s: int, f: int, body: Optional[list | bytes] = None) -> Optional[Transaction]:
+        return await self.parent.send_request(s, f, body, session_id=self.session_id)
+
+    async def send_pipelined(self, s: int, f: int, body: Optional[list | bytes] = None,
+                             count: int = 1, window: Optional[int] = None) -> PipelineStats:
+        return await self.parent.send_pipelined(s, f, body, count=count, window=window,
+                                                session_id=self.session_id)
+
+    async def wait_for_message(self, s: int, f: int, timeout: float = 10.0,
+                               reply_to_system_bytes: Optional[int] = None,
+                               predicate: Optional[MessagePredicate] = None) -> Optional[SecsMessage]:
+        return await self.parent.wait_for_message(s, f, timeout, reply_to_system_bytes,
+                                                  session_id=self.session_id, predicate=predicate)
+
+    @property
+    def is_connected(self) -> bool:
+        return self.parent.is_connected and self.parent.virtual_devices.get(self.session_id) is self
+
+    async def _update_status(self, status: str, color: str = "default"):
+        # 부모 슬롯에 쌓여 있던 이 장비의 송수신 상태를 먼저 내보냅니다.
+        await self.parent._status_events.flush_device(self.device_id)
+        try:
+            await self.status_callback(self.device_id, status, color)
+        except Exception as e:
+            self.parent.logger.error(f"Status callback failed for {self.device_id}: {e}")
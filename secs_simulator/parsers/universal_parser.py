@@ -1,63 +1,81 @@
 import csv
 import json
-import io
 import struct
 from types import SimpleNamespace
 
-def _parse_body_recursive(body_io):
-    # 이 함수는 원본과 동일하게 유지됩니다.
-    items = []
-    try:
-        format_code_byte = body_io.read(1)
-        if not format_code_byte: return items
-        
-        format_char = format_code_byte[0]
-        length_bits = format_char & 0b00000011
-        num_length_bytes = length_bits
-
-        if num_length_bytes == 0:
-            length = 0
-        else:
-            length_bytes = body_io.read(num_length_bytes)
-            length = int.from_bytes(length_bytes, 'big')
-
+from secs_simulator.core.secs_parser import DEFAULT_MAX_ITEMS, SecsDecodeError
+
+# 정수 포맷 코드 -> (타입 이름, 요소 크기). 요소 하나당 SimpleNamespace 하나를 만듭니다.
+_INTEGER_FORMATS = {
+    0b101001: ('U1', 1),
+    0b101010: ('U2', 2),
+    0b101011: ('U4', 4),
+}
+_LIST_FORMAT = 0b000000
+_ASCII_FORMAT = 0b010000
+# 로그 한 줄의 Body에서 허용하는 최대 'L' 중첩 깊이와 아이템 수 (손상된 로그가 파싱을 붙잡지 않도록)
+MAX_BODY_DEPTH = 1024
+MAX_BODY_ITEMS = DEFAULT_MAX_ITEMS
+
+def _parse_body(body_bytes, max_depth=MAX_BODY_DEPTH, max_items=MAX_BODY_ITEMS):
+    """
+    Body의 첫 번째 최상위 아이템을 SimpleNamespace 트리로 파싱합니다.
+    재귀 대신 열린 'L' 아이템의 (부모 리스트, 남은 자식 수)를 스택으로 관리합니다.
+    정수 배열은 요소마다 별도 아이템으로 펼치고, 지원하지 않는 포맷은 건너뜁니다.
+    'L' 중첩이 max_depth를 넘거나 (펼친) 아이템 수가 max_items를 넘으면 SecsDecodeError를 발생시킵니다.
+    """
+    root = []
+    children, remaining = root, 1
+    stack = []
+    offset, end = 0, len(body_bytes)
+    item_count = 0
+
+    while offset < end and remaining:
+        format_char = body_bytes[offset]
+        num_length_bytes = format_char & 0b00000011
+        length = int.from_bytes(body_bytes[offset + 1:offset + 1 + num_length_bytes], 'big')
+        offset += 1 + num_length_bytes
         data_format = format_char >> 2
-        
-        if data_format == 0b000000: # L (List)
-            list_items = []
-            for _ in range(length):
-                list_items.extend(_parse_body_recursive(body_io))
-            items.append(SimpleNamespace(type='L', value=list_items))
-        
-        elif data_format == 0b010000: # A (ASCII)
-            val = body_io.read(length).decode('ascii', errors='ignore')
-            items.append(SimpleNamespace(type='A', value=val))
-        
-        elif data_format == 0b010010: # U1 (1-byte Unsigned Int)
-            num_itemgis = length // 1
-            for _ in range(num_items):
-                val = int.from_bytes(body_io.read(1), 'big')
-                items.append(SimpleNamespace(type='U1', value=val))
-
-        elif data_format == 0b101010: # U2 (2-byte Unsigned Int)
-            num_items = length // 2
-            for _ in range(num_items):
-                val = int.from_bytes(body_io.read(2), 'big')
-                items.append(SimpleNamespace(type='U2', value=val))
-
-        elif data_format == 0b101011: # U4 (4-byte Unsigned Int)
-            num_items = length // 4
-            for _ in range(num_items):
-                val = int.from_bytes(body_io.read(4), 'big')
-                items.append(SimpleNamespace(type='U4', value=val))
-        
+        if data_format in _INTEGER_FORMATS:
+            item_count += length // _INTEGER_FORMATS[data_format][1]
         else:
-            if length > 0:
-                body_io.read(length)
-
-    except (IndexError, struct.error):
-        pass
-    return items
+            item_count += 1
+        if max_items is not None and item_count > max_items:
+            raise SecsDecodeError(f"SECS-II body has more than {max_items} items")
+
+        if data_format == _LIST_FORMAT and length:
+            if max_depth is not None and len(stack) >= max_depth:
+                raise SecsDecodeError(f"SECS-II list nesting exceeds max depth {max_depth}")
+            stack.append((children, remaining))
+            children, remaining = [], length
+            continue
+
+        if data_format == _LIST_FORMAT:
+            children.append(SimpleNamespace(type='L', value=[]))
+        elif data_format == _ASCII_FORMAT:
+            val = body_bytes[offset:offset + length].decode('ascii', errors='ignore')
+            children.append(SimpleNamespace(type='A', value=val))
+        elif data_format in _INTEGER_FORMATS:
+            item_type, size = _INTEGER_FORMATS[data_format]
+            for start in range(offset, offset + (length // size) * size, size):
+                val = int.from_bytes(body_bytes[start:start + size], 'big')
+                children.append(SimpleNamespace(type=item_type, value=val))
+        offset += length
+
+        # 자식이 다 찬 리스트를 닫아 부모에 붙입니다.
+        remaining -= 1
+        while not remaining and stack:
+            finished = children
+            children, remaining = stack.pop()
+            children.append(SimpleNamespace(type='L', value=finished))
+            remaining -= 1
+
+    # 데이터가 중간에 끝났으면 열린 리스트를 그대로 닫습니다.
+    while stack:
+        finished = children
+        children, _ = stack.pop()
+        children.append(SimpleNamespace(type='L', value=finished))
+    return root
 
 def parse_log_with_profile(log_filepath, profile):
     """
@@ -130,7 +148,12 @@ def parse_log_with_profile(log_filepath, profile):
                     msg = f"S{stream}F{f_type}"
                     log_data['ParsedBody'] = msg
                     body_bytes = full_binary[10:]
-                    log_data['ParsedBodyObject'] = _parse_body_recursive(io.BytesIO(body_bytes))
+                    try:
+                        log_data['ParsedBodyObject'] = _parse_body(body_bytes)
+                    except SecsDecodeError as e:
+                        # 항목은 남기고 Body만 비웁니다 (손상된 Body 하나로 로그 줄을 잃지 않도록).
+                        print(f"Parsing warning: Skipping body of {msg}. {e}")
+                        log_data['ParsedBodyObject'] = []
 
             elif msg_type == 'json':
                 log_data['ParsedType'] = 'JSON'
@@ -53,6 +53,7 @@ class MainWindow(QMainWindow):
             device_configs=device_configs,
             message_library_dir=resources_dir
         )
+        self.orchestrator.scenario_manager = self.scenario_manager
         self.device_widgets: Dict[str, DeviceStatusWidget] = {}
         self.selected_device_id: str | None = None
 
@@ -232,11 +233,13 @@ class MainWindow(QMainWindow):
 
         for device_id, config in device_configs.items():
             if device_id not in self.device_widgets:
+                # 가상 장비('parent' 설정)는 연결을 공유하는 부모 장비의 주소를 표시합니다.
+                address = device_configs.get(config.get('parent'), config)
                 widget = DeviceStatusWidget(
                     device_id, 
-                    config['host'], 
-                    config['port'],
-                    config.get('connection_mode', 'Passive')
+                    address['host'], 
+                    address['port'],
+                    address.get('connection_mode', 'Passive')
                 )
                 widget.toggled.connect(self.on_device_toggled)
                 widget.mousePressEvent = lambda event, dev_id=device_id: self._on_device_selected(dev_id, event)
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+import pytest
+
+from secs_simulator.core.decode_pool import DecodePool
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.core.secs_parser import SecsDecodeError, parse_body
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def pool():
+    decode_pool = DecodePool(max_workers=1)
+    yield decode_pool
+    decode_pool.shutdown()
+
+
+async def test_decode_matches_inline_parse_and_records_timing(pool):
+    """ 워커에서 디코딩한 결과가 parse_body와 같고, 대기/디코딩 시간이 집계되는지 테스트합니다. """
+    body = build_secs_body([{'type': 'L', 'value': [
+        {'type': 'L', 'value': [{'type': 'A', 'value': f'WAFER{n:03d}'}, {'type': 'U4', 'value': [n, n + 1]}]}
+        for n in range(200)]}])
+
+    results = await asyncio.gather(*(pool.decode(body) for _ in range(3)))
+
+    for items, queue_time, decode_time in results:
+        assert items == parse_body(body)
+        assert queue_time >= 0 and decode_time > 0
+    stats = pool.stats()
+    assert (stats['offloaded'], stats['offloaded_bytes'], stats['in_flight']) == (3, 3 * len(body), 0)
+    # 워커가 하나이므로 뒤에 제출된 디코딩은 앞의 디코딩이 끝날 때까지 대기합니다.
+    assert stats['queue_max_ms'] > 0 and stats['decode_max_ms'] >= stats['decode_avg_ms'] > 0
+
+
+async def test_decode_runs_off_the_event_loop_thread(pool, monkeypatch):
+    """ 디코딩이 이벤트 루프 스레드가 아닌 워커 스레드에서 실행되는지 테스트합니다. """
+    import secs_simulator.core.decode_pool as decode_pool_module
+    threads = []
+
+    def recording_parse_body(body, **kwargs):
+        threads.append(threading.current_thread())
+        return parse_body(body, **kwargs)
+
+    monkeypatch.setattr(decode_pool_module, 'parse_body', recording_parse_body)
+    await pool.decode(build_secs_body([{'type': 'A', 'value': 'OK'}]))
+    assert threads and threads[0] is not threading.main_thread()
+
+
+async def test_decode_error_is_propagated(pool):
+    """ 제한을 넘는 Body의 SecsDecodeError가 호출자에게 그대로 전달되는지 테스트합니다. """
+    nested = b'\x01\x01' * 20 + b'\x41\x01X'
+    with pytest.raises(SecsDecodeError):
+        await pool.decode(nested, max_depth=8)
+    assert pool.in_flight == 0
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+
+import pytest
+from secs_simulator.core.decode_pool import DecodePool
+from secs_simulator.core.hsms import DEFAULT_STREAM_DECODE_THRESHOLD, HsmsConnection, HsmsMessageType
+from secs_simulator.core.models import SecsItem, SecsMessage
+from secs_simulator.core.transactions import TransactionTimeout
+from secs_simulator.engine.timer_wheel import TimerWheel
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _open_connection_pair(**kwargs):
+    """루프백 소켓 위에 서버/클라이언트 HsmsConnection 쌍을 만들고 Select까지 완료합니다."""
+    server_received: asyncio.Queue = asyncio.Queue()
+    client_received: asyncio.Queue = asyncio.Queue()
+    server_side: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    async def on_client_connected(reader, writer):
+        connection = HsmsConnection(reader, writer, message_callback=server_received.put, **kwargs)
+        server_side.set_result(connection)
+        await connection.handle_connection()
+
+    server = await asyncio.start_server(on_client_connected, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    client = HsmsConnection(reader, writer, message_callback=client_received.put, **kwargs)
+    client_task = asyncio.create_task(client.handle_connection())
+    server_connection = await server_side
+
+    await client.send_hsms_message(HsmsMessageType.SELECT_REQ, client.get_next_system_bytes())
+    for _ in range(100):
+        if client.is_selected and server_connection.is_selected:
+            break
+        await asyncio.sleep(0.01)
+
+    async def close():
+        writer.close()
+        client_task.cancel()
+        server.close()
+
+    return client, server_connection, server_received, client_received, close
+
+
+async def test_data_message_round_trip():
+    """ 송신한 데이터 메시지가 SecsMessage로 그대로 수신되는지 테스트합니다. """
+    client, server, server_received, _, close = await _open_connection_pair()
+    try:
+        body = [{'type': 'L', 'value': [{'type': 'A', 'value': 'LOT01'}, {'type': 'U4', 'value': [7, 8]}]}]
+        await client.send_secs_message(6, 11, True, 42, body)
+
+        message = await asyncio.wait_for(server_received.get(), timeout=2)
+        assert isinstance(message, SecsMessage)
+        assert (message.s, message.f, message.w_bit, message.system_bytes) == (6, 11, True, 42)
+        assert message.body == [SecsItem('L', [SecsItem('A', 'LOT01'), SecsItem('U4', [7, 8])])]
+    finally:
+        await close()
+
+
+async def test_debug_logging_does_not_reject_tolerated_body(caplog):
+    """ DEBUG 로그가 켜져 있어도, 파서가 허용한 잘린 Body의 메시지가 로그 변환 때문에 버려지지 않는지 테스트합니다. """
+    caplog.set_level(logging.DEBUG)
+    client, server, server_received, _, close = await _open_connection_pair()
+    try:
+        await client.send_secs_message(6, 11, False, 43, b'\xa9\x04\x00')
+        message = await asyncio.wait_for(server_received.get(), timeout=2)
+        assert (message.s, message.f, message.system_bytes, message.body) == (6, 11, 43, [])
+    finally:
+        await close()
+
+
+async def test_large_body_is_stream_decoded():
+    """ 임계값 이상의 Body가 청크 단위 스트리밍 디코딩으로도 같은 결과를 내는지 테스트합니다. """
+    client, server, server_received, _, close = await _open_connection_pair(stream_decode_threshold=1024)
+    try:
+        samples = list(range(50000))
+        body = [{'type': 'L', 'value': [{'type': 'U4', 'value': samples}, {'type': 'A', 'value': 'TRACE'}]}]
+        await client.send_secs_message(6, 1, False, 7, body)
+
+        message = await asyncio.wait_for(server_received.get(), timeout=2)
+        assert message.body == [SecsItem('L', [SecsItem('U4', samples), SecsItem('A', 'TRACE')])]
+    finally:
+        await close()
+
+
+async def test_large_stream_body_is_offloaded_when_pool_is_configured():
+    """ decode_pool이 있으면 스트리밍 임계값(1MiB) 이상의 Body도 워커에서 디코딩되어 stats()에 집계되는지 테스트합니다. """
+    decode_pool = DecodePool(max_workers=1)
+    client, server, server_received, _, close = await _open_connection_pair(decode_pool=decode_pool)
+    try:
+        samples = list(range(300_000))
+        body = [{'type': 'L', 'value': [{'type': 'U4', 'value': samples}, {'type': 'A', 'value': 'TRACE'}]}]
+        await client.send_secs_message(6, 1, False, 8, body)
+
+        message = await asyncio.wait_for(server_received.get(), timeout=5)
+        assert message.body == [SecsItem('L', [SecsItem('U4', samples), SecsItem('A', 'TRACE')])]
+        stats = decode_pool.stats()
+        assert stats['offloaded'] == 1 and stats['offloaded_bytes'] > DEFAULT_STREAM_DECODE_THRESHOLD
+    finally:
+        decode_pool.shutdown()
+        await close()
+
+
+@pytest.mark.parametrize("stream_decode_threshold", [None, 16])
+async def test_body_over_decode_limit_is_aborted(stream_decode_threshold):
+    """ 중첩 제한을 넘는 Body는 콜백으로 전달되지 않고 S9F13으로 거부되며, 연결은 유지되는지 테스트합니다. """
+    client, server, server_received, client_received, close = await _open_connection_pair(
+        max_decode_depth=8, stream_decode_threshold=stream_decode_threshold)
+    try:
+        nested = b'\x01\x01' * 20 + b'\x41\x01X'
+        await client.send_secs_message(1, 1, True, 99, nested)
+
+        abort = await asyncio.wait_for(client_received.get(), timeout=2)
+        assert (abort.s, abort.f, abort.system_bytes) == (9, 13, 99)
+        assert server_received.empty()
+
+        await client.send_secs_message(1, 13, False, 100, [{'type': 'A', 'value': 'OK'}])
+        message = await asyncio.wait_for(server_received.get(), timeout=2)
+        assert message.body == [SecsItem('A', 'OK')]
+    finally:
+        await close()
+
+
+async def test_parse_cache_reuses_repeated_bodies():
+    """ parse_cache_size를 주면 반복 수신된 Body를 캐시에서 꺼내는지 테스트합니다. """
+    client, server, server_received, _, close = await _open_connection_pair(parse_cache_size=8)
+    try:
+        for system_bytes in range(3):
+            await client.send_secs_message(1, 1, True, system_bytes, [{'type': 'L', 'value': []}])
+            await asyncio.wait_for(server_received.get(), timeout=2)
+        assert (server.parse_cache.hits, server.parse_cache.misses) == (2, 1)
+    finally:
+        await close()
+
+
+async def test_burst_sends_are_coalesced_in_order():
+    """ 한 루프 반복 안에서 보낸 메시지들이 한 번의 flush로 묶여 순서대로 전달되는지 테스트합니다. """
+    client, server, server_received, _, close = await _open_connection_pair()
+    try:
+        flushes_before = client.outbound.flushes
+        await asyncio.gather(*(client.send_secs_message(1, 1, False, n, [{'type': 'U4', 'value': [n]}])
+                               for n in range(50)))
+
+        received = [await asyncio.wait_for(server_received.get(), timeout=2) for _ in range(50)]
+        assert [message.system_bytes for message in received] == list(range(50))
+        stats = client.outbound.stats()
+        assert stats['flushes'] == flushes_before + 1
+        assert stats['max_batch_frames'] == 50
+        assert (stats['queue_depth'], stats['bytes_pending']) == (0, 0)
+    finally:
+        await close()
+
+
+async def test_send_request_resolves_with_reply():
+    """ send_request의 Transaction이 Reply로 완료되고, Reply는 메시지 콜백으로 가지 않는지 테스트합니다. """
+    client, server, server_received, client_received, close = await _open_connection_pair()
+    try:
+        transaction = await client.send_request(1, 3, 11, [{'type': 'L', 'value': []}])
+        request = await asyncio.wait_for(server_received.get(), timeout=2)
+        await server.send_secs_message(1, 4, False, request.system_bytes, [{'type': 'U4', 'value': [5]}])
+
+        reply = await asyncio.wait_for(transaction, timeout=2)
+        assert (reply.s, reply.f, reply.system_bytes, reply.body) == (1, 4, 11, [SecsItem('U4', [5])])
+        assert client_received.empty() and len(client.transactions) == 0
+    finally:
+        await close()
+
+
+async def test_t3_timeout_sends_s9f9():
+    """ T3 만료 시 Transaction이 실패하고, 옵션이 켜져 있으면 요청 헤더를 담은 S9F9를 보내는지 테스트합니다. """
+    client, server, server_received, _, close = await _open_connection_pair(t3=0.05, send_s9f9_on_t3=True)
+    try:
+        transaction = await client.send_request(2, 41, 21, [{'type': 'L', 'value': []}])
+        await asyncio.wait_for(server_received.get(), timeout=2)
+
+        with pytest.raises(TransactionTimeout):
+            await asyncio.wait_for(transaction, timeout=2)
+        s9f9 = await asyncio.wait_for(server_received.get(), timeout=2)
+        assert (s9f9.s, s9f9.f) == (9, 9)
+        assert s9f9.body[0].value == bytes([0, 0, 0x82, 41, 0, 0]) + (21).to_bytes(4, 'big')
+    finally:
+        await close()
+
+
+async def test_linktest_future_completes_on_linktest_rsp():
+    """ Linktest.req가 반환한 Future가 같은 System Bytes의 Linktest.rsp로 완료되는지 테스트합니다. """
+    client, server, _, _, close = await _open_connection_pair()
+    try:
+        future = await client.send_hsms_message(HsmsMessageType.LINKTEST_REQ, 77)
+        assert isinstance(future, asyncio.Future)
+        assert await asyncio.wait_for(future, timeout=2) is True
+        assert not client._control_replies
+    finally:
+        await close()
+
+
+async def test_t8_closes_connection_on_stalled_frame():
+    """ 프레임이 중간에 멈추면 T8 만료로 수신 측 연결이 정리되는지 테스트합니다. """
+    client, server, _, _, close = await _open_connection_pair(timer_wheel=TimerWheel(tick=0.01), t8=0.05)
+    try:
+        client.writer.write((100).to_bytes(4, 'big') + b'\x00' * 20)  # 100바이트 중 20바이트만 전송
+        await asyncio.wait_for(server.wait_for_disconnect(), timeout=2)
+        assert not server.is_selected
+    finally:
+        await close()
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from secs_simulator.core.decode_pool import DecodePool
+from secs_simulator.core.hsms import HsmsMessageType
+from secs_simulator.core.hsms_protocol import (BufferedHsmsConnection, HsmsProtocol,
+                                               open_hsms_connection, start_hsms_server)
+from secs_simulator.core.models import SecsItem, SecsMessage
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.engine.device_agent import DeviceAgent
+
+pytestmark = pytest.mark.asyncio
+
+
+def _frame(s: int, f: int, system_bytes: int, body: bytes = b'', stype: int = 0) -> bytes:
+    header = bytes([0, 0, s | 0x80, f, 0, stype]) + system_bytes.to_bytes(4, 'big')
+    return (len(header) + len(body)).to_bytes(4, 'big') + header + body
+
+
+def _feed(protocol: HsmsProtocol, data: bytes) -> None:
+    """이벤트 루프가 하듯이 get_buffer()로 받은 버퍼에 data를 나눠 쓰고 buffer_updated()를 호출합니다."""
+    while data:
+        buffer = protocol.get_buffer(len(data))
+        size = min(len(buffer), len(data))
+        buffer[:size] = data[:size]
+        protocol.buffer_updated(size)
+        data = data[size:]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+async def test_protocol_frames_fragmented_and_coalesced_data(chunk_size):
+    """ 프레임이 여러 조각으로 나뉘거나 여러 프레임이 한 번에 도착해도 순서대로 분리되는지 테스트합니다. """
+    protocol = HsmsProtocol(buffer_size=16)
+    received = []
+    protocol.attach(lambda header, body: received.append((header[1] & 0x7F, header[4], bytes(body))))
+
+    stream = b''.join(_frame(1, 1, n, bytes([n]) * n) for n in range(1, 40))
+    for start in range(0, len(stream), chunk_size):
+        _feed(protocol, stream[start:start + chunk_size])
+
+    assert received == [(1, n, bytes([n]) * n) for n in range(1, 40)]
+
+
+async def test_protocol_queues_frames_before_attach():
+    """ 연결 객체가 붙기 전에 도착한 프레임은 복사되어 frames 큐에 보관되는지 테스트합니다. """
+    protocol = HsmsProtocol()
+    _feed(protocol, _frame(1, 13, 5, b'\x41\x02OK'))
+
+    header, body, parsed_body, error = protocol.frames.get_nowait()
+    assert (header[1] & 0x7F, header[2], header[4], body) == (1, 13, 5, b'\x41\x02OK')
+    assert parsed_body is None and error is None
+
+
+async def test_device_agent_defaults_decode_in_place():
+    """
+    "buffered" 전송의 DeviceAgent 기본 설정(lazy_decode/parse_cache 끔)이면 Body를 복사하지 않고 수신 버퍼에서
+    바로 디코딩하는지 테스트합니다. 이미 Body가 복사되는 "stream" 전송은 지연 디코딩이 기본입니다.
+    """
+    assert DeviceAgent("EQ", "127.0.0.1", 0, AsyncMock()).lazy_decode
+    agent = DeviceAgent("EQ", "127.0.0.1", 0, AsyncMock(), transport="buffered")
+    assert not agent.lazy_decode
+    protocol = HsmsProtocol()
+    connection = BufferedHsmsConnection(protocol, MagicMock(), message_callback=AsyncMock(),
+                                        lazy_decode=agent.lazy_decode, parse_cache_size=agent.parse_cache_size)
+    protocol.attach(connection._frame_received)
+    _feed(protocol, _frame(1, 13, 5, b'\x41\x02OK'))
+
+    header, body, parsed_body, error = protocol.frames.get_nowait()
+    assert body == b'' and error is None
+    assert parsed_body == [SecsItem('A', 'OK')]
+
+
+@pytest.mark.parametrize("offload", [False, True])
+async def test_buffered_connection_round_trip(offload):
+    """
+    BufferedHsmsConnection 쌍이 Select 후 큰 Body를 포함한 데이터 메시지를 주고받는지 테스트합니다.
+    offload=True이면 큰 Body는 워커에서 디코딩되며, 뒤에 온 작은 메시지보다 먼저 전달되어야 합니다.
+    """
+    server_received: asyncio.Queue = asyncio.Queue()
+    server_side: asyncio.Future = asyncio.get_running_loop().create_future()
+    decode_pool = DecodePool() if offload else None
+
+    async def on_client_connected(protocol, writer):
+        connection = BufferedHsmsConnection(protocol, writer, message_callback=server_received.put,
+                                            lazy_decode=False, decode_pool=decode_pool, offload_threshold=1024)
+        server_side.set_result(connection)
+        await connection.handle_connection()
+
+    server = await start_hsms_server(on_client_connected, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    protocol, writer = await open_hsms_connection('127.0.0.1', port)
+    client = BufferedHsmsConnection(protocol, writer, message_callback=asyncio.Queue().put)
+    client_task = asyncio.create_task(client.handle_connection())
+    try:
+        server_connection = await server_side
+        await client.send_hsms_message(HsmsMessageType.SELECT_REQ, client.get_next_system_bytes())
+        for _ in range(100):
+            if client.is_selected and server_connection.is_selected:
+                break
+            await asyncio.sleep(0.01)
+        assert client.is_selected and server_connection.is_selected
+
+        samples = list(range(100_000))
+        body = [{'type': 'L', 'value': [{'type': 'U4', 'value': samples}, {'type': 'A', 'value': 'TRACE'}]}]
+        await client.send_secs_message(6, 11, True, 42, body)
+        await client.send_secs_message(1, 1, True, 43, build_secs_body([{'type': 'L', 'value': []}]))
+
+        first = await asyncio.wait_for(server_received.get(), timeout=2)
+        second = await asyncio.wait_for(server_received.get(), timeout=2)
+        assert isinstance(first, SecsMessage)
+        assert (first.s, first.f, first.system_bytes) == (6, 11, 42)
+        assert first.body == [SecsItem('L', [SecsItem('U4', samples), SecsItem('A', 'TRACE')])]
+        assert (second.s, second.f, second.body) == (1, 1, [SecsItem('L', [])])
+        if decode_pool is not None:
+            assert decode_pool.offloaded == 1 and decode_pool.offloaded_bytes > 400_000
+    finally:
+        if decode_pool is not None:
+            decode_pool.shutdown()
+        writer.close()
+        client_task.cancel()
+        server.close()
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from secs_simulator.core.outbound_queue import OutboundQueue
+
+pytestmark = pytest.mark.asyncio
+
+
+class _RecordingWriter:
+    """write/writelines 호출을 기록하고, drain은 release 될 때까지 기다리는 테스트용 writer."""
+
+    def __init__(self):
+        self.calls = []
+        self.drained = asyncio.Event()
+
+    def write(self, data):
+        self.calls.append([bytes(data)])
+
+    def writelines(self, chunks):
+        self.calls.append([bytes(chunk) for chunk in chunks])
+
+    def is_closing(self):
+        return False
+
+    async def drain(self):
+        await self.drained.wait()
+
+
+async def test_enqueue_coalesces_until_next_loop_iteration():
+    """ 같은 루프 반복에서 넣은 프레임은 다음 반복에 한 번의 writelines로 나가는지 테스트합니다. """
+    writer = _RecordingWriter()
+    queue = OutboundQueue(writer)
+    for n in range(3):
+        queue.enqueue(bytes([n]) * 4)
+    assert (writer.calls, queue.queue_depth, queue.bytes_pending) == ([], 3, 12)
+
+    await asyncio.sleep(0)
+    assert writer.calls == [[b'\x00' * 4, b'\x01' * 4, b'\x02' * 4]]
+    assert queue.stats()['frames_sent'] == 3
+
+
+@pytest.mark.parametrize("flush_threshold, expected_calls", [(8, 2), (1024, 1)])
+async def test_flush_threshold_flushes_immediately(flush_threshold, expected_calls):
+    """ 대기 바이트가 flush_threshold를 넘으면 루프 반복을 기다리지 않고 바로 내보내는지 테스트합니다. """
+    writer = _RecordingWriter()
+    queue = OutboundQueue(writer, flush_threshold=flush_threshold)
+    for _ in range(4):
+        queue.enqueue(b'\x00' * 4)
+    await asyncio.sleep(0)
+    assert len(writer.calls) == expected_calls
+    assert sum(len(call) for call in writer.calls) == 4
+
+
+async def test_send_waits_for_drain_above_high_water():
+    """ high_water를 넘으면 send가 drain을 기다리고, 그 아래에서는 기다리지 않는지 테스트합니다. """
+    writer = _RecordingWriter()
+    queue = OutboundQueue(writer, high_water=10, low_water=0)
+    await asyncio.wait_for(queue.send(b'\x00' * 8), timeout=1)
+
+    blocked = asyncio.create_task(queue.send(b'\x00' * 12))
+    await asyncio.sleep(0.01)
+    assert not blocked.done() and queue.backpressure_waits == 1
+
+    writer.drained.set()
+    await asyncio.wait_for(blocked, timeout=1)
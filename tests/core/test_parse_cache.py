@@ -0,0 +1,71 @@
+import copy
+
+import pytest
+from secs_simulator.core.models import SecsItem
+from secs_simulator.core.parse_cache import ParseCache
+from secs_simulator.core.secs_parser import SecsDecodeError, parse_body
+
+S1F2_BODY = b'\x01\x02\x41\x04MDLN\x41\x03REV'
+S6F12_BODY = b'\x21\x01\x00'
+
+def test_repeated_body_is_decoded_once():
+    """ 같은 Body는 한 번만 디코딩하고, 최상위 리스트는 조회마다 새로 만드는지 테스트합니다. """
+    calls = []
+
+    def parse(body):
+        calls.append(body)
+        return parse_body(body)
+
+    cache = ParseCache(max_entries=4)
+    first = cache.get_or_parse(S1F2_BODY, parse)
+    second = cache.get_or_parse(bytes(S1F2_BODY), parse)
+
+    assert len(calls) == 1
+    assert first == second == parse_body(S1F2_BODY)
+    assert first is not second
+    assert first[0] is second[0]  # 트리는 공유합니다.
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 0)
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ParseCache(max_entries=2)
+    cache.get_or_parse(S1F2_BODY, parse_body)
+    cache.get_or_parse(S6F12_BODY, parse_body)
+    cache.get_or_parse(S1F2_BODY, parse_body)          # S1F2가 최근 사용으로 갱신됩니다.
+    cache.get_or_parse(b'\x41\x01X', parse_body)       # S6F12가 축출됩니다.
+    cache.get_or_parse(S1F2_BODY, parse_body)
+
+    stats = cache.stats()
+    assert (stats['entries'], stats['hits'], stats['misses'], stats['evictions']) == (2, 2, 3, 1)
+
+def test_large_bodies_and_errors_are_not_cached():
+    cache = ParseCache(max_entries=4, max_body_size=4)
+    cache.get_or_parse(S1F2_BODY, parse_body)
+    assert len(cache) == 0
+
+    def failing_parse(body):
+        raise SecsDecodeError("too deep")
+
+    with pytest.raises(SecsDecodeError):
+        cache.get_or_parse(S6F12_BODY, failing_parse)
+    assert len(cache) == 0
+
+def test_cached_tree_is_read_only_and_copies_are_mutable():
+    """ 캐시된 트리는 변경할 수 없고, deepcopy한 복사본은 일반 SecsItem/list로 변경할 수 있는지 테스트합니다. """
+    cache = ParseCache(max_entries=4)
+    body = cache.get_or_parse(S1F2_BODY, parse_body)
+    with pytest.raises(TypeError):
+        body[0].value.append(SecsItem('A', 'X'))
+    with pytest.raises(TypeError):
+        body[0].value[0].value = 'OTHER'
+
+    copied = copy.deepcopy(body)
+    copied[0].value.append(SecsItem('A', 'X'))
+    copied[0].value[0].value = 'OTHER'
+    assert cache.get_or_parse(S1F2_BODY, parse_body) == parse_body(S1F2_BODY)
+
+def test_truncated_body_is_not_cached():
+    """ 잘려서 일부만 디코딩된 Body의 결과는 캐시하지 않는지 테스트합니다. """
+    cache = ParseCache(max_entries=4)
+    truncated = b'\x01\x02\x41\x01X'   # 자식 2개 중 1개만 있는 L
+    assert cache.get_or_parse(truncated, parse_body) == [SecsItem('L', [SecsItem('A', 'X')])]
+    assert len(cache) == 0
@@ -1,6 +1,9 @@
+import array
+
 import pytest
 from secs_simulator.core.models import SecsItem
-from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.core.secs_builder import build_secs_body, encode_secs_body
+from secs_simulator.core.secs_parser import ARRAY_TYPECODES, parse_body
 
 # 테스트할 데이터: (테스트 이름, 입력 SecsItem 리스트, 예상 결과 바이트) 튜플의 리스트
 SECS_BODY_TEST_CASES = [
@@ -56,3 +59,27 @@ def test_build_body_with_invalid_type_raises_error():
     
     assert "Unknown SECS data type" in str(excinfo.value)
 
+
+@pytest.mark.parametrize("item_type, values", [
+    ('U2', [0, 1, 65535]),
+    ('I4', [-2, 0, 2 ** 31 - 1]),
+    ('F8', [0.5, -1.25]),
+])
+def test_build_numeric_array_from_list_and_array_is_identical(item_type, values):
+    """ 리스트와 array.array 값이 같은 빅엔디언 바이너리로 인코딩되는지 테스트합니다. """
+    typecode = ARRAY_TYPECODES[item_type]
+    from_list = build_secs_body([SecsItem(type=item_type, value=values)])
+    from_array = build_secs_body([SecsItem(type=item_type, value=array.array(typecode, values))])
+    assert from_list == from_array
+    assert parse_body(from_list)[0].value == values
+
+def test_encode_secs_body_accepts_library_dicts_and_reserves_headroom():
+    """ dict 형식을 바로 인코딩하고, headroom만큼 앞쪽을 비운 버퍼를 반환하는지 테스트합니다. """
+    body_dicts = [{'type': 'L', 'value': [{'type': 'A', 'value': 'ITEM1'}, {'type': 'U2', 'value': [100]}]}]
+    expected = b'\x01\x02' + b'\x41\x05ITEM1' + b'\xa9\x02\x00\x64'
+
+    buffer = encode_secs_body(body_dicts, headroom=14)
+    assert isinstance(buffer, bytearray)
+    assert buffer[:14] == bytes(14)
+    assert buffer[14:] == expected
+    assert build_secs_body(body_dicts) == expected
@@ -0,0 +1,49 @@
+import pytest
+from secs_simulator.core.models import SecsItem, SecsMessage
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.core.secs_fingerprint import body_fingerprint, fingerprint_bytes, item_fingerprint
+from secs_simulator.core.secs_parser import parse_body
+
+DICT_BODY = [
+    {"type": "L", "value": [
+        {"type": "U4", "value": [1001, 1002]},
+        {"type": "A", "value": "LOT001"},
+        {"type": "B", "value": [0]},
+    ]}
+]
+
+@pytest.mark.parametrize("options", [{}, {"as_array": True}, {"lazy": True}])
+def test_fingerprint_is_representation_independent(options):
+    """ dict Body, 파싱된 트리, 배열/지연 트리가 원본 바이트와 같은 지문을 갖는지 테스트합니다. """
+    encoded = build_secs_body(DICT_BODY)
+    items = parse_body(encoded, **options)
+    assert body_fingerprint(DICT_BODY) == body_fingerprint(items) == fingerprint_bytes(encoded)
+    assert item_fingerprint(items[0]) == item_fingerprint(DICT_BODY[0])
+
+def test_items_are_structurally_equal_and_keyed_by_fingerprint():
+    encoded = build_secs_body(DICT_BODY)
+    plain, lazy, arrays = parse_body(encoded)[0], parse_body(encoded, lazy=True)[0], parse_body(encoded, as_array=True)[0]
+    assert plain == lazy == arrays
+    # 변경 가능한 아이템은 해시하지 않고, 지문 바이트를 set/dict 키로 씁니다.
+    with pytest.raises(TypeError):
+        hash(plain)
+    assert len({item_fingerprint(item) for item in (plain, lazy, arrays)}) == 1
+    assert SecsItem("U4", [1]) != SecsItem("U2", [1])
+    assert SecsItem("U4", [1]) != SecsItem("U4", [2])
+
+def test_message_fingerprint_is_cached():
+    message = SecsMessage(s=6, f=11, body=parse_body(build_secs_body(DICT_BODY)))
+    first = message.fingerprint()
+    assert first == body_fingerprint(DICT_BODY)
+    assert message.fingerprint() is first
+    assert message.to_dict() == {"s": 6, "f": 11, "w_bit": False, "body": message.body}
+
+def test_message_dict_access_is_limited_to_fields():
+    """ msg['key'] / msg.get('key')가 레코드 필드만 돌려주고, 메서드나 내부 캐시는 없는 키로 취급하는지 테스트합니다. """
+    message = SecsMessage(s=6, f=11, session_id=3)
+    assert (message['s'], message.get('f'), message.get('session_id')) == (6, 11, 3)
+    for key in ('fingerprint', 'to_dict', '_fingerprint', '__class__', 'missing'):
+        with pytest.raises(KeyError):
+            message[key]
+        assert message.get(key) is None
+        assert message.get(key, 'default') == 'default'
@@ -0,0 +1,54 @@
+import io
+import json
+
+import pytest
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.core.secs_json import body_to_dicts, dump_body, dumps_body
+from secs_simulator.core.secs_parser import parse_body
+
+BODY = [
+    {"type": "L", "value": [
+        {"type": "U4", "value": [1001, 1002]},
+        {"type": "A", "value": 'LOT "01"'},
+        {"type": "B", "value": [0, 171]},
+        {"type": "BOOL", "value": [True, False]},
+        {"type": "F8", "value": [0.5]},
+        {"type": "L", "value": []},
+        {"type": "L", "value": [{"type": "I1", "value": [-1]}]},
+    ]},
+    {"type": "U1", "value": []},
+]
+
+def _expected_json() -> str:
+    """ 기존 방식(dict 트리 변환 후 json.dumps)으로 만든 기대 텍스트 """
+    body = json.loads(json.dumps(BODY))
+    body[0]["value"][2]["value"] = "00AB"
+    return json.dumps(body)
+
+def test_dumps_body_keeps_dict_bodies_as_is():
+    """ dict Body는 body_to_dicts처럼 값 리스트를 그대로 출력하는지 테스트합니다. """
+    assert dumps_body(BODY) == json.dumps(BODY)
+
+@pytest.mark.parametrize("source", ["items", "arrays", "lazy", "raw"])
+def test_dumps_body_matches_json_dumps(source):
+    """ 파싱된 트리나 원본 바이트를 넣어도 json.dumps와 같은 텍스트('B'는 hex)를 만드는지 테스트합니다. """
+    encoded = build_secs_body(BODY)
+    body = {
+        "items": parse_body(encoded),
+        "arrays": parse_body(encoded, as_array=True),
+        "lazy": parse_body(encoded, lazy=True),
+        "raw": encoded,
+    }[source]
+    assert dumps_body(body) == _expected_json()
+
+def test_dump_body_writes_in_chunks():
+    fp = io.StringIO()
+    dump_body(build_secs_body(BODY), fp, chunk_size=8)
+    assert fp.getvalue() == _expected_json()
+
+def test_body_to_dicts_hexes_binary_values():
+    dicts = body_to_dicts(parse_body(build_secs_body(BODY)))
+    assert json.dumps(dicts) == _expected_json()
+
+def test_truncated_raw_body_is_closed():
+    assert json.loads(dumps_body(b'\x01\x03\x41\x01X')) == [{"type": "L", "value": [{"type": "A", "value": "X"}]}]
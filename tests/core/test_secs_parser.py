@@ -0,0 +1,154 @@
+import array
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from secs_simulator.core.models import SecsItem
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.core.secs_parser import LazySecsItem, SecsDecodeError, SecsStreamParser, parse_body
+from secs_simulator.parsers.universal_parser import _parse_body as _parse_log_body
+
+LIBRARY_PATH = Path(__file__).resolve().parents[2] / 'generated_assets' / 'Generated_J1FCNV12305_Library_final.json'
+
+# 테스트할 데이터: (테스트 이름, 입력 바이트, 예상 SecsItem 리스트) 튜플의 리스트
+SECS_PARSE_TEST_CASES = [
+    (
+        "Simple_ASCII",
+        b'\x41\x04TEST',
+        [SecsItem(type='A', value='TEST')]
+    ),
+    (
+        "U4_Array",
+        b'\xad\x08\x00\x00\x01\x00\x00\x00\x00\x02',
+        [SecsItem(type='U4', value=[256, 2])]
+    ),
+    (
+        "Nested_List_with_Multiple_Types",
+        b'\x01\x03' + b'\x41\x05ITEM1' + b'\xa9\x02\x00\x64' + b'\x01\x01' + b'\x21\x02\x01\x02',
+        [
+            SecsItem(type='L', value=[
+                SecsItem(type='A', value='ITEM1'),
+                SecsItem(type='U2', value=[100]),
+                SecsItem(type='L', value=[
+                    SecsItem(type='B', value=b'\x01\x02')
+                ])
+            ])
+        ]
+    ),
+    (
+        "Multiple_Top_Level_Items",
+        b'\x25\x01\x01' + b'\x91\x04\xbf\x80\x00\x00',
+        [SecsItem(type='BOOL', value=[True]), SecsItem(type='F4', value=[-1.0])]
+    ),
+]
+
+@pytest.mark.parametrize("test_name, body_bytes, expected_items", SECS_PARSE_TEST_CASES)
+def test_parse_body_with_various_types(test_name, body_bytes, expected_items):
+    """ 바이너리가 올바른 SecsItem 트리로 변환되는지 테스트합니다. """
+    assert parse_body(body_bytes) == expected_items
+
+def test_fast_and_legacy_parsers_agree_on_library_messages():
+    """ memoryview 디코더와 기존 디코더가 실제 라이브러리 메시지에서 같은 결과를 내는지 테스트합니다. """
+    library = json.loads(LIBRARY_PATH.read_text(encoding='utf-8'))
+    for message in library.values():
+        body_bytes = build_secs_body(message['body'])
+        assert parse_body(body_bytes) == parse_body(body_bytes, legacy=True)
+
+def test_parse_body_returns_compact_arrays_for_numeric_items():
+    """ as_array=True이면 숫자 배열이 array.array로, 큰 배열도 같은 값으로 디코딩되는지 테스트합니다. """
+    samples = list(range(0, 4000, 3))
+    body_bytes = build_secs_body([SecsItem(type='U4', value=samples), SecsItem(type='BOOL', value=[True, False])])
+
+    items = parse_body(body_bytes, as_array=True)
+    assert isinstance(items[0].value, array.array)
+    assert items[0].value.tolist() == samples
+    assert items[1].value == [True, False]
+    assert parse_body(body_bytes)[0].value == samples
+
+def test_lazy_parse_decodes_list_children_on_first_access():
+    """ lazy=True이면 'L' 자식이 .value 접근 시점에 디코딩되고, 결과는 즉시 파싱과 같은지 테스트합니다. """
+    body_bytes = SECS_PARSE_TEST_CASES[2][1] + b'\x41\x01X'
+
+    items = parse_body(body_bytes, lazy=True)
+    assert isinstance(items[0], LazySecsItem)
+    assert not items[0].is_decoded
+    assert items[1] == SecsItem(type='A', value='X')
+
+    # 디코딩 전에는 원본 인코딩을 그대로 재사용합니다.
+    assert build_secs_body(items) == body_bytes
+
+    assert items == parse_body(body_bytes)
+    assert items[0].is_decoded
+    assert isinstance(items[0].value[2], LazySecsItem)
+    assert build_secs_body(items) == body_bytes
+
+def test_lazy_parse_validates_nested_boundaries_up_front():
+    """ 지연 파싱이 하위 리스트의 잘린 경계를 생성 시점에 거부하고, 깊은 중첩도 다시 훑지 않고 따라가는지 테스트합니다. """
+    truncated = b'\x01\x02\x01\x02\x41\x01X'   # 안쪽 L의 두 번째 자식이 없습니다.
+    assert parse_body(truncated, lazy=True) == []
+
+    depth = sys.getrecursionlimit() * 3
+    node = parse_body(b'\x01\x01' * depth + b'\xA9\x02\x00\x07', lazy=True, max_depth=None)[0]
+    for _ in range(depth):
+        parent, node = node, node.value[0]
+        assert parent._view is None   # 디코딩한 아이템은 원본 Body를 놓습니다.
+    assert node == SecsItem(type='U2', value=[7])
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+def test_stream_parser_matches_parse_body_for_any_chunking(chunk_size):
+    """ 청크 크기와 관계없이 SecsStreamParser 결과가 parse_body와 같은지 테스트합니다. """
+    body_bytes = b''.join(case[1] for case in SECS_PARSE_TEST_CASES) + b'\x01\x00'
+    parser = SecsStreamParser()
+    items = []
+    for start in range(0, len(body_bytes), chunk_size):
+        items.extend(parser.feed(body_bytes[start:start + chunk_size]))
+    parser.close()
+    assert items == parse_body(body_bytes)
+
+def test_stream_parser_close_rejects_truncated_body():
+    """ 미완성 Body로 close()를 호출하면 SecsDecodeError가 발생하는지 테스트합니다. """
+    parser = SecsStreamParser()
+    assert parser.feed(b'\x01\x02\x41\x01X') == []
+    with pytest.raises(SecsDecodeError):
+        parser.close()
+
+def test_deep_nesting_does_not_use_recursion():
+    """ 재귀 한도보다 깊은 'L' 중첩도 max_depth=None이면 디코딩되는지 테스트합니다. """
+    depth = sys.getrecursionlimit() * 3
+    body_bytes = b'\x01\x01' * depth + b'\xA9\x02\x00\x07'
+    node = parse_body(body_bytes, max_depth=None)[0]
+    for _ in range(depth):
+        assert node.type == 'L'
+        node = node.value[0]
+    assert node == SecsItem(type='U2', value=[7])
+
+@pytest.mark.parametrize("options", [{}, {"lazy": True}])
+def test_decode_limits_raise(options):
+    """ 중첩 깊이/아이템 수 제한을 넘는 Body는 SecsDecodeError로 거부하는지 테스트합니다. """
+    nested = b'\x01\x01' * 5 + b'\x01\x00'
+    assert len(parse_body(nested, max_depth=6, **options)) == 1
+    with pytest.raises(SecsDecodeError):
+        parse_body(nested, max_depth=5, **options)
+
+    wide = b'\x01\x03' + b'\xA5\x01\x01' * 3
+    assert len(parse_body(wide, max_items=4, **options)) == 1
+    with pytest.raises(SecsDecodeError):
+        parse_body(wide, max_items=3, **options)
+
+def test_log_body_parser_enforces_limits():
+    """ 로그 임포트용 Body 파서도 같은 제한을 넘으면 조용히 멈추지 않고 SecsDecodeError로 거부하는지 테스트합니다. """
+    nested = b'\x01\x01' * 5 + b'\x01\x00'
+    assert len(_parse_log_body(nested, max_depth=5)) == 1
+    with pytest.raises(SecsDecodeError):
+        _parse_log_body(nested, max_depth=4)
+
+    u2_array = b'\xA9\x08' + bytes(8)   # 로그 파서는 요소 4개를 아이템 4개로 펼칩니다.
+    assert len(_parse_log_body(u2_array, max_items=4)) == 4
+    with pytest.raises(SecsDecodeError):
+        _parse_log_body(u2_array, max_items=3)
+
+def test_stream_parser_enforces_limits():
+    parser = SecsStreamParser(max_depth=2)
+    with pytest.raises(SecsDecodeError):
+        parser.feed(b'\x01\x01\x01\x01\x01\x01')
@@ -0,0 +1,58 @@
+import pytest
+from secs_simulator.core.models import SecsItem
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.core.secs_parser import parse_body
+from secs_simulator.core.secs_path import compile_path, parse_path
+
+DICT_BODY = [
+    {"type": "L", "value": [
+        {"type": "U4", "value": [1001]},
+        {"type": "U2", "value": [251]},
+        {"type": "L", "value": [
+            {"type": "A", "value": "LOT001"},
+            {"type": "U4", "value": [10, 20]},
+        ]},
+    ]}
+]
+
+@pytest.mark.parametrize("path, expected", [
+    ("0/1", 251),
+    ("0/1/0", 251),
+    ("L[0].U2[1]", 251),
+    ("L[0].L[2].A[0]", "LOT001"),
+    ("0/2/1/1", 20),
+    ("0/2/1", [10, 20]),
+    ("L[0].U4[1]", None),  # 타입 불일치
+    ("0/5", None),         # 인덱스 범위 초과
+])
+def test_string_paths_on_dict_and_item_trees(path, expected):
+    """ 같은 경로가 dict Body, 파싱된 SecsItem, 지연 디코딩 트리에서 같은 값을 반환하는지 테스트합니다. """
+    accessor = compile_path(path)
+    encoded = build_secs_body(DICT_BODY)
+    for body in (DICT_BODY, parse_body(encoded), parse_body(encoded, lazy=True)):
+        value = accessor(body)
+        assert (list(value) if expected == [10, 20] else value) == expected
+
+@pytest.mark.parametrize("path, expected", [
+    ([0, "value", 1, "value"], 251),
+    ([0, "value", 2, "value", 0, "value"], "LOT001"),
+    ([0, "value", 1, "type"], "U2"),
+    ([0, 1], None),
+    ([], DICT_BODY[0]),
+])
+def test_legacy_list_paths(path, expected):
+    """ log_converter 규칙 파일의 리스트 경로 형식이 기존 해석과 같은 결과를 내는지 테스트합니다. """
+    assert compile_path(path)(DICT_BODY) == expected
+
+def test_compiled_paths_are_cached():
+    assert compile_path("0/1/0") is compile_path("0/1/0")
+    assert compile_path([0, "value"]) is compile_path((0, "value"))
+
+def test_invalid_path_raises():
+    with pytest.raises(ValueError):
+        parse_path("0/x/1")
+    assert parse_path("L[0].u4[3]") == [(0, "L"), (3, "U4")]
+
+def test_secs_item_body():
+    body = [SecsItem("L", [SecsItem("B", b"\x00")])]
+    assert compile_path("L[0].B[0]")(body) == 0
@@ -0,0 +1,50 @@
+import pytest
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.core.secs_template import compile_template
+
+LIBRARY_MESSAGE = {
+    "s": 6, "f": 11, "w_bit": True,
+    "body": [
+        {"type": "L", "value": [
+            {"type": "U2", "value": [0]},
+            {"type": "U2", "value": [251], "slot": "CEID"},
+            {"type": "L", "value": [
+                {"type": "A", "value": "LOT001"},
+                {"type": "U4", "value": [10, 20]},
+            ]},
+        ]}
+    ]
+}
+
+def _with_values(ceid, lot_id):
+    """ 슬롯 값을 직접 바꾼 라이브러리 메시지 Body (기대값 계산용) """
+    body = LIBRARY_MESSAGE['body']
+    outer = body[0]['value']
+    return [{"type": "L", "value": [
+        outer[0],
+        {"type": "U2", "value": [ceid]},
+        {"type": "L", "value": [{"type": "A", "value": lot_id}, outer[2]['value'][1]]},
+    ]}]
+
+def test_template_renders_library_defaults():
+    """ 슬롯 값을 주지 않으면 원본 메시지와 같은 바이너리를 만드는지 테스트합니다. """
+    template = compile_template(LIBRARY_MESSAGE)
+    assert (template.s, template.f, template.w_bit) == (6, 11, True)
+    assert template.slot_names == ("CEID",)
+    assert template.render() == build_secs_body(LIBRARY_MESSAGE['body'])
+
+@pytest.mark.parametrize("lot_id", ["LOT999", "A", "A_MUCH_LONGER_LOT_IDENTIFIER"])
+def test_template_patches_named_and_path_slots(lot_id):
+    """ 이름 슬롯과 경로 슬롯 값을 바꿔도(길이가 달라져도) 전체 인코딩과 같은지 테스트합니다. """
+    template = compile_template(LIBRARY_MESSAGE, slots=["0/2/0"])
+    rendered = template.render({"CEID": 300, "0/2/0": lot_id}, headroom=14)
+    assert rendered[:14] == bytes(14)
+    assert rendered[14:] == build_secs_body(_with_values(300, lot_id))
+
+def test_template_rejects_unknown_slots():
+    """ 존재하지 않는 슬롯 이름이나 경로를 사용하면 KeyError가 발생하는지 테스트합니다. """
+    template = compile_template(LIBRARY_MESSAGE)
+    with pytest.raises(KeyError):
+        template.render({"LOTID": "X"})
+    with pytest.raises(KeyError):
+        compile_template(LIBRARY_MESSAGE, slots=["0/9"])
@@ -0,0 +1,45 @@
+import pytest
+from secs_simulator.core.models import SecsMessage
+from secs_simulator.core.transactions import TransactionLimitError, TransactionTable, TransactionTimeout
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_reply_resolves_transaction():
+    """ 같은 System Bytes의 Reply가 Transaction을 완료시키고 테이블에서 제거되는지 테스트합니다. """
+    table = TransactionTable(t3=1.0)
+    transaction = table.open(1, 1, 7)
+
+    reply = SecsMessage(s=1, f=2, w_bit=False, system_bytes=7, body=[])
+    assert table.resolve(reply)
+    assert await transaction is reply
+    assert len(table) == 0 and not table.resolve(reply)
+
+
+async def test_t3_expiry_fails_transaction_and_calls_on_timeout():
+    """ T3 안에 Reply가 없으면 TransactionTimeout으로 실패하고 on_timeout이 호출되는지 테스트합니다. """
+    expired = []
+    table = TransactionTable(t3=0.01, on_timeout=expired.append)
+    transaction = table.open(6, 11, 3)
+
+    with pytest.raises(TransactionTimeout):
+        await transaction
+    assert expired == [transaction]
+    assert table.stats()['timed_out'] == 1 and 3 not in table
+
+
+async def test_outstanding_limit_and_fail_all():
+    """ 상한을 넘는 Transaction은 거부되고, fail_all이 열린 Transaction을 모두 실패시키는지 테스트합니다. """
+    table = TransactionTable(t3=None, max_outstanding=2)
+    first = table.open(1, 1, 1)
+    with pytest.raises(ValueError):
+        table.open(1, 1, 1)
+    second = table.open(1, 1, 2)
+    with pytest.raises(TransactionLimitError):
+        table.open(1, 1, 3)
+
+    table.fail_all(ConnectionError("closed"))
+    for transaction in (first, second):
+        with pytest.raises(ConnectionError):
+            await transaction
+    assert len(table) == 0
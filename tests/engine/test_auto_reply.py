@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from secs_simulator.core.models import SecsMessage
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.core.secs_parser import parse_body
+from secs_simulator.engine.auto_reply import AutoReplyTable
+from secs_simulator.engine.device_agent import DeviceAgent
+
+pytestmark = pytest.mark.asyncio
+
+LIBRARY = {
+    "S1F2_OnLineData": {"s": 1, "f": 2, "w_bit": False, "body": [
+        {"type": "L", "value": [{"type": "A", "value": "SECS-SIM"}, {"type": "A", "value": "1.0"}]}]},
+    "S2F42_Ack": {"s": 2, "f": 42, "w_bit": False, "body": [
+        {"type": "L", "value": [{"type": "B", "value": [0]}, {"type": "L", "value": []}]}]},
+    "S2F42_Invalid": {"s": 2, "f": 42, "w_bit": False, "body": [
+        {"type": "L", "value": [{"type": "B", "value": [1]}, {"type": "L", "value": []}]}]},
+}
+
+RULES = [
+    {"s": 1, "f": 1, "reply": "S1F2_OnLineData"},
+    {"s": 2, "f": 41, "when": {"0/0": "START"}, "reply": "S2F42_Ack"},
+    {"s": 2, "f": 41, "reply": "S2F42_Invalid"},
+    {"s": 1, "f": 3, "reply": {"s": 1, "f": 4, "body": [{"type": "L", "value": []}]},
+     "items": {"from": "0", "default": {"type": "U4", "value": [0]}}},
+]
+
+
+def _s2f41(rcmd: str) -> SecsMessage:
+    body = parse_body(build_secs_body([{"type": "L", "value": [{"type": "A", "value": rcmd}, {"type": "L", "value": []}]}]))
+    return SecsMessage(s=2, f=41, w_bit=True, body=body)
+
+
+async def test_lookup_selects_rule_by_stream_function_and_conditions():
+    """ (S, F)로 규칙을 찾고, 같은 (S, F) 안에서는 조건에 맞는 첫 규칙을 고르는지 테스트합니다. """
+    table = AutoReplyTable.from_rules(RULES, LIBRARY)
+    assert len(table) == 4
+
+    online = table.lookup(SecsMessage(s=1, f=1, w_bit=True, body=[]))
+    assert (online.reply_s, online.reply_f, online.message_id) == (1, 2, "S1F2_OnLineData")
+    # 응답 Body는 로드할 때 인코딩해 둔 바이트입니다.
+    assert online.body == build_secs_body(LIBRARY["S1F2_OnLineData"]["body"])
+
+    assert table.lookup(_s2f41("START")).message_id == "S2F42_Ack"
+    assert table.lookup(_s2f41("STOP")).message_id == "S2F42_Invalid"
+    assert table.lookup(SecsMessage(s=5, f=1, w_bit=True, body=[])) is None
+
+
+def _list_request(s: int, f: int, ids: list) -> SecsMessage:
+    body = parse_body(build_secs_body([{"type": "L", "value": [{"type": "U4", "value": [i]} for i in ids]}]))
+    return SecsMessage(s=s, f=f, w_bit=True, body=body)
+
+
+async def test_items_reply_has_one_item_per_requested_id():
+    """ "items" 규칙이 요청한 ID 개수만큼 값 표(없으면 기본 아이템)의 아이템을 담은 L로 응답하는지 테스트합니다. """
+    library = {"S1F4_SelectedStatusData": {"s": 1, "f": 4, "w_bit": False, "body": [{"type": "L", "value": []}]}}
+    rules = [{"s": 1, "f": 3, "reply": "S1F4_SelectedStatusData", "items": {
+        "from": "0",
+        "values": {"1": {"type": "U1", "value": [5]}, "2": {"type": "A", "value": "LOT01"}},
+        "default": {"type": "L", "value": []}}}]
+    rule = AutoReplyTable.from_rules(rules, library).lookup(_list_request(1, 3, []))
+
+    assert rule.render(_list_request(1, 3, [2, 99, 1])) == build_secs_body([{"type": "L", "value": [
+        {"type": "A", "value": "LOT01"}, {"type": "L", "value": []}, {"type": "U1", "value": [5]}]}])
+    # 빈 요청은 값 표 전체를 응답합니다.
+    assert rule.render(_list_request(1, 3, [])) == build_secs_body([{"type": "L", "value": [
+        {"type": "U1", "value": [5]}, {"type": "A", "value": "LOT01"}]}])
+
+
+async def test_unknown_library_message_is_rejected():
+    """ 라이브러리에 없는 메시지 ID를 참조하는 규칙은 ValueError로 거부하는지 테스트합니다. """
+    with pytest.raises(ValueError):
+        AutoReplyTable.from_rules([{"s": 1, "f": 1, "reply": "S1F2_Missing"}], LIBRARY)
+
+
+async def test_repo_rules_load_for_every_device_type():
+    """ resources/reply_rules의 규칙 파일이 각 장비 타입의 메시지 라이브러리로 모두 해석되는지 테스트합니다. """
+    for device_type in ("CV", "CV1", "Stocker"):
+        table = AutoReplyTable.load(device_type)
+        assert table is not None and len(table) > 0
+    assert AutoReplyTable.load("NoSuchType") is None
+
+
+async def test_agent_replies_with_library_messages():
+    """ 규칙 표를 가진 장비 에이전트가 라이브러리의 Secondary로 응답하고, 규칙이 없는 요청은 F+1 ACK로 응답하는지 테스트합니다. """
+    table = AutoReplyTable.from_rules(RULES, LIBRARY)
+    equipment = DeviceAgent("EQ", "127.0.0.1", 0, AsyncMock(), connection_mode="Passive", auto_replies=table)
+    await equipment.start()
+    for _ in range(100):
+        if equipment._server is not None:
+            break
+        await asyncio.sleep(0.01)
+    port = equipment._server.sockets[0].getsockname()[1]
+    host = DeviceAgent("HOST", "127.0.0.1", port, AsyncMock(), connection_mode="Active")
+    await host.start()
+    try:
+        assert await host._wait_for_ready(timeout=5)
+
+        online = await asyncio.wait_for(await host.send_request(1, 1), timeout=5)
+        assert (online.s, online.f) == (1, 2)
+        assert [item.value for item in online.body[0].value] == ["SECS-SIM", "1.0"]
+
+        start_body = [{"type": "L", "value": [{"type": "A", "value": "START"}, {"type": "L", "value": []}]}]
+        stop_body = [{"type": "L", "value": [{"type": "A", "value": "STOP"}, {"type": "L", "value": []}]}]
+        accepted = await asyncio.wait_for(await host.send_request(2, 41, start_body), timeout=5)
+        rejected = await asyncio.wait_for(await host.send_request(2, 41, stop_body), timeout=5)
+        assert accepted.body[0].value[0].value == b"\x00"
+        assert rejected.body[0].value[0].value == b"\x01"
+
+        status_data = await asyncio.wait_for(await host.send_request(1, 3, [{"type": "L", "value": [
+            {"type": "U4", "value": [1]}, {"type": "U4", "value": [2]}]}]), timeout=5)
+        assert (status_data.s, status_data.f, len(status_data.body[0].value)) == (1, 4, 2)
+
+        fallback = await asyncio.wait_for(await host.send_request(1, 13), timeout=5)
+        assert (fallback.s, fallback.f) == (1, 14)
+    finally:
+        await host.stop()
+        await equipment.stop()
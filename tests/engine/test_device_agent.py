@@ -42,3 +42,95 @@ async def test_device_agent_start_calls_start_server_correctly():
         # - 상태 콜백이 "Listening" 메시지와 함께 호출되었는지 확인합니다.
         mock_callback.assert_awaited_with("test_device", "Listening on localhost:5000")
 
+
+async def _start_selected_pair():
+    """루프백으로 Passive 장비와 Active 호스트 에이전트를 연결하고 Select까지 기다립니다."""
+    equipment = DeviceAgent("EQ", "127.0.0.1", 0, AsyncMock(), connection_mode="Passive")
+    await equipment.start()
+    for _ in range(100):
+        if equipment._server is not None:
+            break
+        await asyncio.sleep(0.01)
+    port = equipment._server.sockets[0].getsockname()[1]
+    host = DeviceAgent("HOST", "127.0.0.1", port, AsyncMock(), connection_mode="Active")
+    await host.start()
+    assert await host._wait_for_ready(timeout=5)
+    return equipment, host
+
+
+async def test_send_message_uses_direct_path_when_ready():
+    """ 연결이 준비되어 있으면 명령 큐를 거치지 않고 호출한 태스크에서 바로 전송하고 지연 시간을 기록하는지 테스트합니다. """
+    equipment, host = await _start_selected_pair()
+    try:
+        frames_before = host._connection.outbound.queue_depth
+        await host.send_message(1, 13, False, [{'type': 'L', 'value': []}])
+        # send_message가 반환될 때 이미 프레임이 송신 큐에 들어가 있습니다.
+        assert host._connection.outbound.queue_depth == frames_before + 1
+        stats = host.send_stats()
+        assert (stats['direct_sends'], stats['queued_sends'], stats['queued_commands']) == (1, 0, 0)
+        assert stats['latency_count'] == 1 and stats['latency_max_ms'] > 0
+        assert (await equipment.wait_for_message(1, 13, timeout=2)) is not None
+    finally:
+        await host.stop()
+        await equipment.stop()
+
+
+async def test_queued_commands_keep_order_ahead_of_direct_sends():
+    """ 큐에 명령이 남아 있으면 이후 전송도 큐를 거쳐, 먼저 요청한 메시지가 먼저 전송되는지 테스트합니다. """
+    equipment, host = await _start_selected_pair()
+    try:
+        host._connection.is_selected = False  # 연결 준비 전에 들어온 명령처럼 큐에 넣게 합니다.
+        await host._submit_command(host._send_command(1, 13, False, [], 1))
+        host._connection.is_selected = True
+        await host.send_message(1, 15, False, [])
+
+        # 나중에 요청한 S1F15를 받았을 때 S1F13은 이미 도착해 히스토리에 있어야 합니다.
+        assert (await equipment.wait_for_message(1, 15, timeout=2)) is not None
+        assert equipment._waiters.take_from_history(1, 13) is not None
+        assert host.send_stats()['queued_sends'] == 2 and host._queued_commands == 0
+    finally:
+        await host.stop()
+        await equipment.stop()
+
+
+async def test_auto_reply_does_not_block_receive_loop_on_backpressure():
+    """ 송신 버퍼가 high watermark를 넘어 drain이 끝나지 않아도, 수신 루프의 자동 응답은 기다리지 않고 이후 요청도 처리하는지 테스트합니다. """
+    equipment, host = await _start_selected_pair()
+    try:
+        outbound = equipment._connection.outbound
+        outbound.high_water = 0  # 모든 송신이 백프레셔 상태인 것처럼
+        stuck = asyncio.get_running_loop().create_future()
+        outbound.writer.drain = lambda: stuck  # 상대가 읽지 않아 drain이 끝나지 않는 상황
+
+        for f in (1, 3):
+            reply = await asyncio.wait_for(await host.send_request(1, f), timeout=2)
+            assert (reply.s, reply.f) == (1, f + 1)
+        assert outbound.backpressure_waits == 0
+    finally:
+        await host.stop()
+        await equipment.stop()
+
+
+async def test_send_failure_is_reported_instead_of_raised():
+    """ 전송이 실패한(Body 값 오류) 요청의 Reply를 기다리면 예외 대신 원인과 함께 실패로 알리는지 테스트합니다. """
+    from secs_simulator.engine.orchestrator import Orchestrator
+
+    equipment, host = await _start_selected_pair()
+    try:
+        bad_body = [{'type': 'U4', 'value': ['not-a-number']}]
+        transaction = await host.send_request(1, 3, bad_body)
+        assert await host.wait_for_message(1, 4, reply_to_system_bytes=transaction.system_bytes, timeout=1) is None
+
+        status_callback = AsyncMock()
+        orchestrator = Orchestrator(status_callback=status_callback)
+        orchestrator._agents = {"HOST": host}
+        orchestrator.run_scenario({"name": "Bad body", "steps": [
+            {"device_id": "HOST", "message": {"s": 1, "f": 3, "w_bit": True, "body": bad_body}},
+            {"device_id": "HOST", "wait_recv": {"s": 1, "f": 4}},
+        ]})
+        await asyncio.wait_for(orchestrator._scenario_task, timeout=5)
+        failures = [call.args[1] for call in status_callback.await_args_list if call.args[2] == "red"]
+        assert len(failures) == 1 and "Scenario FAIL" in failures[0] and "send failed" in failures[0]
+    finally:
+        await host.stop()
+        await equipment.stop()
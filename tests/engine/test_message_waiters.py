@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+import pytest
+
+from secs_simulator.core.models import SecsItem, SecsMessage
+from secs_simulator.core.secs_builder import build_secs_body
+from secs_simulator.engine.message_waiters import MessageWaiters, OverflowPolicy
+
+pytestmark = pytest.mark.asyncio
+
+
+def _message(s: int, f: int, system_bytes: int = 0, ceid: int = 0) -> SecsMessage:
+    return SecsMessage(s=s, f=f, system_bytes=system_bytes, body=[SecsItem('U4', [ceid])])
+
+
+async def test_waiter_receives_message_without_polling():
+    """ 등록된 대기자가 수신 즉시 메시지를 받고, 다른 S/F 메시지는 히스토리에 순서대로 남는지 테스트합니다. """
+    waiters = MessageWaiters()
+    task = asyncio.create_task(waiters.wait(6, 11, timeout=1))
+    await asyncio.sleep(0)
+
+    assert waiters.dispatch(_message(5, 1, 1)) is False
+    assert waiters.dispatch(_message(6, 11, 2)) is True
+    assert (await task).system_bytes == 2
+    assert waiters.dispatch(_message(5, 1, 3)) is False
+    assert [waiters.take_from_history(5, 1).system_bytes for _ in range(2)] == [1, 3]
+    assert waiters.stats() == {'waiters': 0, 'history': 0, 'history_bytes': 0, 'dispatched': 1, 'dropped': 0,
+                               'dropped_bytes': 0, 'spilled': 0, 'spilled_bytes': 0, 'journal_errors': 0}
+
+
+@pytest.mark.parametrize("arrived_first", [False, True])
+async def test_predicate_selects_matching_message(arrived_first):
+    """ predicate에 맞는 메시지만 전달되며, 먼저 도착해 히스토리에 있던 메시지도 매칭되는지 테스트합니다. """
+    waiters = MessageWaiters()
+    wanted = lambda message: message.body[0].value == [300]
+    if arrived_first:
+        waiters.dispatch(_message(6, 11, 1, ceid=100))
+        waiters.dispatch(_message(6, 11, 2, ceid=300))
+        message = await waiters.wait(6, 11, wanted, timeout=1)
+    else:
+        task = asyncio.create_task(waiters.wait(6, 11, wanted, timeout=1))
+        await asyncio.sleep(0)
+        waiters.dispatch(_message(6, 11, 1, ceid=100))
+        waiters.dispatch(_message(6, 11, 2, ceid=300))
+        message = await task
+    assert message.system_bytes == 2
+    assert waiters.history_size == 1 and waiters.take_from_history(6, 11).system_bytes == 1
+
+
+async def test_waiters_are_served_in_order_and_timeouts_are_removed():
+    """ 같은 메시지를 기다리는 대기자는 등록 순서대로 받고, 타임아웃된 대기자는 레지스트리에서 제거되는지 테스트합니다. """
+    waiters = MessageWaiters()
+    with pytest.raises(asyncio.TimeoutError):
+        await waiters.wait(1, 1, timeout=0.01)
+    assert waiters.pending() == 0
+
+    first = asyncio.create_task(waiters.wait(1, 1, timeout=1))
+    second = asyncio.create_task(waiters.wait(1, 1, timeout=1))
+    await asyncio.sleep(0)
+    waiters.dispatch(_message(1, 1, 10))
+    waiters.dispatch(_message(1, 1, 11))
+    assert ((await first).system_bytes, (await second).system_bytes) == (10, 11)
+
+
+async def test_history_is_bounded():
+    """ 히스토리가 가득 차면 가장 오래된 메시지부터 버리고 dropped로 집계하는지 테스트합니다. """
+    waiters = MessageWaiters(history_size=3)
+    for system_bytes in range(5):
+        waiters.dispatch(_message(5, 1, system_bytes))
+    assert waiters.history_size == 3 and waiters.dropped == 2
+    assert waiters.take_from_history(5, 1).system_bytes == 2
+
+
+async def test_drop_newest_keeps_oldest_messages():
+    """ drop-newest 정책에서는 히스토리에 있던 메시지를 유지하고 새로 온 메시지를 버리는지 테스트합니다. """
+    waiters = MessageWaiters(history_size=2, overflow_policy="drop-newest")
+    for system_bytes in range(4):
+        waiters.dispatch(_message(5, 1, system_bytes))
+    assert [waiters.take_from_history(5, 1).system_bytes for _ in range(2)] == [0, 1]
+    assert waiters.dropped == 2
+
+
+async def test_history_bytes_are_capped():
+    """ max_bytes를 주면 인코딩 기준 Body 크기로 히스토리를 제한하고, 버린 바이트 수를 집계하는지 테스트합니다. """
+    size = len(build_secs_body([{'type': 'U4', 'value': [0]}]))
+    waiters = MessageWaiters(history_size=100, max_bytes=size * 3)
+    for system_bytes in range(5):
+        waiters.dispatch(_message(5, 1, system_bytes))
+    assert waiters.history_size == 3 and waiters.history_bytes == size * 3
+    assert (waiters.dropped, waiters.dropped_bytes) == (2, size * 2)
+
+    waiters.take_from_history(5, 1)
+    assert waiters.history_bytes == size * 2
+
+
+async def test_spill_to_journal_writes_evicted_messages(tmp_path):
+    """ spill-to-journal 정책에서 밀려난 메시지가 저널 파일에 JSON Lines로 기록되는지 테스트합니다. """
+    journal = tmp_path / "journal" / "EQ.jsonl"
+    waiters = MessageWaiters(history_size=1, overflow_policy=OverflowPolicy.SPILL_TO_JOURNAL, journal_path=str(journal))
+    for system_bytes in range(3):
+        waiters.dispatch(_message(6, 11, system_bytes, ceid=system_bytes * 100))
+    await waiters.close()
+
+    records = [json.loads(line) for line in journal.read_text(encoding='utf-8').splitlines()]
+    assert [(record['system_bytes'], record['body']) for record in records] == [
+        (0, [{'type': 'U4', 'value': [0]}]), (1, [{'type': 'U4', 'value': [100]}])]
+    assert (waiters.spilled, waiters.dropped, waiters.history_size) == (2, 0, 1)
+
+    with pytest.raises(ValueError):
+        MessageWaiters(overflow_policy="spill-to-journal")
+
+
+async def test_journal_errors_are_counted_not_raised(tmp_path):
+    """ 저널 디렉터리에 쓸 수 없어도 dispatch()는 예외 없이 끝나고, 쓰지 못한 메시지를 journal_errors로 집계하는지 테스트합니다. """
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    waiters = MessageWaiters(history_size=0, overflow_policy="spill-to-journal",
+                             journal_path=str(blocker / "EQ.jsonl"))
+    for system_bytes in range(3):
+        assert waiters.dispatch(_message(6, 11, system_bytes)) is False
+    await waiters.close()
+    assert (waiters.spilled, waiters.journal_errors) == (3, 3)
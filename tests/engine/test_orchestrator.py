@@ -80,4 +80,126 @@ async def test_orchestrator_runs_scenario_realistically(mock_device_agents, scen
     expected_stk_msg = scenario_manager.get_message_body("Stocker", "S5F1_AlarmReport")
     stk_agent.send_message.assert_awaited_once_with(
         s=expected_stk_msg['s'], f=expected_stk_msg['f'], body=expected_stk_msg['body']
-    )
\ No newline at end of file
+    )
+
+async def test_load_device_configs_creates_virtual_devices(tmp_path):
+    """ 'parent' 설정이 있는 장비가 부모 에이전트의 연결을 공유하는 가상 장비로 생성되는지 테스트합니다. """
+    from secs_simulator.engine.virtual_device import VirtualDevice
+    import json
+
+    config_path = tmp_path / "devices.json"
+    config_path.write_text(json.dumps({
+        "PM1": {"parent": "CLUSTER", "session_id": 1, "type": "CV"},
+        "CLUSTER": {"host": "127.0.0.1", "port": 5001, "type": "CV"},
+        "ORPHAN": {"parent": "MISSING", "session_id": 2, "type": "CV"},
+        "NO_SESSION": {"parent": "CLUSTER", "type": "CV"},
+    }))
+    orchestrator = Orchestrator(AsyncMock())
+    orchestrator.load_device_configs(str(config_path))
+
+    pm1 = orchestrator._agents["PM1"]
+    assert isinstance(pm1, VirtualDevice)
+    assert pm1.parent is orchestrator._agents["CLUSTER"] and pm1.session_id == 1
+    assert "ORPHAN" not in orchestrator._agents
+    assert "NO_SESSION" not in orchestrator._agents  # session_id가 없는 가상 장비는 설정 오류입니다.
+
+async def test_slots_step_resolves_named_slots(tmp_path):
+    """ 라이브러리의 "slot" 태그로 정의된 이름 슬롯과 경로 슬롯을 함께 쓰는 스텝이 렌더링되어 전송되는지 테스트합니다. """
+    import json
+    from secs_simulator.core.secs_builder import build_secs_body
+
+    (tmp_path / "CV.json").write_text(json.dumps({
+        "S6F11_Event": {"s": 6, "f": 11, "w_bit": False, "body": [{"type": "L", "value": [
+            {"type": "U4", "value": [0]},
+            {"type": "U4", "value": [0], "slot": "CEID"},
+            {"type": "A", "value": "LOT0"},
+        ]}]}
+    }))
+    device_configs = {"CV_01": {"host": "127.0.0.1", "port": 5001, "type": "CV"}}
+    orchestrator = Orchestrator(status_callback=AsyncMock())
+    orchestrator._device_configs = device_configs
+    orchestrator.scenario_manager = ScenarioManager(device_configs, message_library_dir=str(tmp_path))
+    agent = AsyncMock()
+    orchestrator._agents = {"CV_01": agent}
+
+    orchestrator.run_scenario({"name": "Slots", "steps": [
+        {"device_id": "CV_01", "message_id": "S6F11_Event", "slots": {"CEID": 251, "0/2": "LOT1"}},
+    ]})
+    await orchestrator._scenario_task
+
+    sent = agent.send_message.await_args.kwargs
+    assert (sent['s'], sent['f']) == (6, 11)
+    assert bytes(sent['body']) == build_secs_body([{"type": "L", "value": [
+        {"type": "U4", "value": [0]}, {"type": "U4", "value": [251]}, {"type": "A", "value": "LOT1"}]}])
+
+async def test_delete_device_removes_its_virtual_devices(tmp_path):
+    """ 부모 장비를 삭제하면 그 연결을 쓰던 가상 장비도 정지되어 부모에서 분리되고 설정에서 삭제되는지 테스트합니다. """
+    import json
+
+    config_path = tmp_path / "devices.json"
+    config_path.write_text(json.dumps({
+        "CLUSTER": {"host": "127.0.0.1", "port": 5001, "type": "CV"},
+        "PM1": {"parent": "CLUSTER", "session_id": 1, "type": "CV"},
+        "OTHER": {"host": "127.0.0.1", "port": 5002, "type": "CV"},
+    }))
+    orchestrator = Orchestrator(AsyncMock())
+    orchestrator.load_device_configs(str(config_path))
+    cluster, pm1 = orchestrator._agents["CLUSTER"], orchestrator._agents["PM1"]
+    await pm1.start()
+    assert cluster.virtual_devices
+
+    assert await orchestrator.delete_device("CLUSTER")
+    assert cluster.virtual_devices == {}
+    assert set(orchestrator._agents) == {"OTHER"}
+    assert set(json.loads(config_path.read_text())) == {"OTHER"}
+
+async def test_wait_recv_checks_reply_stream_function():
+    """ wait_recv 스텝이 Reply의 S/F를 검사하고, 한 번 기다린 요청은 다시 기다리지 않는지 테스트합니다. """
+    from types import SimpleNamespace
+    from secs_simulator.core.models import SecsMessage
+
+    def transaction(reply):
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(reply)
+        return SimpleNamespace(future=future, system_bytes=7)
+
+    status_callback = AsyncMock()
+    orchestrator = Orchestrator(status_callback=status_callback)
+    agent = AsyncMock()
+    orchestrator._agents = {"CV_01": agent}
+    request = {"device_id": "CV_01", "message": {"s": 1, "f": 1, "w_bit": True}}
+    wait = {"device_id": "CV_01", "wait_recv": {"s": 1, "f": 2}}
+
+    agent.send_request.return_value = transaction(SecsMessage(s=1, f=2))
+    orchestrator.run_scenario({"name": "Reply", "steps": [request, wait, wait]})
+    await orchestrator._scenario_task
+    failures = [call.args[1] for call in status_callback.await_args_list if call.args[2] == "red"]
+    assert len(failures) == 1 and "no prior request" in failures[0]
+
+    status_callback.reset_mock()
+    agent.send_request.return_value = transaction(SecsMessage(s=1, f=0))
+    orchestrator.run_scenario({"name": "Abort", "steps": [request, wait]})
+    await orchestrator._scenario_task
+    failures = [call.args[1] for call in status_callback.await_args_list if call.args[2] == "red"]
+    assert len(failures) == 1 and "received S1F0" in failures[0]
+
+async def test_edit_device_keeps_going_when_children_cannot_be_recreated(tmp_path):
+    """ 부모 설정을 잘못 바꿔도 edit_device가 예외로 끝나지 않고, 자식 가상 장비는 만들 수 있을 때만 다시 만드는지 테스트합니다. """
+    import json
+
+    config_path = tmp_path / "devices.json"
+    config_path.write_text(json.dumps({
+        "CLUSTER": {"host": "127.0.0.1", "port": 5001, "type": "CV"},
+        "PM1": {"parent": "CLUSTER", "session_id": 1, "type": "CV"},
+        "OTHER": {"host": "127.0.0.1", "port": 5002, "type": "CV"},
+    }))
+    orchestrator = Orchestrator(AsyncMock())
+    orchestrator.load_device_configs(str(config_path))
+
+    # 존재하지 않는 부모: 새 에이전트를 만들지 못하므로 자식 설정은 그대로입니다.
+    assert not await orchestrator.edit_device("CLUSTER", "CLUSTER", {"parent": "MISSING", "session_id": 3, "type": "CV"})
+    assert orchestrator._device_configs["PM1"]["parent"] == "CLUSTER"
+
+    # 가상 장비가 된 부모: 자식은 다시 만들 수 없으므로 에이전트 목록에서 빠집니다.
+    assert await orchestrator.edit_device("CLUSTER", "CLUSTER", {"parent": "OTHER", "session_id": 3, "type": "CV"})
+    assert "PM1" not in orchestrator._agents
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from secs_simulator.core.models import SecsMessage
+from secs_simulator.core.transactions import TransactionTable
+from secs_simulator.engine.device_agent import DeviceAgent
+from secs_simulator.engine.pipeline import PipelineStats
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_pipeline_stats_counts_outcomes():
+    """ 완료/T3 만료/실패한 Transaction이 각각 집계되고 지연 시간 백분위수가 계산되는지 테스트합니다. """
+    table = TransactionTable(t3=0.01)
+    stats = PipelineStats(window=4)
+    transactions = [table.open(1, 1, system_bytes) for system_bytes in range(3)]
+    for transaction in transactions:
+        stats.on_sent()
+        transaction.future.add_done_callback(lambda _, t=transaction: stats.on_done(t))
+
+    table.resolve(SecsMessage(s=1, f=2, w_bit=False, system_bytes=0, body=[]))
+    table.discard(1, ConnectionError("closed"))
+    await asyncio.sleep(0.05)  # 2번은 T3 만료
+    stats.finish()
+
+    summary = stats.summary()
+    assert (summary['sent'], summary['completed'], summary['failed'], summary['timed_out']) == (3, 1, 1, 1)
+    assert summary['max_in_flight'] == 3
+    assert 0 < stats.percentile(0.5) == stats.percentile(0.99)
+
+
+async def test_send_pipelined_keeps_window_of_requests_in_flight():
+    """ send_pipelined가 window 크기만큼 요청을 겹쳐 보내고 모든 Reply를 System Bytes로 매칭하는지 테스트합니다. """
+    equipment = DeviceAgent("EQ", "127.0.0.1", 0, AsyncMock(), connection_mode="Passive")
+    host = None
+    try:
+        await equipment.start()
+        for _ in range(100):
+            if equipment._server is not None:
+                break
+            await asyncio.sleep(0.01)
+        port = equipment._server.sockets[0].getsockname()[1]
+
+        host = DeviceAgent("HOST", "127.0.0.1", port, AsyncMock(), connection_mode="Active")
+        await host.start()
+
+        stats = await asyncio.wait_for(
+            host.send_pipelined(1, 3, [{'type': 'L', 'value': []}], count=200, window=8), timeout=10)
+        assert (stats.sent, stats.completed, stats.timed_out, stats.failed) == (200, 200, 0, 0)
+        assert 1 < stats.max_in_flight <= 8
+        assert len(host._connection.transactions) == 0
+    finally:
+        if host is not None:
+            await host.stop()
+        await equipment.stop()
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from secs_simulator.engine.status_events import StatusCode, StatusEvents
+from secs_simulator.engine.timer_wheel import TimerWheel
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_events_are_coalesced_per_device():
+    """ 주기 안에 들어온 이벤트는 장비마다 마지막 것 하나로 알리고, 덮어쓴 건수를 집계하는지 테스트합니다. """
+    callback = AsyncMock()
+    wheel = TimerWheel(tick=0.01)
+    events = StatusEvents(callback, wheel, interval=0.05)
+    try:
+        for system_bytes in range(1, 1001):
+            events.post("EQ", StatusCode.SENT, 6, 11, system_bytes)
+        events.post("HOST", StatusCode.RECEIVED, 6, 11, 7)
+        callback.assert_not_awaited()
+
+        await asyncio.sleep(0.2)
+        assert [call.args for call in callback.await_args_list] == [
+            ("EQ", "Sent S6F11 (SB=1000) [+999 coalesced]", "green"),
+            ("HOST", "Received S6F11 (SB=7)", "green"),
+        ]
+        assert events.stats() == {'posted': 1001, 'coalesced': 999, 'flushes': 1, 'pending_devices': 0}
+        assert events.counts("EQ") == {'Sent': 1000, 'Received': 0, 'Reply': 0}
+    finally:
+        await wheel.stop()
+
+
+async def test_flush_device_emits_pending_event_first():
+    """ flush_device가 쌓인 이벤트를 바로 알리고, 예약된 flush에서 다시 알리지 않는지 테스트합니다. """
+    callback = AsyncMock()
+    wheel = TimerWheel(tick=0.01)
+    events = StatusEvents(callback, wheel, interval=0.05)
+    try:
+        events.post("EQ", StatusCode.REPLY_RECEIVED, 1, 2, 3)
+        await events.flush_device("EQ")
+        callback.assert_awaited_once_with("EQ", "Received S1F2 (reply to SB=3)", "green")
+
+        await asyncio.sleep(0.1)
+        assert callback.await_count == 1
+    finally:
+        await wheel.stop()
+
+
+async def test_flush_device_during_periodic_flush():
+    """ 주기 flush가 다른 장비의 콜백에서 양보하는 동안 flush_device를 호출해도 오류 없이 한 번씩만 알리는지 테스트합니다. """
+    reported = []
+
+    async def slow_callback(device_id, status, color):
+        await asyncio.sleep(0.01)
+        reported.append((device_id, status))
+
+    wheel = TimerWheel(tick=0.01)
+    events = StatusEvents(slow_callback, wheel, interval=60)
+    try:
+        events.post("EQ", StatusCode.SENT, 6, 11, 1)
+        events.post("HOST", StatusCode.RECEIVED, 6, 11, 1)
+        periodic = asyncio.create_task(events.flush())
+        await asyncio.sleep(0)  # flush가 EQ 콜백에서 양보하는 중
+        await events.flush_device("HOST")
+        await periodic
+        assert sorted(reported) == [("EQ", "Sent S6F11 (SB=1)"), ("HOST", "Received S6F11 (SB=1)")]
+    finally:
+        await wheel.stop()
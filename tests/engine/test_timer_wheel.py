@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from secs_simulator.engine.timer_wheel import TimerWheel
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_timers_fire_in_deadline_order_and_cancel():
+    """ 예약한 타이머가 deadline 순서로 실행되고, 취소한 타이머는 실행되지 않는지 테스트합니다. """
+    wheel = TimerWheel(tick=0.01, slots=8)
+    fired = []
+    for delay, name in [(0.05, 'b'), (0.02, 'a'), (0.15, 'c')]:  # 'c'는 휠 한 바퀴(0.08초)보다 깁니다.
+        wheel.schedule(delay, fired.append, name)
+    wheel.schedule(0.03, fired.append, 'cancelled').cancel()
+
+    await asyncio.sleep(0.25)
+    assert fired == ['a', 'b', 'c']
+    assert wheel.pending == 0 and not wheel.is_running
+
+
+async def test_coroutine_callback_runs_as_task_and_can_reschedule():
+    """ 코루틴을 반환하는 콜백은 태스크로 실행되고, 콜백 안에서 다시 예약할 수 있는지 테스트합니다. """
+    wheel = TimerWheel(tick=0.01)
+    ticks = []
+
+    async def repeat(count):
+        ticks.append(count)
+        if count < 3:
+            wheel.schedule(0.01, repeat, count + 1)
+
+    wheel.schedule(0.01, repeat, 1)
+    await asyncio.sleep(0.2)
+    assert ticks == [1, 2, 3]
+    assert wheel.stats()['fired'] == 3
+
+
+async def test_stop_discards_pending_timers():
+    """ stop()이 틱 태스크를 멈추고 남은 타이머를 버리는지 테스트합니다. """
+    wheel = TimerWheel(tick=0.01)
+    fired = []
+    wheel.schedule(0.05, fired.append, 'late')
+    await wheel.stop()
+    await asyncio.sleep(0.1)
+    assert fired == [] and wheel.pending == 0
+
+
+async def test_rearm_pushes_deadline_back_with_the_same_handle():
+    """ rearm()이 같은 핸들의 deadline만 늦춰서, 계속 다시 거는 동안에는 실행되지 않는지 테스트합니다. """
+    wheel = TimerWheel(tick=0.01, slots=8)
+    fired = []
+    timer = wheel.schedule(0.05, fired.append, 't8')
+    for _ in range(10):
+        await asyncio.sleep(0.02)
+        assert wheel.rearm(timer, 0.05) is timer
+    assert fired == []
+
+    timer.cancel()
+    await asyncio.sleep(0.1)
+    assert fired == []
+    # 취소되었거나 실행된 핸들도 다시 걸 수 있습니다.
+    assert wheel.rearm(timer, 0.02) is timer
+    await asyncio.sleep(0.1)
+    assert fired == ['t8'] and wheel.pending == 0
+
+
+async def test_coroutine_callback_failure_is_logged(caplog):
+    """ 코루틴 콜백 태스크를 끝날 때까지 참조하고, 실패하면 로그로 남기는지 테스트합니다. """
+    wheel = TimerWheel(tick=0.01)
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    wheel.schedule(0.01, broken)
+    await asyncio.sleep(0.1)
+    assert "boom" in caplog.text
+    assert not wheel._callback_tasks
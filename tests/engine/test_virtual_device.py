@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from secs_simulator.engine.device_agent import DeviceAgent
+from secs_simulator.engine.virtual_device import VirtualDevice
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _start_pair(status_callback):
+    """Passive 장비 에이전트와 그에 접속한 Active 호스트 에이전트를 만들고 Select까지 기다립니다."""
+    equipment = DeviceAgent("CLUSTER", "127.0.0.1", 0, status_callback, connection_mode="Passive")
+    await equipment.start()
+    for _ in range(100):
+        if equipment._server is not None:
+            break
+        await asyncio.sleep(0.01)
+    port = equipment._server.sockets[0].getsockname()[1]
+
+    host = DeviceAgent("HOST", "127.0.0.1", port, status_callback, connection_mode="Active")
+    await host.start()
+    await host._wait_for_ready(timeout=5)
+    return equipment, host
+
+
+async def test_sessions_are_routed_to_virtual_devices():
+    """ 한 연결 위의 Session ID별 메시지가 각 가상 장비로 라우팅되고, Reply가 같은 Session으로 돌아오는지 테스트합니다. """
+    status_callback = AsyncMock()
+    equipment, host = await _start_pair(status_callback)
+    try:
+        pm1 = VirtualDevice("PM1", equipment, 1, status_callback)
+        pm2 = VirtualDevice("PM2", equipment, 2, status_callback)
+        host_pm1 = VirtualDevice("HOST_PM1", host, 1, status_callback)
+        host_pm2 = VirtualDevice("HOST_PM2", host, 2, status_callback)
+        for device in (pm1, pm2, host_pm1, host_pm2):
+            await device.start()
+
+        first = await host_pm1.send_request(1, 1)
+        second = await host_pm2.send_request(1, 3)
+        replies = await asyncio.wait_for(asyncio.gather(first, second), timeout=5)
+        assert [(reply.s, reply.f, reply.session_id) for reply in replies] == [(1, 2, 1), (1, 4, 2)]
+
+        received_pm1 = await pm1.wait_for_message(1, 1, timeout=2)
+        received_pm2 = await pm2.wait_for_message(1, 3, timeout=2)
+        assert received_pm1.session_id == 1 and received_pm2.session_id == 2
+        assert equipment._waiters.history_size == 0
+
+        # 가상 장비 ID로 상태가 보고됩니다.
+        reported_ids = {call.args[0] for call in status_callback.await_args_list}
+        assert {"PM1", "PM2", "HOST_PM1", "HOST_PM2"} <= reported_ids
+    finally:
+        await host.stop()
+        await equipment.stop()
+
+
+async def test_unknown_session_is_rejected_with_s9f1():
+    """ 등록되지 않은 Session ID로 온 메시지를 S9F1 (Unrecognized Device ID)로 거부하는지 테스트합니다. """
+    status_callback = AsyncMock()
+    equipment, host = await _start_pair(status_callback)
+    try:
+        await VirtualDevice("PM1", equipment, 1, status_callback).start()
+        stray = VirtualDevice("HOST_PM9", host, 9, status_callback)
+        await stray.start()
+
+        system_bytes = await stray.send_message(1, 13, w_bit=False, body=[])
+        s9f1 = await stray.wait_for_message(9, 1, timeout=2)
+        assert s9f1 is not None and s9f1.session_id == 9
+        mhead = s9f1.body[0].value
+        assert len(mhead) == 10
+        assert int.from_bytes(mhead[:2], 'big') == 9
+        assert int.from_bytes(mhead[6:], 'big') == system_bytes
+    finally:
+        await host.stop()
+        await equipment.stop()
+
+
+async def test_duplicate_session_is_not_attached():
+    """ 이미 사용 중인 Session ID로는 가상 장비를 등록할 수 없는지 테스트합니다. """
+    agent = DeviceAgent("CLUSTER", "127.0.0.1", 0, AsyncMock(), session_id=0)
+    first = VirtualDevice("PM1", agent, 1, AsyncMock())
+    await first.start()
+    with pytest.raises(ValueError):
+        agent.attach_virtual_device(VirtualDevice("PM1_DUP", agent, 1, AsyncMock()))
+    with pytest.raises(ValueError):
+        agent.attach_virtual_device(VirtualDevice("SELF", agent, 0, AsyncMock()))
+    await first.stop()
+    assert agent.virtual_devices == {}